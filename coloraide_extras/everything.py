@@ -6,6 +6,7 @@ from .spaces.uvw import UVW
 from .contrast.contrast_weber import ContrastWeber
 from .contrast.contrast_michelson import ContrastMichelson
 from .interpolate.spectral import Spectral, SpectralContinuous
+from .interpolate.spectral_smooth import SpectralSmooth
 
 __all__ = ("ColorAll", 'NaN', 'stop', 'hint')
 
@@ -30,7 +31,8 @@ ColorAll.register(
 
         # Interpolation
         Spectral(),
-        SpectralContinuous()
+        SpectralContinuous(),
+        SpectralSmooth()
 
         # Gamut
     ],
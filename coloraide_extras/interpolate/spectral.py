@@ -36,13 +36,21 @@ Modified by Isaac Muse
 """
 from __future__ import annotations
 import math
+import threading
+from bisect import bisect
+from abc import abstractmethod
+from array import array
+from collections import OrderedDict, namedtuple
 from coloraide import algebra as alg
-from coloraide.types import Vector, AnyColor
+from coloraide.types import Vector, VectorLike, Matrix, AnyColor, ColorInput
 from coloraide.interpolate import Interpolator, Interpolate
 from coloraide.interpolate.linear import InterpolatorLinear
 from coloraide.interpolate.continuous import InterpolatorContinuous
-from coloraide.spaces.srgb_linear import XYZ_TO_RGB
-from typing import Any, Mapping, TYPE_CHECKING
+from coloraide.spaces import RGBish
+from coloraide.spaces.srgb import eotf_srgb
+from coloraide.spaces.srgb_linear import RGB_TO_XYZ, XYZ_TO_RGB
+from typing import Any, Callable, Iterable, Mapping, Sequence, TYPE_CHECKING
+from . import spectral_io
 
 if TYPE_CHECKING:  # pragma: no cover
     from coloraide.color import Color
@@ -51,6 +59,14 @@ EPSILON = alg.EPS
 
 SPACE = 'xyz-d65'
 
+# Backends that can perform the Kubelka-Munk mixing within interpolators.
+# The NumPy backend is opt-in and requires NumPy to be installed.
+BACKENDS = ('python', 'numpy')
+
+# Linear sRGB to 8-bit sRGB lookup table: the linear light value at which each 8-bit code rounds up to the next.
+# Bisecting the table gives the correctly rounded and clamped code for any linear light value.
+SRGB8_THRESHOLDS = eotf_srgb([(i + 0.5) / 255 for i in range(255)])
+
 X_BAR = [
     6.4691998957636e-05, 0.00021940989981324543, 0.0011205743509342526, 0.003766613411711093,
     0.011880553603799004, 0.023286442419177128, 0.034559418196974744, 0.03722379011620067,
@@ -184,36 +200,129 @@ REF_W = [
 SIZE = len(X_BAR)
 REFLECTANCE = [REF_W, REF_C, REF_M, REF_Y, REF_R, REF_G, REF_B]
 
+# Supported spectral resolutions in nanometers
+RESOLUTIONS = (5, 10, 20)
+
+
+class SpectralTables:
+    """
+    Color matching functions and basis reflectance curves at a given spectral resolution and basis gamut.
+
+    Tables are shared by everything using the same resolution and gamut and should be treated as read only.
+    """
+
+    def __init__(
+        self,
+        resolution: int,
+        x_bar: Vector,
+        y_bar: Vector,
+        z_bar: Vector,
+        reflectance: Matrix,
+        xyz_to_rgb: Matrix,
+        gamut: str = 'srgb'
+    ) -> None:
+        """Initialize."""
+
+        self.resolution = resolution
+        self.gamut = gamut
+        self.size = len(x_bar)
+        self.x_bar = x_bar
+        self.y_bar = y_bar
+        self.z_bar = z_bar
+        self.reflectance = reflectance
+        self.xyz_to_rgb = xyz_to_rgb
+
+        # XYZ values of each basis curve, used to project unclamped reflectances that are
+        # a linear combination of the basis curves without needing to multiply each wavelength.
+        self.reflectance_xyz = [[alg.vdot(p, x_bar), alg.vdot(p, y_bar), alg.vdot(p, z_bar)] for p in reflectance]
+
+
+DEFAULT_TABLES = SpectralTables(10, X_BAR, Y_BAR, Z_BAR, REFLECTANCE, XYZ_TO_RGB)
+TABLES = {(10, 'srgb'): DEFAULT_TABLES}
+
+
+def get_tables(resolution: int, gamut: str = 'srgb') -> SpectralTables:
+    """
+    Get the spectral tables for the given resolution in nanometers and basis gamut.
+
+    Basis curves for gamuts other than sRGB are reconstructed on first use and cached on disk.
+    """
+
+    tables = TABLES.get((resolution, gamut))
+    if tables is None:
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"A spectral resolution of '{resolution}' is not supported, must be one of {RESOLUTIONS}")
+
+        srgb = TABLES.get((resolution, 'srgb'))
+        if srgb is None:
+            # Alternate resolutions are only loaded when requested
+            from . import spectral_tables as st
+
+            srgb = TABLES[(resolution, 'srgb')] = SpectralTables(
+                resolution,
+                getattr(st, f'X_BAR_{resolution}'),
+                getattr(st, f'Y_BAR_{resolution}'),
+                getattr(st, f'Z_BAR_{resolution}'),
+                [getattr(st, f'REF_{name}_{resolution}') for name in 'WCMYRGB'],
+                XYZ_TO_RGB
+            )
+        if gamut == 'srgb':
+            return srgb
+
+        from . import spectral_basis
+
+        tables = TABLES[(resolution, gamut)] = SpectralTables(
+            resolution,
+            srgb.x_bar,
+            srgb.y_bar,
+            srgb.z_bar,
+            spectral_basis.get_basis(gamut, resolution, srgb.size),
+            spectral_basis.gamut_xyz_to_rgb(gamut),
+            gamut
+        )
+    return tables
+
+
+def reflectance_to_xyz(r: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> Vector:
+    """Convert the reflectance value to an XYZ value."""
+
+    return [alg.vdot(r, tables.x_bar), alg.vdot(r, tables.y_bar), alg.vdot(r, tables.z_bar)]
+
+
+def mixing_luminance(luminance: float) -> float:
+    """Get the luminance used to weight a color when mixing, using a very small lightness if lightness is zero."""
+
+    return luminance if luminance > 0.0 else EPSILON
+
+
+def mixing_concentrations(weights: Iterable[float], luminances: Iterable[float]) -> Vector:
+    """
+    Calculate the concentrations, summing to one, of colors mixed with the given weights and luminances.
+
+    The concentration of each color is the square of its weight scaled by its luminance. This applies an easing
+    function to the weights that biases the color mixing towards the more luminous colors.
+    """
+
+    concentrations = [w ** 2 * mixing_luminance(l) for w, l in zip(weights, luminances)]
+    total = sum(concentrations)
+    return [c / total for c in concentrations]
+
 
 def calculate_mixing_concentration(t: float, l1: float, l2: float) -> tuple[float, float]:
     """Calculate the concentrations of the colors based on the interpolation progress and luminance."""
 
-    # Get luminance but use a very small lightness if lightness is zero
-    if l1 <= 0.0:
-        l1 = EPSILON
-    if l2 <= 0.0:
-        l2 = EPSILON
-
-    # Calculate the concentration of each reflectance curve.
-    # This applies an easing function to the interpolation progress
-    # that biases the color mixing towards the more luminous color.
-    c1 = (1 - t) ** 2 * l1
-    c2 = t ** 2 * l2
-    total = c1 + c2
-    c1 /= total
-    c2 /= total
-
+    c1, c2 = mixing_concentrations((1 - t, t), (l1, l2))
     return c1, c2
 
 
-def xyz_to_concentration(xyz: Vector) -> Vector:
+def xyz_to_concentration(xyz: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> Vector:
     """
     Convert XYZ to concentrations of the spectral curves of our palette.
 
     Concentrations should be constrained to [0, 1].
     """
 
-    lrgb = alg.matmul_x3(XYZ_TO_RGB, xyz, dims=alg.D2_D1)
+    lrgb = alg.matmul_x3(tables.xyz_to_rgb, xyz, dims=alg.D2_D1)
     w = max(min(lrgb), 0.0)
     r, g, b = lrgb[0] - w, lrgb[1] - w, lrgb[2] - w
     cy = max(min(g, b), 0.0)
@@ -233,7 +342,10 @@ def xyz_to_concentration(xyz: Vector) -> Vector:
     ]
 
 
-def single_constant_xyz_to_reflectance(xyz: Vector) -> tuple[Vector, Vector]:
+def single_constant_xyz_to_reflectance(
+    xyz: VectorLike,
+    tables: SpectralTables = DEFAULT_TABLES
+) -> tuple[Vector, Vector]:
     """
     Linear sRGB to a reflectance.
 
@@ -245,53 +357,670 @@ def single_constant_xyz_to_reflectance(xyz: Vector) -> tuple[Vector, Vector]:
     use the residual later to better approximate colors out of gamut by adding them back in.
     """
 
-    c = xyz_to_concentration(xyz)
-    r = [alg.clamp(sum([c[j] * p[i] for j, p in enumerate(REFLECTANCE)]), EPSILON, 1.0) for i in range(SIZE)]
-    xyz2 = reflectance_to_xyz(r)
-    return r, [xyz[0] - xyz2[0], xyz[1] - xyz2[1], xyz[2] - xyz2[2]]
+    c = xyz_to_concentration(xyz, tables)
+    size = tables.size
+    r = [sum([c[j] * p[i] for j, p in enumerate(tables.reflectance)]) for i in range(size)]
 
+    # Constrain the reflectance, noting whether any wavelengths needed clamping.
+    clamped = False
+    for i in range(size):
+        ri = r[i]
+        if ri < EPSILON:
+            r[i] = EPSILON
+            clamped = True
+        elif ri > 1.0:
+            r[i] = 1.0
+            clamped = True
 
-def reflectance_to_xyz(r: Vector) -> Vector:
-    """Convert the reflectance value to an XYZ value."""
+    # If no clamping occurred, the reflectance is just a linear combination of the basis curves,
+    # and its XYZ value is the same combination of the basis curves' XYZ values.
+    if clamped:
+        x, y, z = reflectance_to_xyz(r, tables)
+    else:
+        x = y = z = 0.0
+        for cj, (bx, by, bz) in zip(c, tables.reflectance_xyz):
+            x += cj * bx
+            y += cj * by
+            z += cj * bz
+    return r, [xyz[0] - x, xyz[1] - y, xyz[2] - z]
 
-    return [alg.vdot(r, X_BAR), alg.vdot(r, Y_BAR), alg.vdot(r, Z_BAR)]
 
+def reflectance_to_ks(r: VectorLike) -> Vector:
+    """Convert a reflectance curve to the ratio of absorption and scattering (K/S)."""
 
-def spectral_mix(xyz1: Vector, xyz2: Vector, t: float) -> Vector:
-    """Interpolate two colors applying Kubelka-Munk theory."""
+    return [(1 - ri) ** 2 / (2 * ri) for ri in r]
+
+
+# Lookup functions, such as those of `spectral_lut.ReflectanceLUT`, used to estimate K/S curves at a given resolution.
+# Lookups return `None` for colors they cannot estimate.
+LUTS = {}  # type: dict[SpectralTables, Callable[[VectorLike], tuple[Vector, Vector] | None]]
+
+
+def estimate_ks(xyz: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> tuple[Vector, Vector]:
+    """Estimate the K/S curve and residual of an XYZ color, using a lookup table if one is installed."""
+
+    lookup = LUTS.get(tables)
+    if lookup is not None:
+        value = lookup(xyz)
+        if value is not None:
+            return value
+    r, res = single_constant_xyz_to_reflectance(xyz, tables)
+    return reflectance_to_ks(r), res
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class ReflectanceCache:
+    """
+    A bounded, least recently used cache of K/S curves and residuals keyed by XYZ values.
+
+    Keys can optionally be quantized to a number of decimal places so that nearly identical
+    colors share an entry. When quantizing, the cached values are calculated from the quantized
+    XYZ value so that results do not depend on which color populated the entry first.
+    """
+
+    def __init__(self, maxsize: int = 256, quantize: int | None = None) -> None:
+        """Initialize."""
+
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # type: OrderedDict[tuple[SpectralTables, tuple[float, ...]], tuple[VectorLike, VectorLike]]
+        self._maxsize = 0
+        self._quantize = None  # type: int | None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resize(maxsize)
+        self.quantize(quantize)
+
+    def get(
+        self,
+        xyz: VectorLike,
+        tables: SpectralTables = DEFAULT_TABLES,
+        estimate: Callable[[VectorLike, SpectralTables], tuple[VectorLike, VectorLike]] = estimate_ks
+    ) -> tuple[VectorLike, VectorLike]:
+        """Get the K/S curve and residual for the given XYZ value, calculating it with `estimate` on a cache miss."""
+
+        if not self._maxsize:
+            return estimate(xyz, tables)
+
+        digits = self._quantize
+        color = tuple(xyz) if digits is None else tuple(round(c, digits) for c in xyz)
+        key = (tables, color)
+
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        ks, res = estimate(color, tables)
+        value = (tuple(ks), tuple(res))
+
+        with self._lock:
+            self._data[key] = value
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self) -> CacheInfo:
+        """Get the cache statistics."""
+
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self._maxsize, len(self._data))
+
+    def clear(self, stats: bool = True) -> None:
+        """Clear the cache and, optionally, the statistics."""
+
+        with self._lock:
+            self._data.clear()
+            if stats:
+                self.hits = self.misses = self.evictions = 0
+
+    def resize(self, maxsize: int) -> None:
+        """Set the maximum number of cached colors, evicting the least recently used colors if needed."""
+
+        if maxsize < 0:
+            raise ValueError(f'Cache size must be a positive integer or zero, not {maxsize}')
+
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def quantize(self, digits: int | None) -> None:
+        """Quantize keys to the given number of decimal places, or disable quantization with `None`."""
+
+        with self._lock:
+            if digits != self._quantize:
+                self._quantize = digits
+                self._data.clear()
+
+
+# Shared cache used when converting colors to K/S curves.
+REFLECTANCE_CACHE = ReflectanceCache()
+
+
+class Pigment:
+    """A pigment with a known, usually measured, reflectance curve."""
+
+    def __init__(self, name: str, reflectance: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> None:
+        """Initialize."""
+
+        if len(reflectance) != tables.size:
+            raise ValueError(
+                f"A reflectance of {tables.size} wavelengths is required at a resolution of {tables.resolution}nm, "
+                f"but {len(reflectance)} were provided"
+            )
+
+        self.name = name
+        self.tables = tables
+        # Constrain the reflectance the same as estimated reflectances to avoid infinite K/S values
+        self.reflectance = tuple(alg.clamp(r, EPSILON, 1.0) for r in reflectance)
+        self.ks = tuple(reflectance_to_ks(self.reflectance))
+        self.xyz = tuple(reflectance_to_xyz(self.reflectance, tables))
+        # The color is defined by the reflectance, so there is nothing left over
+        self.residual = (0.0, 0.0, 0.0)
+
+
+class PigmentLibrary:
+    """
+    Registry of pigments with known reflectance curves.
+
+    When mixing, any color whose XYZ value exactly matches that of a registered pigment
+    uses the pigment's K/S curve instead of estimating one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        self._names = {}  # type: dict[str, Pigment]
+        # Pigments are keyed by resolution as their K/S curves do not depend on the basis curves
+        self._colors = {}  # type: dict[tuple[int, tuple[float, ...]], Pigment]
+
+    def register(
+        self,
+        name: str,
+        reflectance: VectorLike,
+        resolution: int = 10,
+        overwrite: bool = False
+    ) -> Pigment:
+        """Register a pigment with a reflectance curve sampled at the given resolution."""
+
+        if name in self._names:
+            if not overwrite:
+                raise ValueError(f"A pigment named '{name}' is already registered")
+            self.unregister(name)
+
+        pigment = Pigment(name, reflectance, get_tables(resolution))
+        self._names[name] = pigment
+        self._colors[(pigment.tables.resolution, pigment.xyz)] = pigment
+        return pigment
+
+    def unregister(self, name: str) -> None:
+        """Unregister a pigment."""
+
+        pigment = self._names.pop(name)
+        key = (pigment.tables.resolution, pigment.xyz)
+        if self._colors.get(key) is pigment:
+            del self._colors[key]
+
+    def get(self, name: str) -> Pigment:
+        """Get a registered pigment by name."""
+
+        return self._names[name]
+
+    def find(self, xyz: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> Pigment | None:
+        """Find the registered pigment matching the given XYZ value."""
+
+        if not self._colors:
+            return None
+        return self._colors.get((tables.resolution, tuple(xyz)))
+
+    def names(self) -> list[str]:
+        """Get the names of all registered pigments."""
+
+        return list(self._names)
+
+    def save(self, path: str, resolution: int = 10) -> None:
+        """Save the reflectance curves of all pigments registered at the given resolution to a spectral data file."""
+
+        tables = get_tables(resolution)
+        names = []
+        data = []  # type: Vector
+        for name, pigment in self._names.items():
+            if pigment.tables is tables:
+                names.append(name)
+                data.extend(pigment.reflectance)
+        spectral_io.save(path, spectral_io.KIND_PIGMENTS, resolution, tables.size, tables.size, data, names)
+
+    def load(self, path: str, overwrite: bool = False) -> list[Pigment]:
+        """Register all the pigments in a spectral data file."""
+
+        data = spectral_io.load(path, spectral_io.KIND_PIGMENTS)
+        size = data.columns
+        if data.bins != size:
+            raise ValueError(f"'{path}' does not have the layout of a pigment library")
+        return [
+            self.register(name, data.data[i * size:(i + 1) * size], data.resolution, overwrite)
+            for i, name in enumerate(data.names)
+        ]
+
+    def clear(self) -> None:
+        """Unregister all pigments."""
+
+        self._names.clear()
+        self._colors.clear()
+
+
+PIGMENTS = PigmentLibrary()
+
+
+def xyz_to_ks(
+    xyz: VectorLike,
+    tables: SpectralTables = DEFAULT_TABLES,
+    estimate: Callable[[VectorLike, SpectralTables], tuple[VectorLike, VectorLike]] = estimate_ks
+) -> tuple[VectorLike, VectorLike]:
+    """
+    Convert XYZ to a K/S curve and the residual.
+
+    Registered pigments use their known K/S curve. Otherwise, the returned values only depend on the color,
+    so they are cached in `REFLECTANCE_CACHE` and reused for any number of mixes involving the same color.
+    Colors that are not cached are calculated with `estimate`.
+    """
+
+    pigment = PIGMENTS.find(xyz, tables)
+    if pigment is not None:
+        return pigment.ks, pigment.residual
+    return REFLECTANCE_CACHE.get(xyz, tables, estimate)
+
+
+def ks_mix_batch(
+    ks1: VectorLike,
+    res1: VectorLike,
+    l1: float,
+    ks2: VectorLike,
+    res2: VectorLike,
+    l2: float,
+    ts: Iterable[float],
+    tables: SpectralTables = DEFAULT_TABLES
+) -> Matrix:
+    """
+    Mix two colors, already converted to K/S curves and residuals, at multiple progress points.
+
+    Kubelka-Munk theory is applied at each point, and the working reflectance curve is shared across the batch.
+    """
+
+    results = []
+    size = tables.size
+    r = [0.0] * size
+    for t in ts:
+        c1, c2 = calculate_mixing_concentration(t, l1, l2)
+
+        # Apply the Kubelka-Munk mixing giving more weight to high luminance colors
+        # and convert the mixed K/S back to a reflectance.
+        for i in range(size):
+            ks = ks1[i] * c1 + ks2[i] * c2
+            r[i] = 1 + ks - alg.nth_root(ks ** 2 + 2 * ks, 2)
+
+        # Convert the reflection back to XYZ and add back in any residual
+        xyz = reflectance_to_xyz(r, tables)
+        results.append(
+            [
+                xyz[0] + alg.lerp(res1[0], res2[0], t),
+                xyz[1] + alg.lerp(res1[1], res2[1], t),
+                xyz[2] + alg.lerp(res1[2], res2[2], t)
+            ]
+        )
+    return results
+
+
+def ks_mix(
+    ks1: VectorLike,
+    res1: VectorLike,
+    l1: float,
+    ks2: VectorLike,
+    res2: VectorLike,
+    l2: float,
+    t: float,
+    tables: SpectralTables = DEFAULT_TABLES
+) -> Vector:
+    """Mix two colors, already converted to K/S curves and residuals, applying Kubelka-Munk theory."""
+
+    return ks_mix_batch(ks1, res1, l1, ks2, res2, l2, (t,), tables)[0]
+
+
+def spectral_mix_batch(
+    xyz1: Vector,
+    xyz2: Vector,
+    ts: Iterable[float],
+    tables: SpectralTables = DEFAULT_TABLES
+) -> Matrix:
+    """Interpolate two colors applying Kubelka-Munk theory at multiple progress points."""
 
     # Convert the colors into a reflectance curve
-    r1, res1 = single_constant_xyz_to_reflectance(xyz1)
-    r2, res2 = single_constant_xyz_to_reflectance(xyz2)
+    ks1, res1 = xyz_to_ks(xyz1, tables)
+    ks2, res2 = xyz_to_ks(xyz2, tables)
+    return ks_mix_batch(ks1, res1, xyz1[1], ks2, res2, xyz2[1], ts, tables)
 
-    c1, c2 = calculate_mixing_concentration(t, xyz1[1], xyz2[1])
 
-    # Apply the Kubelka-Munk mixing
-    r = [0.0] * SIZE
-    for i in range(SIZE):
-        # Reflectance to k/s
-        ks1 = (1 - r1[i]) ** 2 / (2 * r1[i])
-        ks2 = (1 - r2[i]) ** 2 / (2 * r2[i])
+def spectral_mix(xyz1: Vector, xyz2: Vector, t: float, tables: SpectralTables = DEFAULT_TABLES) -> Vector:
+    """Interpolate two colors applying Kubelka-Munk theory."""
 
-        # Perform the actual interpolation giving more weight to high luminance colors
-        ks = ks1 * c1 + ks2 * c2
+    return spectral_mix_batch(xyz1, xyz2, (t,), tables)[0]
 
-        # Back to reflectance
-        r[i] = 1 + ks - alg.nth_root(ks ** 2 + 2 * ks, 2)
 
-    # Convert the reflection back to XYZ and add back in any residual
-    xyz1 = reflectance_to_xyz(r)
-    xyz2 = [alg.lerp(r1, r2, t) for r1, r2 in zip(res1, res2)]
-    return [xyz1[0] + xyz2[0], xyz1[1] + xyz2[1], xyz1[2] + xyz2[2]]
+def spectral_mix_many(
+    xyzs: Sequence[VectorLike],
+    weights: Sequence[float] | None = None,
+    tables: SpectralTables = DEFAULT_TABLES
+) -> Vector:
+    """
+    Mix any number of colors applying Kubelka-Munk theory in a single pass.
 
+    Weights are relative and default to equal parts of each color. Concentrations are the
+    square of the normalized weight scaled by luminance, which matches `spectral_mix` when
+    mixing two colors with weights of `1 - t` and `t`.
+    """
 
-class InterpolatorSpectralContinuous(InterpolatorContinuous[AnyColor]):
-    """Interpolate with continuous piecewise."""
+    if weights is None:
+        weights = [1.0] * len(xyzs)
+    elif len(weights) != len(xyzs):
+        raise ValueError(f'Expected {len(xyzs)} weights, but {len(weights)} were provided')
+
+    # Negative weights are considered as zero weight
+    weights = [max(w, 0.0) for w in weights]
+    total = sum(weights)
+    if not total:
+        raise ValueError('At least one color with a positive weight must be provided in order to mix colors')
+
+    # Calculate the concentrations biased towards the more luminous colors.
+    concentrations = mixing_concentrations(weights, [xyz[1] for xyz in xyzs])
+
+    # Sum the weighted K/S curves of all colors and mix residuals linearly with the weights
+    size = tables.size
+    ks = [0.0] * size
+    res = [0.0, 0.0, 0.0]
+    for xyz, w, c in zip(xyzs, weights, concentrations):
+        if not w:
+            continue
+        ks1, res1 = xyz_to_ks(xyz, tables)
+        for i in range(size):
+            ks[i] += c * ks1[i]
+        w /= total
+        for i in range(3):
+            res[i] += w * res1[i]
+
+    # Convert the mixed K/S back to a reflectance and then to XYZ, adding back in the residual.
+    r = [1 + k - math.sqrt(k ** 2 + 2 * k) for k in ks]
+    xyz = reflectance_to_xyz(r, tables)
+    return [xyz[0] + res[0], xyz[1] + res[1], xyz[2] + res[2]]
+
+
+def spectral_average(
+    color_cls: type[AnyColor],
+    colors: Iterable[ColorInput],
+    weights: Sequence[float] | None = None,
+    *,
+    out_space: str | None = None,
+    premultiplied: bool = True,
+    resolution: int = 10
+) -> AnyColor:
+    """
+    Mix any number of colors together applying Kubelka-Munk theory, similar to `Color.average`.
 
-    def mix(self, a: Vector, b: Vector, t: float) -> Vector:
-        """Perform a Kubelka-Munk mix."""
+    Undefined color channels are treated as zero and undefined alpha is treated as opaque.
+    The result is returned in the XYZ D65 space unless another output space is provided.
+    """
+
+    xyzs = []
+    alphas = []
+    for c in colors:
+        color = color_cls(c).convert(SPACE, norm=False)
+        alpha = color.alpha(nans=False) if not math.isnan(color[-1]) else 1.0
+        coords = color.coords(nans=False)
+        if premultiplied:
+            coords = [v * alpha for v in coords]
+        xyzs.append(coords)
+        alphas.append(alpha)
+
+    if weights is None:
+        weights = [1.0] * len(xyzs)
+    xyz = spectral_mix_many(xyzs, weights, get_tables(resolution))
+
+    # Alpha is mixed linearly
+    total = 0.0
+    alpha = 0.0
+    for a, w in zip(alphas, weights):
+        if w > 0.0:
+            total += w
+            alpha += a * w
+    alpha /= total
+    if premultiplied and alpha:
+        xyz = [v / alpha for v in xyz]
+
+    return color_cls(SPACE, xyz, alpha).convert(SPACE if out_space is None else out_space, in_place=True)
+
+
+# White and black used to create tints and shades
+WHITE = alg.matmul_x3(RGB_TO_XYZ, [1.0, 1.0, 1.0], dims=alg.D2_D1)
+BLACK = [0.0, 0.0, 0.0]
+LADDER_KS = {}  # type: dict[SpectralTables, tuple[tuple[VectorLike, VectorLike], tuple[VectorLike, VectorLike]]]
+
+
+def ladder_ks(
+    tables: SpectralTables = DEFAULT_TABLES
+) -> tuple[tuple[VectorLike, VectorLike], tuple[VectorLike, VectorLike]]:
+    """Get the K/S curves and residuals of white and black, calculating them only once."""
+
+    value = LADDER_KS.get(tables)
+    if value is None:
+        value = LADDER_KS[tables] = (xyz_to_ks(WHITE, tables), xyz_to_ks(BLACK, tables))
+    return value
+
+
+def ladder_amounts(levels: int | Sequence[float]) -> Sequence[float]:
+    """Get the amounts of white or black to mix, spacing a number of levels evenly from the color to white or black."""
+
+    if isinstance(levels, int):
+        return [k / (levels + 1) for k in range(1, levels + 1)]
+    return levels
+
+
+def spectral_ladder(
+    color_cls: type[AnyColor],
+    color: ColorInput,
+    tints: int | Sequence[float] = 5,
+    shades: int | Sequence[float] = 5,
+    *,
+    out_space: str | None = None,
+    premultiplied: bool = True,
+    resolution: int = 10
+) -> list[AnyColor]:
+    """
+    Create a ladder of tints and shades of a color by mixing it with white and black applying Kubelka-Munk theory.
 
-        return spectral_mix(a, b, t)
+    Tints and shades are either a number of evenly spaced levels, or the amounts of white or black to mix with
+    the color, ordered from the color outwards. The color's K/S curve is calculated once and shared by every
+    level. The ladder is ordered from the lightest tint to the darkest shade, with the color in between.
+    Undefined color channels are treated as zero and undefined alpha is treated as opaque.
+    """
+
+    tables = get_tables(resolution)
+    base = color_cls(color).convert(SPACE, norm=False)
+    alpha = base.alpha(nans=False) if not math.isnan(base[-1]) else 1.0
+    xyz = base.coords(nans=False)
+    if premultiplied:
+        xyz = [v * alpha for v in xyz]
+    ks, res = xyz_to_ks(xyz, tables)
+    (white_ks, white_res), (black_ks, black_res) = ladder_ks(tables)
+
+    # Mix all the tints and all the shades as two batches. Tints are reversed so the lightest is first.
+    ts = ladder_amounts(tints)
+    levels = list(zip(ts, ks_mix_batch(ks, res, xyz[1], white_ks, white_res, WHITE[1], ts, tables)))[::-1]
+    levels.append((0.0, xyz))
+    ts = ladder_amounts(shades)
+    levels.extend(zip(ts, ks_mix_batch(ks, res, xyz[1], black_ks, black_res, BLACK[1], ts, tables)))
+
+    space = SPACE if out_space is None else out_space
+    ladder = []
+    for t, mixed in levels:
+        # White and black are opaque, so alpha is mixed linearly towards opaque
+        a = alg.lerp(alpha, 1.0, t)
+        if premultiplied and a:
+            mixed = [v / a for v in mixed]
+        ladder.append(color_cls(SPACE, mixed, a).convert(space, in_place=True))
+    return ladder
+
+
+# Number of intervals each segment is divided into when measuring its arc length
+ARC_SAMPLES = 64
+# Number of samples each interpolator keeps for `steps`, the least recently used are discarded first
+MAX_SAMPLES = 1024
+
+
+def invert_arc_length(lengths: VectorLike, t: float) -> float:
+    """
+    Find the progress at which the given fraction of a segment's arc length is reached.
+
+    Lengths are cumulative and sampled at evenly spaced progress points. Progress outside of the
+    segment, or within a segment with no length, is returned unchanged.
+    """
+
+    total = lengths[-1]
+    if not total or not 0.0 <= t <= 1.0:
+        return t
+    n = len(lengths) - 1
+    s = t * total
+    k = bisect(lengths, s) - 1
+    if k >= n:
+        return 1.0
+    return (k + (s - lengths[k]) / (lengths[k + 1] - lengths[k])) / n
+
+
+CompileResult = namedtuple('CompileResult', ['error', 'degrees'])
+
+
+def chebyshev_nodes(degree: int) -> Vector:
+    """Get the Chebyshev nodes for a series of the given degree, mapped to the range [0, 1]."""
+
+    n = degree + 1
+    return [(1 + math.cos(math.pi * (k + 0.5) / n)) / 2 for k in range(n)]
+
+
+def chebyshev_fit(values: Matrix) -> Matrix:
+    """Fit a Chebyshev series to each channel of the values sampled at the Chebyshev nodes."""
+
+    n = len(values)
+    coeffs = []
+    for channel in zip(*values):
+        c = [
+            2 / n * sum(v * math.cos(math.pi * j * (k + 0.5) / n) for k, v in enumerate(channel))
+            for j in range(n)
+        ]
+        c[0] /= 2
+        coeffs.append(c)
+    return coeffs
+
+
+def chebyshev_eval(coeffs: Matrix, t: float) -> Vector:
+    """Evaluate the Chebyshev series of each channel at a progress within the range [0, 1]."""
+
+    x = 2 * t - 1
+    x2 = 2 * x
+    values = []
+    for c in coeffs:
+        # Clenshaw's algorithm
+        b1 = b2 = 0.0
+        for cj in c[:0:-1]:
+            b1, b2 = cj + x2 * b1 - b2, b1
+        values.append(c[0] + x * b1 - b2)
+    return values
+
+
+class SpectralInterpolator(Interpolator[AnyColor]):
+    """
+    Common functionality for spectral interpolators.
+
+    Colors are generated in batches, grouped by the segment they fall within, so that
+    the expensive parts of the Kubelka-Munk mixing are shared by all points in a segment.
+    """
+
+    _ks: dict[int, tuple[VectorLike, VectorLike]]
+    _fits: dict[int, Matrix]
+    _arcs: dict[int, Vector]
+    _samples: OrderedDict[tuple[int, float], tuple[float, ...]]
+    _samples_lock: threading.Lock
+    _resolved: list[tuple[float, ...]]
+    _easing: dict[int, tuple[Callable[..., float] | None, Callable[..., float] | None]]
+    _transforms: dict[str, tuple[Matrix, Callable[[Vector], Vector] | None]]
+
+    def __init__(
+        self,
+        *args: Any,
+        backend: str = 'python',
+        resolution: int = 10,
+        gamut: str = 'srgb',
+        uniform: bool = False,
+        uniform_delta_e: str | None = None,
+        **kwargs: Any
+    ) -> None:
+        """Initialize."""
+
+        if backend not in BACKENDS:
+            raise ValueError(f"'{backend}' is not a recognized spectral backend")
+        if backend == 'numpy':
+            # Surface a missing NumPy install when the interpolator is created, not when first used.
+            from . import spectral_numpy  # noqa: F401
+        self.backend = backend
+        self.tables = get_tables(resolution, gamut)
+        self.uniform = uniform
+        self.uniform_delta_e = uniform_delta_e
+        self._transforms = {}
+        super().__init__(*args, **kwargs)
+
+    @abstractmethod
+    def pair(self, index: int) -> int:
+        """Get the position, within the resolved coordinates, of the first color of the segment at the given index."""
+
+    def interpolate_batch(self, points: Sequence[float], index: int) -> Matrix:
+        """Interpolate multiple points within the same segment."""
+
+        i = self.pair(index)
+        c1 = self._resolved[i]
+        c2 = self._resolved[i + 1]
+        ease, alpha_ease = self.easing(index)
+        ts = points if ease is None else [ease(point) for point in points]
+        if self.uniform:
+            lengths = self.arc_length(index)
+            ts = [invert_arc_length(lengths, t) for t in ts]
+
+        # Apply spectral interpolation, using the compiled fit of the segment if there is one.
+        # Fits only cover the segment, so points that are extrapolated are mixed exactly.
+        fit = self._fits.get(i)
+        if fit is None:
+            results = self.mix_pair(i, ts)
+        else:
+            results = [chebyshev_eval(fit, t) if 0.0 <= t <= 1.0 else [] for t in ts]
+            exact = [j for j, t in enumerate(ts) if not results[j]]
+            if exact:
+                for j, xyz in zip(exact, self.mix_pair(i, [ts[j] for j in exact])):
+                    results[j] = xyz
+
+        # Uniform spacing remaps the progress of the whole color, alpha included, as the arc length table is
+        # measured with alpha following the mixing progress.
+        if self.uniform:
+            alphas = ts
+        else:
+            alphas = points if alpha_ease is None else [alpha_ease(point) for point in points]
+        a1, a2 = c1[-1], c2[-1]
+        for channels, t in zip(results, alphas):
+            channels.append(alg.lerp(a1, a2, t))
+        return results
 
     def interpolate(
         self,
@@ -300,86 +1029,489 @@ class InterpolatorSpectralContinuous(InterpolatorContinuous[AnyColor]):
     ) -> Vector:
         """Interpolate."""
 
-        # Interpolate between the values of the two colors for each channel.
-        channels = []
-        idx = index - 2 if index == self.length else index - 1
+        return self.interpolate_batch((point,), index)[0]
 
-        # Handle spectral interpolation
-        c1, c2 = self.coordinates[idx:idx + 2]
-        channels = self.mix(
-            [0.0 if math.isnan(i) else i for i in c1[:-1]],
-            [0.0 if math.isnan(i) else i for i in c2[:-1]],
-            self.ease(point, 0)
-        )
-        channels.append(alg.lerp(c1[-1], c2[-1], self.ease(point, len(c1) - 1)))
-        return channels
-
-    def ease(self, t: float, channel_index: int) -> float:
-        """Provide a progression time and channel index."""
-
-        progress = None
-        if self.current_easing is not None:
-            # Do we have an easing function, or mapping with a channel easing function?
-            name = self.channel_names[channel_index]
-            if isinstance(self.current_easing, Mapping):
-                progress = self.current_easing.get(name) if name == 'alpha' else None
-                if progress is None:
-                    progress = self.current_easing.get('all')
+    def mix(self, a: Vector, b: Vector, t: float) -> Vector:
+        """Perform a Kubelka-Munk mix."""
+
+        return spectral_mix(a, b, t, self.tables)
+
+    def ks(self, index: int) -> tuple[VectorLike, VectorLike]:
+        """Get the K/S curve and residual of the color at the given index, calculating them only once."""
+
+        value = self._ks.get(index)
+        if value is None:
+            xyz = self._resolved[index][:-1]
+            if self.backend == 'numpy':
+                from . import spectral_numpy
+                value = self._ks[index] = xyz_to_ks(xyz, self.tables, spectral_numpy.estimate_ks)
             else:
-                progress = self.current_easing
+                value = self._ks[index] = xyz_to_ks(xyz, self.tables)
+        return value
+
+    def mix_pair(self, i: int, ts: Sequence[float]) -> Matrix:
+        """Mix the pair of colors starting at the given position at multiple progress points."""
+
+        c1 = self._resolved[i]
+        c2 = self._resolved[i + 1]
+        ks1, res1 = self.ks(i)
+        ks2, res2 = self.ks(i + 1)
+        return self.ks_mix_batch(ks1, res1, c1[1], ks2, res2, c2[1], ts)
+
+    def segment_colors(self, i: int, xyzs: Matrix, ts: Sequence[float]) -> list[AnyColor]:
+        """
+        Create colors, without alpha, from XYZ values mixed from the pair starting at the given position.
+
+        If premultiplied, the values are divided by the alpha of the pair at the same progress.
+        """
+
+        a1, a2 = self._resolved[i][-1], self._resolved[i + 1][-1]
+        colors = []
+        for xyz, t in zip(xyzs, ts):
+            coords = xyz + [alg.lerp(a1, a2, t) if self.premultiplied else 1.0]
+            self.postdivide(coords)
+            colors.append(self.color_cls(self.space, coords[:-1]))
+        return colors
+
+    def arc_length(self, index: int) -> Vector:
+        """
+        Get the cumulative delta E along the segment at the given index, calculating it only once.
+
+        The segment is divided into evenly spaced intervals of mixing progress and the delta E of each
+        interval is accumulated, starting from zero.
+        """
+
+        i = self.pair(index)
+        value = self._arcs.get(i)
+        if value is None:
+            ts = [k / ARC_SAMPLES for k in range(ARC_SAMPLES + 1)]
+            colors = self.segment_colors(i, self.mix_pair(i, ts), ts)
+            total = 0.0
+            value = [total]
+            for k in range(1, len(colors)):
+                total += colors[k].delta_e(colors[k - 1], method=self.uniform_delta_e)
+                value.append(total)
+            self._arcs[i] = value
+        return value
+
+    def compile(
+        self,
+        max_delta_e: float = 0.5,
+        delta_e: str | None = None,
+        delta_e_args: dict[str, Any] | None = None,
+        max_degree: int = 32
+    ) -> CompileResult:
+        """
+        Fit the mix of each segment with a Chebyshev series so that later interpolation is cheap.
+
+        Each segment is fit with series of increasing degree, up to `max_degree`, until the largest delta E
+        between the series and the exact mix, checked at 129 evenly spaced points, is within `max_delta_e`.
+        Segments that cannot meet the tolerance are mixed exactly. Returns the largest error of the fitted
+        segments and the degree of each segment's series, or `None` if the segment is mixed exactly.
+        Samples kept by `steps` are discarded.
+        """
+
+        if delta_e_args is None:
+            delta_e_args = {}
+
+        self._fits = {}
+        with self._samples_lock:
+            self._samples.clear()
+        checks = [k / 128 for k in range(129)]
+        error = 0.0
+        degrees = []  # type: list[int | None]
+        for index in range(1, self.length):
+            i = self.pair(index)
+            colors = self.segment_colors(i, self.mix_pair(i, checks), checks)
+
+            degree = 4
+            fitted = None  # type: int | None
+            while degree <= max_degree:
+                coeffs = chebyshev_fit(self.mix_pair(i, chebyshev_nodes(degree)))
+                approx = self.segment_colors(i, [chebyshev_eval(coeffs, t) for t in checks], checks)
+                worst = 0.0
+                for c1, c2 in zip(colors, approx):
+                    worst = max(worst, c1.delta_e(c2, method=delta_e, **delta_e_args))
+                    if worst > max_delta_e:
+                        break
+                else:
+                    self._fits[i] = coeffs
+                    fitted = degree
+                    error = max(error, worst)
+                    break
+                degree *= 2
+            degrees.append(fitted)
+
+        return CompileResult(error, degrees)
+
+    def ks_mix_batch(
+        self,
+        ks1: VectorLike,
+        res1: VectorLike,
+        l1: float,
+        ks2: VectorLike,
+        res2: VectorLike,
+        l2: float,
+        ts: Sequence[float]
+    ) -> Matrix:
+        """Mix two prepared colors at multiple progress points with the selected backend."""
+
+        if self.backend == 'numpy':
+            from . import spectral_numpy
+            return spectral_numpy.ks_mix_batch(  # type: ignore[no-any-return]
+                ks1, res1, l1, ks2, res2, l2, ts, self.tables
+            ).tolist()
+        return ks_mix_batch(ks1, res1, l1, ks2, res2, l2, ts, self.tables)
+
+    def easing(self, index: int) -> tuple[Callable[..., float] | None, Callable[..., float] | None]:
+        """Get the color and alpha easing functions of the segment at the given index, resolving them only once."""
+
+        value = self._easing.get(index)
+        if value is None:
+            # Do we have an easing function between these stops?
+            easing = self.easings[index - 1]  # type: Mapping[str, Callable[..., float]] | Callable[..., float] | None
+            if easing is None:
+                easing = self.progress
+
+            # Only alpha can be eased independently, all color channels must share an easing function.
+            if isinstance(easing, Mapping):
+                color = easing.get('all')
+                alpha = easing.get('alpha')
+                value = (color, color if alpha is None else alpha)
+            else:
+                value = (easing, easing)
+            self._easing[index] = value
+        return value
+
+    def segment(self, point: float) -> tuple[float, int]:
+        """
+        Find the segment a point falls within and the progress relative to that segment.
+
+        This mirrors the stop lookup performed when calling the interpolator directly.
+        """
+
+        if self._domain:
+            point = self.scale(point)
+
+        if self._padding:
+            slope = (self._padding[1] - self._padding[0])
+            point = self._padding[0] + slope * point
+            if not self.extrapolate:
+                point = min(max(point, self._padding[0]), self._padding[1])
+
+        # See if point extends past either the first or last stop
+        if point < self.start:
+            first, last, index = self.start, self.stops[1], 1
+        elif point > self.end:
+            first, last, index = self.stops[self.length - 2], self.end, self.length - 1
+        else:
+            # Iterate stops to find where our point falls between
+            first = self.start
+            for index in range(1, self.length):
+                last = self.stops[index]
+                if point <= last:
+                    break
+                first = last
+
+        # Adjust stop to be relative to the given stops
+        r = last - first
+        if point < first:
+            adjusted_time = point - first if self.extrapolate else 0
+        elif point > last:
+            adjusted_time = 1 + point - last if self.extrapolate else 1
+        else:
+            adjusted_time = (point - first) / r if r else 1
+        return adjusted_time, index
+
+    def interpolate_points(self, points: Sequence[float], cache: bool = False) -> Matrix:
+        """
+        Interpolate multiple points, batching all the points that fall within the same segment.
+
+        Raw coordinates in the interpolation space, including alpha, are returned in the order of the given points.
+        If `cache` is enabled, up to `MAX_SAMPLES` samples are kept, keyed by their segment and progress within it,
+        and samples that were previously kept are reused instead of being interpolated again.
+        """
+
+        samples = self._samples
+        results = [None] * len(points)  # type: list[Any]
+        groups = {}  # type: dict[int, tuple[list[int], Vector]]
+        for i, point in enumerate(points):
+            t, index = self.segment(point)
+            if cache:
+                # Samples can be evicted by other threads, so look up and mark as used together
+                with self._samples_lock:
+                    sample = samples.get((index, t))
+                    if sample is not None:
+                        samples.move_to_end((index, t))
+                if sample is not None:
+                    results[i] = list(sample)
+                    continue
+            if index not in groups:
+                groups[index] = ([], [])
+            group = groups[index]
+            group[0].append(i)
+            group[1].append(t)
+
+        new = []  # type: list[tuple[tuple[int, float], tuple[float, ...]]]
+        for index, (positions, ts) in groups.items():
+            for i, t, coords in zip(positions, ts, self.interpolate_batch(ts, index)):
+                if self.premultiplied:
+                    self.postdivide(coords)
+                if cache:
+                    new.append(((index, t), tuple(coords)))
+                results[i] = coords
+
+        if new:
+            with self._samples_lock:
+                samples.update(new)
+                while len(samples) > MAX_SAMPLES:
+                    samples.popitem(last=False)
+        return results
+
+    def batch(self, points: Sequence[float], cache: bool = False) -> list[AnyColor]:
+        """Interpolate multiple points, batching all the points that fall within the same segment."""
+
+        colors = []
+        for coords in self.interpolate_points(points, cache):
+            # Create the color and ensure it is in the correct color space.
+            color = self.color_cls(self.space, coords[:-1], coords[-1])
+            colors.append(color.convert(self._out_space, in_place=True))
+        return colors
+
+    def rgb_transform(self, space: str) -> tuple[Matrix, Callable[[Vector], Vector] | None]:
+        """
+        Get a transform from the interpolation space to the given RGB space.
+
+        The transform is a single matrix, from the interpolation space to the linear form of the RGB space
+        (including any chromatic adaptation), and the transfer function of the RGB space if it is not linear.
+        """
+
+        value = self._transforms.get(space)
+        if value is None:
+            cs = self.color_cls.CS_MAP.get(space)
+            if not isinstance(cs, RGBish):
+                raise ValueError(f"'{space}' is not a registered RGB color space")
+
+            # Only gamma encoded spaces that directly derive from their linear form are supported.
+            linear = cs.linear() or cs.NAME
+            if linear != cs.NAME and cs.BASE != linear:
+                raise ValueError(f"'{space}' is not directly derived from a linear RGB space")
+
+            # Converting from XYZ to a linear RGB space is a linear transform, so resolve the entire
+            # conversion chain by converting the unit vectors.
+            m = alg.transpose(
+                [self.color_cls(self.space, v).convert(linear)[:-1] for v in alg.identity(3)]
+            )
+            value = self._transforms[space] = (m, None if linear == cs.NAME else cs.from_base)
+        return value
+
+    def coords(self, points: Sequence[float], space: str | None = None) -> list[tuple[float, ...]]:
+        """
+        Interpolate multiple points returning raw coordinates, including alpha, instead of color objects.
+
+        Coordinates are in the interpolation space unless an RGB space is provided.
+        """
+
+        results = self.interpolate_points(points)
+        if space is None:
+            return [tuple(coords) for coords in results]
+
+        m, encode = self.rgb_transform(space)
+        output = []
+        for coords in results:
+            rgb = alg.matmul_x3(m, coords[:-1], dims=alg.D2_D1)
+            if encode is not None:
+                rgb = encode(rgb)
+            rgb.append(coords[-1])
+            output.append(tuple(rgb))
+        return output
+
+    def coords_array(self, points: Sequence[float], space: str | None = None) -> array[float]:
+        """Interpolate multiple points returning raw coordinates, including alpha, as a flat array of doubles."""
+
+        output = array('d')
+        for coords in self.coords(points, space):
+            output.extend(coords)
+        return output
+
+    def render(
+        self,
+        width: int,
+        height: int = 1,
+        alpha: bool = False,
+        buffer: bytearray | memoryview | None = None
+    ) -> bytearray | memoryview:
+        """
+        Render a horizontal gradient of the given size as 8-bit sRGB (or sRGBA) pixels.
+
+        Pixels are written row by row to the given buffer, or a new `bytearray` if one is not provided.
+        Colors are clipped to the sRGB gamut and alpha is not premultiplied.
+        """
+
+        stride = 4 if alpha else 3
+        size = width * height * stride
+        if buffer is None:
+            buffer = bytearray(size)
+        elif len(buffer) < size:
+            raise ValueError(f'A buffer of at least {size} bytes is required, but the buffer is {len(buffer)} bytes')
+        if not size:
+            return buffer
+
+        points = [0.5] if width == 1 else [i / (width - 1) for i in range(width)]
+        m = self.rgb_transform('srgb-linear')[0]
+        thresholds = SRGB8_THRESHOLDS
+        row = bytearray()
+        for coords in self.interpolate_points(points):
+            r, g, b = alg.matmul_x3(m, coords[:-1], dims=alg.D2_D1)
+            row.append(bisect(thresholds, r))
+            row.append(bisect(thresholds, g))
+            row.append(bisect(thresholds, b))
+            if alpha:
+                a = coords[-1]
+                row.append(255 if math.isnan(a) else int(alg.clamp(a, 0.0, 1.0) * 255 + 0.5))
+
+        step = width * stride
+        for y in range(0, size, step):
+            buffer[y:y + step] = row
+        return buffer
+
+    def steps(
+        self,
+        steps: int = 2,
+        max_steps: int = 1000,
+        max_delta_e: float = 0,
+        delta_e: str | None = None,
+        delta_e_args: dict[str, Any] | None = None,
+    ) -> list[AnyColor]:
+        """
+        Steps, generating all the colors of each pass as a single batch.
+
+        Every sample is kept, so later calls with more steps or a tighter `max_delta_e` only interpolate
+        points that have not been generated before.
+        """
+
+        actual_steps = steps
+
+        if delta_e_args is None:
+            delta_e_args = {}
+
+        # Allocate at least two steps if we are doing a maximum delta E,
+        if max_delta_e != 0 and actual_steps < 2:
+            actual_steps = 2
+
+        # Make sure we don't start out allocating too many colors
+        if max_steps is not None:
+            actual_steps = min(actual_steps, max_steps)
+
+        points = []  # type: Vector
+        if actual_steps == 1:
+            points = [0.5]
+        elif actual_steps > 1:
+            step = 1 / (actual_steps - 1)
+            points = [i * step for i in range(actual_steps)]
+        ret = list(zip(points, self.batch(points, True)))
+
+        # Iterate over all the stops inserting stops in between all colors
+        # if we have any two colors with a max delta greater than what was requested.
+        # We inject between every stop to ensure the midpoint does not shift.
+        if max_delta_e > 0:
+            # Initial check to see if we need to insert more stops
+            m_delta = 0.0
+            for i in range(1, len(ret)):
+                m_delta = max(
+                    m_delta,
+                    ret[i - 1][1].delta_e(
+                        ret[i][1],
+                        method=delta_e,
+                        **delta_e_args
+                    )
+                )
+
+            # If we currently have delta over our limit inject more stops.
+            # If inserting between every color would push us over the max_steps, halt.
+            total = len(ret)
+            while m_delta > max_delta_e and (total * 2 - 1 <= max_steps):
+                # Inject stops while measuring again to see if it was sufficient
+                m_delta = 0.0
+                points = [(ret[i - 1][0] + ret[i][0]) / 2 for i in range(1, total)]
+                refined = [ret[0]]
+                for i, color in enumerate(self.batch(points, True), 1):
+                    prev = ret[i - 1]
+                    cur = ret[i]
+                    m_delta = max(
+                        m_delta,
+                        color.delta_e(prev[1], method=delta_e, **delta_e_args),
+                        color.delta_e(cur[1], method=delta_e, **delta_e_args)
+                    )
+                    refined.append((points[i - 1], color))
+                    refined.append(cur)
+                ret = refined
+                total = len(ret)
+
+        return [ri[1] for ri in ret]
+
+
+class InterpolatorSpectralContinuous(SpectralInterpolator[AnyColor], InterpolatorContinuous[AnyColor]):
+    """Interpolate with continuous piecewise."""
 
-        return progress(t) if progress is not None else t
+    def setup(self) -> None:
+        """Setup."""
 
+        super().setup()
+        self._ks = {}
+        self._fits = {}
+        self._arcs = {}
+        self._samples = OrderedDict()
+        self._samples_lock = threading.Lock()
+        self._easing = {}
 
-class InterpolatorSpectralLinear(InterpolatorLinear[AnyColor]):
-    """Interpolate multiple ranges of colors using linear, Piecewise interpolation."""
+        # Any color channels still undefined after handling gaps are undefined in every stop, so treat them as zero.
+        # Undefined alpha is left as is.
+        self._resolved = [
+            tuple(0.0 if math.isnan(v) else v for v in coords[:-1]) + (coords[-1],) for coords in self.coordinates
+        ]
 
-    def mix(self, a: Vector, b: Vector, t: float) -> Vector:
-        """Perform a Kubelka-Munk mix."""
+    def pair(self, index: int) -> int:
+        """Get the position of the first color of the segment at the given index."""
 
-        return spectral_mix(a, b, t)
+        return index - 2 if index == self.length else index - 1
 
-    def interpolate(
-            self,
-            point: float,
-            index: int
-        ) -> Vector:
-            """Interpolate."""
-
-            i = (index - 1) * 2
-
-            # Apply spectral interpolation
-            c1, c2 = self.coordinates[i:i + 2]
-            aidx = len(c1) - 1
-            for i in range(len(c1)):
-                a, b = c1[i], c2[i]
+
+class InterpolatorSpectralLinear(SpectralInterpolator[AnyColor], InterpolatorLinear[AnyColor]):
+    """Interpolate multiple ranges of colors using linear, Piecewise interpolation."""
+
+    def setup(self) -> None:
+        """Setup."""
+
+        super().setup()
+        self._ks = {}
+        self._fits = {}
+        self._arcs = {}
+        self._samples = OrderedDict()
+        self._samples_lock = threading.Lock()
+        self._easing = {}
+
+        # Resolve undefined channels of each pair of colors: use the value of the sibling if it has one,
+        # otherwise treat color channels as zero and leave alpha undefined.
+        self._resolved = []
+        aidx = len(self.coordinates[0]) - 1
+        for i in range(0, len(self.coordinates), 2):
+            c1, c2 = self.coordinates[i][:], self.coordinates[i + 1][:]
+            for e in range(aidx + 1):
+                a, b = c1[e], c2[e]
                 if math.isnan(a) and math.isnan(b):
-                    if i != aidx:
-                        c1[i], c2[i] = 0.0, 0.0
+                    if e != aidx:
+                        c1[e], c2[e] = 0.0, 0.0
                 elif math.isnan(a):
-                    c1[i] = b
+                    c1[e] = b
                 elif math.isnan(b):
-                    c2[i] = a
-            return (
-                self.mix(c1[:-1], c2[:-1], self.ease(point, 0)) +
-                [alg.lerp(c1[aidx], c2[aidx], self.ease(point, aidx))]
-            )
+                    c2[e] = a
+            self._resolved.extend((tuple(c1), tuple(c2)))
 
-    def ease(self, t: float, channel_index: int) -> float:
-        """Provide a progression time and channel index."""
-
-        progress = None
-        if self.current_easing is not None:
-            # Do we have an easing function, or mapping with a channel easing function?
-            name = self.channel_names[channel_index]
-            if isinstance(self.current_easing, Mapping):
-                progress = self.current_easing.get(name) if name == 'alpha' else None
-                if progress is None:
-                    progress = self.current_easing.get('all')
-            else:
-                progress = self.current_easing
+    def pair(self, index: int) -> int:
+        """Get the position of the first color of the segment at the given index."""
 
-        return progress(t) if progress is not None else t
+        return (index - 1) * 2
 
 
 class Spectral(Interpolate[AnyColor]):
@@ -0,0 +1,132 @@
+"""
+Basis reflectance curves for RGB gamuts other than sRGB.
+
+The seven basis curves (white, cyan, magenta, yellow, red, green, and blue) of a gamut are the smoothest
+reflectance curves of the gamut's primaries and secondaries, reconstructed with the methods of Scott Burns
+as `tools/calc_reflect.py` does for sRGB. Reconstruction takes a few seconds, so the curves are only
+reconstructed the first time a gamut is used and are saved to a spectral data file in a user cache directory.
+
+The primaries and secondaries of wide gamuts can lie outside of the object color solid, in which case no
+reflectance curve between 0 and 1 matches them. Starting from a neutral gray, each color is approached in
+small steps, starting each step from the solution of the previous one, until a step cannot be solved. The curve of
+the most saturated step is then extrapolated, by removing its gray and rescaling it, so that it matches the basis
+color exactly. Any wavelengths of a mix that this pushes outside of 0 to 1 are clamped, covered by the residual.
+"""
+from __future__ import annotations
+import math
+import os
+import sys
+from coloraide.types import Matrix
+from . import spectral_io
+from .spectral_reconstruct import SPACES, GUESS_ITERATIONS, get_solver
+
+# Basis colors in the order of the basis curves, white is solved separately
+TARGETS = {
+    'C': [0.0, 1.0, 1.0],
+    'M': [1.0, 0.0, 1.0],
+    'Y': [1.0, 1.0, 0.0],
+    'R': [1.0, 0.0, 0.0],
+    'G': [0.0, 1.0, 0.0],
+    'B': [0.0, 0.0, 1.0]
+}
+NAMES = 'WCMYRGB'
+# The neutral gray each basis color is approached from and the number of steps taken to reach it
+GRAY = 0.5
+STEPS = 40
+TOLERANCE = 1e-12
+
+# Environment variable that overrides the directory basis curves are cached in
+CACHE_ENV = 'COLORAIDE_EXTRAS_CACHE'
+
+
+def cache_dir() -> str:
+    """Get the user cache directory that basis curves are saved in."""
+
+    path = os.environ.get(CACHE_ENV)
+    if path:
+        return path
+    if sys.platform == 'win32':  # pragma: no cover
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    elif sys.platform == 'darwin':  # pragma: no cover
+        base = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'coloraide-extras')
+
+
+def gamut_xyz_to_rgb(gamut: str) -> Matrix:
+    """Get the matrix from XYZ D65 to the linear RGB of a basis gamut."""
+
+    matrix = SPACES.get(gamut)
+    if matrix is None:
+        raise ValueError(f"'{gamut}' is not a supported basis gamut, must be one of {tuple(SPACES)}")
+    return matrix
+
+
+def reconstruct_basis(gamut: str, resolution: int, size: int) -> Matrix:
+    """Reconstruct the seven basis curves of a gamut at the given resolution."""
+
+    gamut_xyz_to_rgb(gamut)
+    solver = get_solver(space=gamut, step=resolution, end=380 + (size - 1) * resolution)
+
+    # White can exceed a reflectance of 1 in wide gamuts, so it is solved within the spectral locus
+    white = solver.method_2([1.0, 1.0, 1.0])
+    curves = [white]
+    for name in NAMES[1:]:
+        target = TARGETS[name]
+        z = [0.0] * size
+        lam = [0.0, 0.0, 0.0]
+        f = 0.0
+        for k in range(1, STEPS + 1):
+            rgb = [GRAY + (c - GRAY) * k / STEPS for c in target]
+            result = solver.newton_3(rgb, z, lam, GUESS_ITERATIONS, TOLERANCE)
+            if result is None:
+                break
+            z, lam = result[:2]
+            f = k / STEPS
+        if not f:
+            raise ValueError(f"Could not reconstruct the basis curves of '{gamut}'")
+
+        # The curve matches `GRAY * (1 - f) + target * f`, remove the gray and scale it so that it matches the target.
+        # The curve may then fall slightly outside of 0 to 1, which is clamped when mixing.
+        offset = GRAY * (1 - f)
+        curves.append([((math.tanh(v) + 1) / 2 - offset * w) / f for v, w in zip(z, white)])
+    return curves
+
+
+def basis_path(gamut: str, resolution: int) -> str:
+    """Get the path of the cached basis curves of a gamut at the given resolution."""
+
+    return os.path.join(cache_dir(), f'basis-{gamut}-{resolution}nm.bin')
+
+
+def get_basis(gamut: str, resolution: int, size: int) -> Matrix:
+    """
+    Get the seven basis curves of a gamut, loading them from the user cache directory if they have been saved.
+
+    Otherwise, the curves are reconstructed and saved. If the cache directory cannot be written to, the curves
+    are reconstructed in each new session.
+    """
+
+    gamut_xyz_to_rgb(gamut)
+    path = basis_path(gamut, resolution)
+    try:
+        data = spectral_io.load(path, spectral_io.KIND_BASIS)
+    except (OSError, ValueError):
+        pass
+    else:
+        if data.resolution == resolution and data.bins == size and data.columns == size and data.rows == len(NAMES):
+            return [list(data.data[i * size:(i + 1) * size]) for i in range(data.rows)]
+
+    curves = reconstruct_basis(gamut, resolution, size)
+    values = []  # type: list[float]
+    for curve in curves:
+        values.extend(curve)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f'{path}.{os.getpid()}.tmp'
+        spectral_io.save(temp, spectral_io.KIND_BASIS, resolution, size, size, values, list(NAMES))
+        os.replace(temp, path)
+    except OSError:
+        pass
+    return curves
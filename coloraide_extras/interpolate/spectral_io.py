@@ -0,0 +1,124 @@
+"""
+Binary file format for spectral data such as lookup tables and pigment libraries.
+
+Files are a fixed little endian header, an optional list of newline separated UTF-8 names (one per row), and a
+body of little endian doubles laid out as `rows x columns`. The body is aligned to 8 bytes so
+that it can be memory mapped and viewed as doubles without parsing or copying, allowing every
+process that loads the same file to share a single copy in the page cache.
+
+Header layout:
+
+- `magic`: `CAESPEC` followed by a null byte
+- `version`: format version
+- `kind`: the kind of data (`KIND_LUT`, `KIND_PIGMENTS`, `KIND_SMOOTH`, or `KIND_BASIS`)
+- `resolution`: spectral resolution in nanometers
+- `bins`: number of wavelengths sampled at the resolution
+- `rows`: number of rows in the body
+- `columns`: number of doubles in each row
+- `names`: size of the names in bytes
+"""
+from __future__ import annotations
+import mmap
+import struct
+import sys
+from array import array
+from typing import NamedTuple, Sequence
+
+MAGIC = b'CAESPEC\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHHHHIII')
+
+KIND_LUT = 1
+KIND_PIGMENTS = 2
+KIND_SMOOTH = 3
+KIND_BASIS = 4
+
+
+class SpectralData(NamedTuple):
+    """Spectral data loaded from a file."""
+
+    kind: int
+    resolution: int
+    bins: int
+    rows: int
+    columns: int
+    names: list[str]
+    data: Sequence[float]
+
+
+def body_offset(names: int) -> int:
+    """Get the offset of the body, aligned to 8 bytes, given the size of the names."""
+
+    return (HEADER.size + names + 7) // 8 * 8
+
+
+def save(
+    path: str,
+    kind: int,
+    resolution: int,
+    bins: int,
+    columns: int,
+    data: Sequence[float],
+    names: Sequence[str] = ()
+) -> None:
+    """Save spectral data to a file."""
+
+    if columns < 1 or len(data) % columns:
+        raise ValueError(f'The data cannot be divided into rows of {columns} values')
+    rows = len(data) // columns
+    if names and len(names) != rows:
+        raise ValueError(f'Expected a name for each of the {rows} rows, but {len(names)} were provided')
+    for name in names:
+        # Names are separated by newlines, so they cannot be empty or contain newlines
+        if not name or '\n' in name:
+            raise ValueError(f'Names must not be empty or contain newlines, but {name!r} was provided')
+
+    encoded = '\n'.join(names).encode('utf-8')
+    body = array('d', data)
+    if sys.byteorder == 'big':  # pragma: no cover
+        body.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, kind, resolution, bins, rows, columns, len(encoded)))
+        f.write(encoded)
+        f.write(b'\x00' * (body_offset(len(encoded)) - HEADER.size - len(encoded)))
+        body.tofile(f)
+
+
+def load(path: str, kind: int | None = None) -> SpectralData:
+    """
+    Load spectral data from a file.
+
+    The body is memory mapped and viewed as doubles. On big endian systems, the body must
+    instead be copied to swap the byte order.
+    """
+
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"'{path}' is not a spectral data file") from None
+
+    view = memoryview(mm)
+    if len(view) < HEADER.size:
+        raise ValueError(f"'{path}' is not a spectral data file")
+    magic, version, kind_, resolution, bins, rows, columns, size = HEADER.unpack(view[:HEADER.size])
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a spectral data file")
+    if version != VERSION:
+        raise ValueError(f"'{path}' is version {version}, but only version {VERSION} is supported")
+    if kind is not None and kind != kind_:
+        raise ValueError(f"'{path}' does not contain the expected kind of spectral data")
+
+    names = bytes(view[HEADER.size:HEADER.size + size]).decode('utf-8').split('\n') if size else []
+    offset = body_offset(size)
+    end = offset + rows * columns * 8
+    if len(view) != end:
+        raise ValueError(f"'{path}' is truncated or has an invalid layout")
+
+    data = view[offset:end].cast('d')  # type: Sequence[float]
+    if sys.byteorder == 'big':  # pragma: no cover
+        swapped = array('d', data)
+        swapped.byteswap()
+        data = swapped
+    return SpectralData(kind_, resolution, bins, rows, columns, names, data)
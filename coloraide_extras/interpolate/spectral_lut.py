@@ -0,0 +1,201 @@
+"""
+Precomputed lattice of estimated reflectance curves over linear sRGB.
+
+Estimated reflectance curves are piecewise linear in linear sRGB, with the pieces split along the
+planes where two channels are equal. Tetrahedral interpolation splits each cell of the lattice along
+the same planes, so interpolating the reflectance curves of the nodes is exact within the gamut, except
+where reflectances are clamped. K/S is far from linear and interpolates poorly, so reflectance curves
+and residuals are stored and K/S is calculated after lookup.
+
+Also provides tables of precomputed mixes of fixed pairs of colors at evenly spaced ratios.
+"""
+from __future__ import annotations
+from array import array
+from coloraide import algebra as alg
+from coloraide.spaces.srgb_linear import RGB_TO_XYZ, XYZ_TO_RGB
+from coloraide.types import Vector, VectorLike, ColorInput
+from typing import Iterable, Sequence, TYPE_CHECKING
+from . import spectral
+from . import spectral_io
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coloraide.color import Color
+
+# Linear sRGB values this far outside the lattice are attributed to floating point error and clamped.
+TOLERANCE = 1e-9
+
+
+class ReflectanceLUT:
+    """A lattice of estimated reflectance curves and residuals over linear sRGB with tetrahedral interpolation."""
+
+    def __init__(self, size: int = 33, resolution: int = 10, data: Sequence[float] | None = None) -> None:
+        """Initialize, building the lattice if data is not provided."""
+
+        if size < 2:
+            raise ValueError(f'A lookup table requires at least 2 nodes per channel, not {size}')
+
+        self.size = size
+        self.tables = tables = spectral.get_tables(resolution)
+        self.stride = stride = tables.size + 3
+        count = size ** 3 * stride
+
+        if data is None:
+            values = array('d')
+            scale = size - 1
+            for r in range(size):
+                for g in range(size):
+                    for b in range(size):
+                        xyz = alg.matmul_x3(RGB_TO_XYZ, [r / scale, g / scale, b / scale], dims=alg.D2_D1)
+                        refl, res = spectral.single_constant_xyz_to_reflectance(xyz, tables)
+                        values.extend(refl)
+                        values.extend(res)
+            data = values
+        elif len(data) != count:
+            raise ValueError(f'Expected {count} values for a lookup table of size {size}, but found {len(data)}')
+        self.data = data
+
+    def lookup(self, xyz: VectorLike) -> tuple[Vector, Vector] | None:
+        """Look up the K/S curve and residual of an XYZ color, or `None` if it is outside of the lattice."""
+
+        size = self.size
+        scale = size - 1
+        index = []
+        frac = []
+        for v in alg.matmul_x3(XYZ_TO_RGB, xyz, dims=alg.D2_D1):
+            if v < -TOLERANCE or v > 1 + TOLERANCE:
+                return None
+            v = alg.clamp(v, 0.0, 1.0) * scale
+            i = min(int(v), scale - 1)
+            index.append(i)
+            frac.append(v - i)
+
+        # Select the tetrahedron by ordering the channels by their position within the cell
+        stride = self.stride
+        strides = (size * size * stride, size * stride, stride)
+        a, b, c = sorted(range(3), key=frac.__getitem__, reverse=True)
+        o0 = index[0] * strides[0] + index[1] * strides[1] + index[2] * strides[2]
+        o1 = o0 + strides[a]
+        o2 = o1 + strides[b]
+        o3 = o2 + strides[c]
+        w0 = 1 - frac[a]
+        w1 = frac[a] - frac[b]
+        w2 = frac[b] - frac[c]
+        w3 = frac[c]
+
+        data = self.data
+        values = [
+            w0 * v0 + w1 * v1 + w2 * v2 + w3 * v3
+            for v0, v1, v2, v3 in zip(
+                data[o0:o0 + stride], data[o1:o1 + stride], data[o2:o2 + stride], data[o3:o3 + stride]
+            )
+        ]
+        bins = self.tables.size
+        return spectral.reflectance_to_ks(values[:bins]), values[bins:]
+
+    def install(self) -> None:
+        """Use the lookup table when estimating K/S curves at the table's resolution."""
+
+        spectral.LUTS[self.tables] = self.lookup
+
+    def uninstall(self) -> None:
+        """Stop using the lookup table when estimating K/S curves."""
+
+        if spectral.LUTS.get(self.tables) == self.lookup:
+            del spectral.LUTS[self.tables]
+
+    def save(self, path: str) -> None:
+        """Save the lookup table to a spectral data file."""
+
+        spectral_io.save(path, spectral_io.KIND_LUT, self.tables.resolution, self.tables.size, self.stride, self.data)
+
+    @classmethod
+    def load(cls, path: str) -> ReflectanceLUT:
+        """Load a lookup table from a spectral data file, memory mapping the lattice."""
+
+        data = spectral_io.load(path, spectral_io.KIND_LUT)
+        tables = spectral.get_tables(data.resolution)
+        size = round(data.rows ** (1 / 3))
+        if data.bins != tables.size or data.columns != tables.size + 3 or size ** 3 != data.rows:
+            raise ValueError(f"'{path}' does not have the layout of a {data.resolution}nm lookup table")
+        return cls(size, data.resolution, data.data)
+
+
+class MixTable:
+    """
+    Precomputed spectral mixes of every pair of colors in a palette at evenly spaced ratios.
+
+    Mixes between entries are linearly interpolated. When built, the memory used by the table and the
+    largest delta E between the interpolated and exact mixes, measured midway between entries, are recorded.
+    Alpha is ignored.
+    """
+
+    def __init__(
+        self,
+        color_cls: type[Color],
+        colors: Iterable[ColorInput],
+        size: int = 129,
+        resolution: int = 10,
+        delta_e: str | None = None
+    ) -> None:
+        """Initialize, building the mixes of every pair of colors."""
+
+        if size < 2:
+            raise ValueError(f'A mix table requires at least 2 entries per pair, not {size}')
+
+        self.size = size
+        self.tables = tables = spectral.get_tables(resolution)
+        self.xyz = [color_cls(c).convert(spectral.SPACE).coords(nans=False) for c in colors]
+        n = len(self.xyz)
+        if n < 2:
+            raise ValueError('At least two colors are required in a mix table')
+
+        scale = size - 1
+        ts = [k / scale for k in range(size)]
+        mids = [(k + 0.5) / scale for k in range(scale)]
+        self.data = data = array('d')
+        self.error = 0.0
+        for i in range(n):
+            ks1, res1 = spectral.xyz_to_ks(self.xyz[i], tables)
+            l1 = self.xyz[i][1]
+            for j in range(i + 1, n):
+                ks2, res2 = spectral.xyz_to_ks(self.xyz[j], tables)
+                l2 = self.xyz[j][1]
+                start = len(data)
+                for xyz in spectral.ks_mix_batch(ks1, res1, l1, ks2, res2, l2, ts, tables):
+                    data.extend(xyz)
+
+                # Linear interpolation is least accurate between entries
+                for k, xyz in enumerate(spectral.ks_mix_batch(ks1, res1, l1, ks2, res2, l2, mids, tables)):
+                    o = start + k * 3
+                    approx = [(data[o + c] + data[o + 3 + c]) / 2 for c in range(3)]
+                    self.error = max(
+                        self.error,
+                        color_cls(spectral.SPACE, approx).delta_e(color_cls(spectral.SPACE, xyz), method=delta_e)
+                    )
+        self.memory = data.itemsize * len(data)
+
+    def lookup(self, i: int, j: int, t: float) -> Vector:
+        """Look up the XYZ value of the mix of the palette colors at the given indexes at progress `t`."""
+
+        if i == j:
+            return list(self.xyz[i])
+        if i > j:
+            i, j, t = j, i, 1 - t
+
+        # Pairs are stored in order: (0, 1), (0, 2), ..., (1, 2), ...
+        n = len(self.xyz)
+        if i < 0 or j >= n:
+            raise IndexError(f'Color indexes must be between 0 and {n - 1}')
+        pair = i * n - i * (i + 1) // 2 + j - i - 1
+
+        scale = self.size - 1
+        pos = alg.clamp(t, 0.0, 1.0) * scale
+        k = min(int(pos), scale - 1)
+        f = pos - k
+        o = (pair * self.size + k) * 3
+        data = self.data
+        return [
+            data[o] + (data[o + 3] - data[o]) * f,
+            data[o + 1] + (data[o + 4] - data[o + 1]) * f,
+            data[o + 2] + (data[o + 5] - data[o + 2]) * f
+        ]
@@ -0,0 +1,297 @@
+"""
+NumPy backend for spectral mixing.
+
+Mirrors the pure Python Kubelka-Munk kernel in `spectral`, but operates on arrays so that
+N colors or N mixes are processed as (N, bins) matrix operations. NumPy is not a requirement
+of this project, so this module should only be imported when the NumPy backend is requested.
+"""
+from __future__ import annotations
+import numpy as np
+import numpy.typing as npt
+from coloraide.types import Vector, VectorLike
+from typing import Sequence, TYPE_CHECKING
+from . import spectral
+from .spectral import SpectralTables, DEFAULT_TABLES
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .spectral_reconstruct import ReflectanceSolver
+
+Array = npt.NDArray[np.float64]
+
+
+class ArrayTables:
+    """Spectral tables as arrays: basis curves are (7, bins), the CMFs are (bins, 3)."""
+
+    def __init__(self, tables: SpectralTables) -> None:
+        """Initialize."""
+
+        self.reflectance = np.array(tables.reflectance, dtype=np.float64)
+        self.cmfs = np.array([tables.x_bar, tables.y_bar, tables.z_bar], dtype=np.float64).T
+        self.xyz_to_rgb = np.array(tables.xyz_to_rgb, dtype=np.float64).T
+
+
+ARRAYS = {}  # type: dict[SpectralTables, ArrayTables]
+
+
+def get_arrays(tables: SpectralTables) -> ArrayTables:
+    """Get the array form of the given spectral tables."""
+
+    arrays = ARRAYS.get(tables)
+    if arrays is None:
+        arrays = ARRAYS[tables] = ArrayTables(tables)
+    return arrays
+
+
+def xyz_to_concentration(xyz: npt.ArrayLike, tables: SpectralTables = DEFAULT_TABLES) -> Array:
+    """Convert one (3,) or many (N, 3) XYZ colors to concentrations of the spectral curves of our palette."""
+
+    lrgb = np.asarray(xyz, dtype=np.float64) @ get_arrays(tables).xyz_to_rgb
+    w = np.maximum(lrgb.min(axis=-1), 0.0)
+    r, g, b = lrgb[..., 0] - w, lrgb[..., 1] - w, lrgb[..., 2] - w
+    cy = np.maximum(np.minimum(g, b), 0.0)
+    ma = np.maximum(np.minimum(r, b - cy), 0.0)
+    ye = np.maximum(np.minimum(r - ma, g - cy), 0.0)
+    r = r - (ma + ye)
+    g = g - (cy + ye)
+    b = b - (cy + ma)
+    return np.stack(
+        [
+            np.minimum(w, 1.0),
+            np.minimum(cy, 1.0),
+            np.minimum(ma, 1.0),
+            np.minimum(ye, 1.0),
+            np.clip(r, 0.0, 1.0),
+            np.clip(g, 0.0, 1.0),
+            np.clip(b, 0.0, 1.0)
+        ],
+        axis=-1
+    )
+
+
+def single_constant_xyz_to_reflectance(
+    xyz: npt.ArrayLike,
+    tables: SpectralTables = DEFAULT_TABLES
+) -> tuple[Array, Array]:
+    """Convert one (3,) or many (N, 3) XYZ colors to reflectance curves and residuals."""
+
+    values = np.asarray(xyz, dtype=np.float64)
+    r = np.clip(xyz_to_concentration(values, tables) @ get_arrays(tables).reflectance, spectral.EPSILON, 1.0)
+    return r, values - reflectance_to_xyz(r, tables)
+
+
+def reflectance_to_xyz(r: npt.ArrayLike, tables: SpectralTables = DEFAULT_TABLES) -> Array:
+    """Convert one (bins,) or many (N, bins) reflectance curves to XYZ."""
+
+    return np.asarray(r, dtype=np.float64) @ get_arrays(tables).cmfs
+
+
+def reflectance_to_ks(r: npt.ArrayLike) -> Array:
+    """Convert one (bins,) or many (N, bins) reflectance curves to K/S."""
+
+    refl = np.asarray(r, dtype=np.float64)
+    return (1 - refl) ** 2 / (2 * refl)
+
+
+def xyz_to_ks(xyz: npt.ArrayLike, tables: SpectralTables = DEFAULT_TABLES) -> tuple[Array, Array]:
+    """Convert one (3,) or many (N, 3) XYZ colors to K/S curves and residuals."""
+
+    r, res = single_constant_xyz_to_reflectance(xyz, tables)
+    return reflectance_to_ks(r), res
+
+
+def estimate_ks(xyz: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> tuple[Vector, Vector]:
+    """Estimate the K/S curve and residual of an XYZ color, using a lookup table if one is installed."""
+
+    lookup = spectral.LUTS.get(tables)
+    if lookup is not None:
+        value = lookup(xyz)
+        if value is not None:
+            return value
+    ks, res = xyz_to_ks(xyz, tables)
+    return ks.tolist(), res.tolist()
+
+
+def ks_mix_batch(
+    ks1: npt.ArrayLike,
+    res1: npt.ArrayLike,
+    l1: float,
+    ks2: npt.ArrayLike,
+    res2: npt.ArrayLike,
+    l2: float,
+    ts: npt.ArrayLike,
+    tables: SpectralTables = DEFAULT_TABLES
+) -> Array:
+    """Mix two colors, already converted to K/S curves and residuals, returning an (N, 3) array of XYZ colors."""
+
+    t = np.asarray(ts, dtype=np.float64).reshape(-1, 1)
+
+    # Calculate the concentrations biased towards the more luminous color, sharing the weighting of the Python backend
+    c = np.array([spectral.calculate_mixing_concentration(x, l1, l2) for x in t[:, 0]], dtype=np.float64).reshape(-1, 2)
+
+    # Apply the Kubelka-Munk mixing and convert back to reflectance
+    ks = c[:, :1] * np.asarray(ks1, dtype=np.float64) + c[:, 1:] * np.asarray(ks2, dtype=np.float64)
+    r = 1 + ks - np.sqrt(ks ** 2 + 2 * ks)
+
+    # Convert the reflection back to XYZ and add back in any residual
+    a = np.asarray(res1, dtype=np.float64)
+    return reflectance_to_xyz(r, tables) + a + (np.asarray(res2, dtype=np.float64) - a) * t
+
+
+def spectral_mix_batch(
+    xyz1: VectorLike,
+    xyz2: VectorLike,
+    ts: npt.ArrayLike,
+    tables: SpectralTables = DEFAULT_TABLES
+) -> Array:
+    """Interpolate two colors applying Kubelka-Munk theory at multiple progress points."""
+
+    ks1, res1 = xyz_to_ks(xyz1, tables)
+    ks2, res2 = xyz_to_ks(xyz2, tables)
+    return ks_mix_batch(ks1, res1, xyz1[1], ks2, res2, xyz2[1], ts, tables)
+
+
+def spectral_mix(xyz1: VectorLike, xyz2: VectorLike, t: float, tables: SpectralTables = DEFAULT_TABLES) -> Vector:
+    """Interpolate two colors applying Kubelka-Munk theory."""
+
+    return spectral_mix_batch(xyz1, xyz2, (t,), tables)[0].tolist()  # type: ignore[no-any-return]
+
+
+def bordered_step(solver: ReflectanceSolver, adjust: Array, border: Array, f: Array) -> Array | None:
+    """
+    Solve a stack of (M, bins + 3, bins + 3) bordered Jacobians for Newton steps in O(bins).
+
+    Mirrors `ReflectanceSolver.bordered_step`, performing the Thomas algorithm for every Jacobian at once.
+    Returns `None` if any pivot is too small to solve stably.
+    """
+
+    from .spectral_reconstruct import OFF_DIAGONAL, PIVOT_TOLERANCE
+
+    count, n = adjust.shape
+    m = n - 1
+    off = OFF_DIAGONAL
+    diag = np.asarray(solver.diagonal, dtype=np.float64) + adjust
+
+    # Coupling of the tridiagonal block to the remaining unknowns
+    coupling = np.zeros((count, m, 4))
+    coupling[:, -1, 0] = off
+    coupling[:, :, 1:] = border[:, :m]
+    cols = np.concatenate((-f[:, :m, None], coupling), axis=2)
+
+    # Thomas algorithm: forward elimination followed by back substitution for every column
+    threshold = PIVOT_TOLERANCE * np.abs(diag).max(axis=1)
+    cp = np.empty((count, m))
+    prev = np.zeros(count)
+    for i in range(m):
+        w = diag[:, i] - off * prev
+        if not np.all(np.abs(w) > threshold):
+            return None
+        prev = cp[:, i] = off / w
+        if i:
+            cols[:, i] = (cols[:, i] - off * cols[:, i - 1]) / w[:, None]
+        else:
+            cols[:, i] /= w[:, None]
+    for i in range(m - 2, -1, -1):
+        cols[:, i] -= cp[:, i, None] * cols[:, i + 1]
+    u = cols[:, :, 0]
+    v = cols[:, :, 1:]
+
+    # Solve the Schur complement of the remaining unknowns
+    last = border[:, -1]
+    c = np.zeros((count, 4, 4))
+    c[:, 0, 0] = diag[:, -1]
+    c[:, 0, 1:] = last
+    c[:, 1:, 0] = last
+    schur = c - coupling.transpose(0, 2, 1) @ v
+    r = -f[:, m:] - np.einsum('kia,ki->ka', coupling, u)
+    try:
+        y = np.linalg.solve(schur, r[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return None
+    return np.concatenate((u - (v @ y[..., None])[..., 0], y), axis=1)
+
+
+def dense_step(solver: ReflectanceSolver, adjust: Array, border: Array, f: Array) -> Array:
+    """Solve a stack of (M, bins + 3, bins + 3) bordered Jacobians for Newton steps as dense matrices."""
+
+    from .spectral_reconstruct import OFF_DIAGONAL
+
+    count, n = adjust.shape
+    diagonal = np.arange(n)
+    j = np.zeros((count, n + 3, n + 3))
+    j[:, diagonal, diagonal] = np.asarray(solver.diagonal, dtype=np.float64) + adjust
+    j[:, diagonal[1:], diagonal[:-1]] = OFF_DIAGONAL
+    j[:, diagonal[:-1], diagonal[1:]] = OFF_DIAGONAL
+    j[:, :n, n:] = border
+    j[:, n:, :n] = border.transpose(0, 2, 1)
+    b = -f[..., None]
+    try:
+        step = np.linalg.solve(j, b).astype(np.float64)  # type: Array
+    except np.linalg.LinAlgError:
+        step = np.linalg.pinv(j) @ b
+    return step[..., 0]
+
+
+def reconstruct(
+    solver: ReflectanceSolver,
+    rgbs: Sequence[VectorLike],
+    method: int = 3,
+    max_iterations: int = 50,
+    tolerance: float = 1e-12
+) -> Array:
+    """
+    Reconstruct the reflectance curves of (N, 3) linear RGB colors with method 2 or 3.
+
+    The Newton iterations of all colors that have not yet converged are performed together.
+    """
+
+    target = np.asarray(rgbs, dtype=np.float64).reshape(-1, 3)
+    count = len(target)
+    n = solver.size
+    a = np.array(solver.weights, dtype=np.float64)
+
+    z = np.zeros((count, n))
+    lam = np.zeros((count, 3))
+    result = np.empty((count, n))
+    active = np.arange(count)
+    with np.errstate(over='ignore'):
+        for _ in range(max_iterations):
+            if not len(active):
+                break
+            zc = z[active]
+            al = lam[active] @ a.T
+            dz = np.empty_like(zc)
+            dz[:, 0] = 2 * zc[:, 0] - 2 * zc[:, 1]
+            dz[:, 1:-1] = -2 * zc[:, :-2] + 4 * zc[:, 1:-1] - 2 * zc[:, 2:]
+            dz[:, -1] = -2 * zc[:, -2] + 2 * zc[:, -1]
+            if method == 3:
+                t = np.tanh(zc)
+                s2 = 1 / np.cosh(zc) ** 2
+                r = (t + 1) / 2
+                border = (s2 / 2)[..., None] * a
+                f1 = dz + s2 / 2 * al
+                adjust = -s2 * t * al
+            else:
+                r = np.exp(zc)
+                border = r[..., None] * a
+                adjust = r * al
+                f1 = dz + adjust
+            f = np.concatenate((f1, r @ a - target[active]), axis=1)
+
+            delta = bordered_step(solver, adjust, border, f)
+            if delta is None:
+                delta = dense_step(solver, adjust, border, f)
+            z[active] += delta[:, :n]
+            lam[active] += delta[:, n:]
+
+            # Colors whose stationary point conditions were met are finished
+            done = np.all(np.abs(f) < tolerance, axis=1)
+            finished = active[done]
+            result[finished] = (np.tanh(z[finished]) + 1) / 2 if method == 3 else np.exp(z[finished])
+            active = active[~done]
+
+    if len(active):
+        raise ValueError(
+            f'Could not solve for {target[active[0]].tolist()}, make sure it is within the '
+            + ('object color solid' if method == 3 else 'spectral locus')
+        )
+    return result
@@ -0,0 +1,475 @@
+"""
+Reconstruct smooth reflectance curves from colors.
+
+Approaches come from Scott Burns.
+http://scottburns.us/matlab-octave-and-python-source-code-for-refl-recon-chrom-adapt/
+
+Method 2 (LLSS, least log slope squared) finds the smoothest positive reflectance curve that matches a color within
+the spectral locus, while method 3 (LHTSS, least hyperbolic tangent slope squared) finds the smoothest reflectance
+curve, strictly between 0 and 1, that matches a color within the object color solid. Both solve for a stationary
+point of the Lagrangian with Newton's method.
+
+References:
+- Burns SA. Numerical methods for smoothest reflectance reconstruction. Color Research & Application, Vol 45,
+  No 1, 2020, pp 8-21.
+- Generating Reflectance Curves from sRGB Triplets, 2015. http://scottburns.us/reflectance-curves-from-srgb/
+"""
+from __future__ import annotations
+import math
+from collections import namedtuple
+from coloraide import algebra as alg
+from coloraide import cmfs as _cmfs
+from coloraide.spaces import a98_rgb_linear, display_p3_linear, rec2020_linear, srgb_linear
+from coloraide.types import Vector, VectorLike, Matrix
+from typing import Iterable, Sequence
+
+# CIE standard illuminant D65 at 1nm intervals from 300nm to 830nm
+D65 = dict(zip(range(300, 831), (
+    0.0341, 0.36014, 0.68618, 1.01222, 1.33826, 1.6643, 1.99034, 2.31638, 2.64242, 2.96846, 3.2945, 4.98865,
+    6.6828, 8.37695, 10.0711, 11.7652, 13.4594, 15.1535, 16.8477, 18.5418, 20.236, 21.9177, 23.5995, 25.2812,
+    26.963, 28.6447, 30.3265, 32.0082, 33.69, 35.3717, 37.0535, 37.343, 37.6326, 37.9221, 38.2116, 38.5011,
+    38.7907, 39.0802, 39.3697, 39.6593, 39.9488, 40.4451, 40.9414, 41.4377, 41.934, 42.4302, 42.9265, 43.4228,
+    43.9191, 44.4154, 44.9117, 45.0844, 45.257, 45.4297, 45.6023, 45.775, 45.9477, 46.1203, 46.293, 46.4656,
+    46.6383, 47.1834, 47.7285, 48.2735, 48.8186, 49.3637, 49.9088, 50.4539, 50.9989, 51.544, 52.0891, 51.8777,
+    51.6664, 51.455, 51.2437, 51.0323, 50.8209, 50.6096, 50.3982, 50.1869, 49.9755, 50.4428, 50.91, 51.3773,
+    51.8446, 52.3118, 52.7791, 53.2464, 53.7137, 54.1809, 54.6482, 57.4589, 60.2695, 63.0802, 65.8909, 68.7015,
+    71.5122, 74.3229, 77.1336, 79.9442, 82.7549, 83.628, 84.5011, 85.3742, 86.2473, 87.1204, 87.9936, 88.8667,
+    89.7398, 90.6129, 91.486, 91.6806, 91.8752, 92.0697, 92.2643, 92.4589, 92.6535, 92.8481, 93.0426, 93.2372,
+    93.4318, 92.7568, 92.0819, 91.4069, 90.732, 90.057, 89.3821, 88.7071, 88.0322, 87.3572, 86.6823, 88.5006,
+    90.3188, 92.1371, 93.9554, 95.7736, 97.5919, 99.4102, 101.228, 103.047, 104.865, 106.079, 107.294, 108.508,
+    109.722, 110.936, 112.151, 113.365, 114.579, 115.794, 117.008, 117.088, 117.169, 117.249, 117.33, 117.41,
+    117.49, 117.571, 117.651, 117.732, 117.812, 117.517, 117.222, 116.927, 116.632, 116.336, 116.041, 115.746,
+    115.451, 115.156, 114.861, 114.967, 115.073, 115.18, 115.286, 115.392, 115.498, 115.604, 115.711, 115.817,
+    115.923, 115.212, 114.501, 113.789, 113.078, 112.367, 111.656, 110.945, 110.233, 109.522, 108.811, 108.865,
+    108.92, 108.974, 109.028, 109.082, 109.137, 109.191, 109.245, 109.3, 109.354, 109.199, 109.044, 108.888,
+    108.733, 108.578, 108.423, 108.268, 108.112, 107.957, 107.802, 107.501, 107.2, 106.898, 106.597, 106.296,
+    105.995, 105.694, 105.392, 105.091, 104.79, 105.08, 105.37, 105.66, 105.95, 106.239, 106.529, 106.819,
+    107.109, 107.399, 107.689, 107.361, 107.032, 106.704, 106.375, 106.047, 105.719, 105.39, 105.062, 104.733,
+    104.405, 104.369, 104.333, 104.297, 104.261, 104.225, 104.19, 104.154, 104.118, 104.082, 104.046, 103.641,
+    103.237, 102.832, 102.428, 102.023, 101.618, 101.214, 100.809, 100.405, 100, 99.6334, 99.2668, 98.9003,
+    98.5337, 98.1671, 97.8005, 97.4339, 97.0674, 96.7008, 96.3342, 96.2796, 96.225, 96.1703, 96.1157, 96.0611,
+    96.0065, 95.9519, 95.8972, 95.8426, 95.788, 95.0778, 94.3675, 93.6573, 92.947, 92.2368, 91.5266, 90.8163,
+    90.1061, 89.3958, 88.6856, 88.8177, 88.9497, 89.0818, 89.2138, 89.3459, 89.478, 89.61, 89.7421, 89.8741,
+    90.0062, 89.9655, 89.9248, 89.8841, 89.8434, 89.8026, 89.7619, 89.7212, 89.6805, 89.6398, 89.5991, 89.4091,
+    89.219, 89.029, 88.8389, 88.6489, 88.4589, 88.2688, 88.0788, 87.8887, 87.6987, 87.2577, 86.8167, 86.3757,
+    85.9347, 85.4936, 85.0526, 84.6116, 84.1706, 83.7296, 83.2886, 83.3297, 83.3707, 83.4118, 83.4528, 83.4939,
+    83.535, 83.576, 83.6171, 83.6581, 83.6992, 83.332, 82.9647, 82.5975, 82.2302, 81.863, 81.4958, 81.1285,
+    80.7613, 80.394, 80.0268, 80.0456, 80.0644, 80.0831, 80.1019, 80.1207, 80.1395, 80.1583, 80.177, 80.1958,
+    80.2146, 80.4209, 80.6272, 80.8336, 81.0399, 81.2462, 81.4525, 81.6588, 81.8652, 82.0715, 82.2778, 81.8784,
+    81.4791, 81.0797, 80.6804, 80.281, 79.8816, 79.4823, 79.0829, 78.6836, 78.2842, 77.4279, 76.5716, 75.7153,
+    74.859, 74.0027, 73.1465, 72.2902, 71.4339, 70.5776, 69.7213, 69.9101, 70.0989, 70.2876, 70.4764, 70.6652,
+    70.854, 71.0428, 71.2315, 71.4203, 71.6091, 71.8831, 72.1571, 72.4311, 72.7051, 72.979, 73.253, 73.527,
+    73.801, 74.075, 74.349, 73.0745, 71.8, 70.5255, 69.251, 67.9765, 66.702, 65.4275, 64.153, 62.8785, 61.604,
+    62.4322, 63.2603, 64.0885, 64.9166, 65.7448, 66.573, 67.4011, 68.2293, 69.0574, 69.8856, 70.4057, 70.9259,
+    71.446, 71.9662, 72.4863, 73.0064, 73.5266, 74.0467, 74.5669, 75.087, 73.9376, 72.7881, 71.6387, 70.4893,
+    69.3398, 68.1904, 67.041, 65.8916, 64.7421, 63.5927, 61.8752, 60.1578, 58.4403, 56.7229, 55.0054, 53.288,
+    51.5705, 49.8531, 48.1356, 46.4182, 48.4569, 50.4956, 52.5344, 54.5731, 56.6118, 58.6505, 60.6892, 62.728,
+    64.7667, 66.8054, 66.4631, 66.1209, 65.7786, 65.4364, 65.0941, 64.7518, 64.4096, 64.0673, 63.7251, 63.3828,
+    63.4749, 63.567, 63.6592, 63.7513, 63.8434, 63.9355, 64.0276, 64.1198, 64.2119, 64.304, 63.8188, 63.3336,
+    62.8484, 62.3632, 61.8779, 61.3927, 60.9075, 60.4223, 59.9371, 59.4519, 58.7026, 57.9533, 57.204, 56.4547,
+    55.7054, 54.9562, 54.2069, 53.4576, 52.7083, 51.959, 52.5072, 53.0553, 53.6035, 54.1516, 54.6998, 55.248,
+    55.7961, 56.3443, 56.8924, 57.4406, 57.7278, 58.015, 58.3022, 58.5894, 58.8765, 59.1637, 59.4509, 59.7381,
+    60.0253, 60.3125
+)))
+
+ILLUMINANTS = {'d65': D65}  # type: dict[str, dict[int, float]]
+
+CMFS = {
+    'cie-1931-2deg': _cmfs.CIE_1931_2DEG,
+    'cie-1964-10deg': _cmfs.CIE_1964_10DEG,
+    'cie-2015-2deg': _cmfs.CIE_2015_2DEG,
+    'cie-2015-10deg': _cmfs.CIE_2015_10DEG
+}  # type: dict[str, dict[int, tuple[float, float, float]]]
+
+# Matrices from XYZ to the linear form of RGB spaces with a D65 white point
+SPACES = {
+    'srgb': srgb_linear.XYZ_TO_RGB,
+    'display-p3': display_p3_linear.XYZ_TO_RGB,
+    'a98-rgb': a98_rgb_linear.XYZ_TO_RGB,
+    'rec2020': rec2020_linear.XYZ_TO_RGB
+}  # type: dict[str, Matrix]
+
+
+# Off diagonal finite differencing constant
+OFF_DIAGONAL = -2.0
+# Pivots of the Thomas algorithm smaller than this, relative to the largest diagonal value, are considered unstable
+PIVOT_TOLERANCE = 1e-10
+# Initial guesses are kept this far from the bounds of the reflectance so that they can be transformed
+LIMIT = 1 - 1e-12
+# Iterations allowed for an initial guess to converge before the color is solved again from a flat curve.
+# From a flat curve, colors typically converge in 5 to 8 iterations, so a guess needing more is not worthwhile.
+GUESS_ITERATIONS = 10
+
+ReconstructResult = namedtuple('ReconstructResult', ['curve', 'multipliers', 'iterations'])
+
+
+def sech2(x: float) -> float:
+    """Calculate the square of the hyperbolic secant, returning zero if the hyperbolic cosine overflows."""
+
+    try:
+        return 1 / math.cosh(x) ** 2
+    except OverflowError:
+        return 0.0
+
+
+def exp(x: float) -> float:
+    """Calculate the exponential, returning zero if it overflows."""
+
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return 0.0
+
+
+class ReflectanceSolver:
+    """
+    Reconstruct reflectance curves for colors in an RGB space.
+
+    The illuminant referenced CMFs, and their transform to the RGB space, are calculated once
+    and shared by every color that is solved.
+    """
+
+    def __init__(
+        self,
+        illuminant: str = 'd65',
+        cmfs: str = 'cie-1931-2deg',
+        space: str = 'srgb',
+        step: int = 10,
+        start: int = 380,
+        end: int = 750
+    ) -> None:
+        """Initialize."""
+
+        if illuminant not in ILLUMINANTS:
+            raise ValueError(f"'{illuminant}' is not a recognized illuminant")
+        if cmfs not in CMFS:
+            raise ValueError(f"'{cmfs}' is not a recognized set of color matching functions")
+        if space not in SPACES:
+            raise ValueError(f"'{space}' is not a supported RGB space")
+        if step < 1 or end - start < step:
+            raise ValueError(f'Cannot sample wavelengths from {start}nm to {end}nm every {step}nm')
+
+        spd = ILLUMINANTS[illuminant]
+        cmf = CMFS[cmfs]
+        self.wavelengths = list(range(start, end + 1, step))
+        missing = [w for w in self.wavelengths if w not in spd or w not in cmf]
+        if missing:
+            raise ValueError(f'No data at {missing[0]}nm for the illuminant or color matching functions')
+
+        self.illuminant = illuminant
+        self.space = space
+        self.size = len(self.wavelengths)
+        self.xyz_to_rgb = SPACES[space]
+
+        # Illuminant referenced CMFs, normalized so that a perfect reflector has a luminance of 1
+        w = [spd[wl] for wl in self.wavelengths]
+        a = [[cmf[wl][k] * wt for wl, wt in zip(self.wavelengths, w)] for k in range(3)]
+        y = sum(a[1])
+        self.cmfs = [[v / y for v in row] for row in a]
+
+        # The CMFs in relation to the RGB space, as a (bins, 3) matrix
+        self.weights = alg.transpose(alg.matmul(self.xyz_to_rgb, self.cmfs))
+
+        # The diagonal of the tridiagonal finite differencing constants, the off diagonals are all `OFF_DIAGONAL`
+        self.diagonal = [2.0] + [4.0] * (self.size - 2) + [2.0]
+
+    def rgb(self, xyz: VectorLike) -> Vector:
+        """Convert an XYZ color to the linear RGB values that are solved for."""
+
+        return alg.matmul_x3(self.xyz_to_rgb, xyz, dims=alg.D2_D1)
+
+    def difference(self, z: VectorLike) -> Vector:
+        """Multiply a vector by the finite differencing constants."""
+
+        dz = [2.0 * z[0] - 2.0 * z[1]]
+        dz.extend(-2.0 * z[i - 1] + 4.0 * z[i] - 2.0 * z[i + 1] for i in range(1, self.size - 1))
+        dz.append(-2.0 * z[-2] + 2.0 * z[-1])
+        return dz
+
+    def newton_step(self, diagonal: VectorLike, border: Matrix, f: VectorLike) -> Vector:
+        """
+        Solve for the Newton step of the stationary point conditions.
+
+        The Jacobian is the tridiagonal finite differencing constants, with the given values added to the diagonal,
+        bordered by the given (bins, 3) matrix, its transpose, and a (3, 3) block of zeros. The step is solved in
+        O(bins) with `bordered_step`, falling back to solving the Jacobian as a dense matrix if that is not stable.
+        """
+
+        step = self.bordered_step(diagonal, border, f)
+        return self.dense_step(diagonal, border, f) if step is None else step
+
+    def bordered_step(self, diagonal: VectorLike, border: Matrix, f: VectorLike) -> Vector | None:
+        """
+        Solve for the Newton step by exploiting the structure of the Jacobian.
+
+        The finite differencing constants are singular, so the Jacobian's tridiagonal block is not solved whole.
+        Instead, the tridiagonal block without its last row and column is solved with the Thomas algorithm, for
+        the residuals and for its coupling to the remaining 4 unknowns (the last bin and the 3 multipliers), which
+        are then solved with their (4, 4) Schur complement. Returns `None` if a pivot is too small to solve stably.
+        """
+
+        m = self.size - 1
+        off = OFF_DIAGONAL
+        diag = [d + v for d, v in zip(self.diagonal, diagonal)]
+
+        # Coupling of the tridiagonal block to the remaining unknowns
+        coupling = [[0.0] * (m - 1) + [off]] + [[row[k] for row in border[:m]] for k in range(3)]
+        cols = [[-v for v in f[:m]]] + [col[:] for col in coupling]
+
+        # Thomas algorithm: forward elimination followed by back substitution for every column
+        threshold = PIVOT_TOLERANCE * max(abs(v) for v in diag)
+        cp = [0.0] * m
+        prev = 0.0
+        for i in range(m):
+            w = diag[i] - off * prev
+            if not abs(w) > threshold:
+                return None
+            prev = cp[i] = off / w
+            if i:
+                for col in cols:
+                    col[i] = (col[i] - off * col[i - 1]) / w
+            else:
+                for col in cols:
+                    col[i] /= w
+        for i in range(m - 2, -1, -1):
+            p = cp[i]
+            for col in cols:
+                col[i] -= p * col[i + 1]
+        u = cols[0]
+        v = cols[1:]
+
+        # Solve the Schur complement of the remaining unknowns
+        last = border[-1]
+        c = [
+            [diag[-1], last[0], last[1], last[2]],
+            [last[0], 0.0, 0.0, 0.0],
+            [last[1], 0.0, 0.0, 0.0],
+            [last[2], 0.0, 0.0, 0.0]
+        ]
+        schur = [[c[a][b] - alg.vdot(coupling[a], v[b]) for b in range(4)] for a in range(4)]
+        r = [-f[m + a] - alg.vdot(coupling[a], u) for a in range(4)]
+        try:
+            y = alg.solve(schur, r)
+        except (ValueError, ZeroDivisionError):
+            return None
+
+        x = [u[i] - (v[0][i] * y[0] + v[1][i] * y[1] + v[2][i] * y[2] + v[3][i] * y[3]) for i in range(m)]
+        x.extend(y)
+        return x
+
+    def dense_step(self, diagonal: VectorLike, border: Matrix, f: VectorLike) -> Vector:
+        """Solve for the Newton step with the Jacobian as a dense matrix."""
+
+        n = self.size
+        j = []
+        for i in range(n):
+            row = [0.0] * n + border[i][:]
+            row[i] = self.diagonal[i] + diagonal[i]
+            if i:
+                row[i - 1] = OFF_DIAGONAL
+            if i < n - 1:
+                row[i + 1] = OFF_DIAGONAL
+            j.append(row)
+        j.extend(list(col) + [0.0, 0.0, 0.0] for col in zip(*border))
+        b = [-v for v in f]
+        try:
+            try:
+                return alg.solve(j, b)
+            except (ValueError, ZeroDivisionError):
+                return alg.matmul(alg.pinv(j), b, dims=alg.D2_D1)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            raise ValueError('Ill-conditioned or singular linear system detected') from None
+
+    def newton_2(
+        self,
+        rgb: VectorLike,
+        z: Vector,
+        lam: Vector,
+        max_iterations: int,
+        tolerance: float
+    ) -> tuple[Vector, Vector, int] | None:
+        """
+        Perform the Newton iterations of method 2 from the given log reflectance and multipliers.
+
+        Returns the solved log reflectance, multipliers, and the number of iterations, or `None` if not solved.
+        """
+
+        n = self.size
+        a = self.weights
+        for i in range(max_iterations):
+            r = [exp(v) for v in z]
+            dra = [[ri * c for c in row] for ri, row in zip(r, a)]
+            v = [alg.vdot(row, lam) for row in dra]
+            f = [x + y for x, y in zip(self.difference(z), v)]
+            f.extend(sum(row[k] * ri for ri, row in zip(r, a)) - rgb[k] for k in range(3))
+            delta = self.newton_step(v, dra, f)
+            z = [x + y for x, y in zip(z, delta)]
+            lam = [x + y for x, y in zip(lam, delta[n:])]
+            if all(abs(x) < tolerance for x in f):
+                return z, lam, i + 1
+        return None
+
+    def newton_3(
+        self,
+        rgb: VectorLike,
+        z: Vector,
+        lam: Vector,
+        max_iterations: int,
+        tolerance: float
+    ) -> tuple[Vector, Vector, int] | None:
+        """
+        Perform the Newton iterations of method 3 from the given hyperbolic tangent reflectance and multipliers.
+
+        Returns the solved curve in hyperbolic tangent form, multipliers, and the number of iterations, or `None` if
+        not solved.
+        """
+
+        n = self.size
+        a = self.weights
+        for i in range(max_iterations):
+            t = [math.tanh(v) for v in z]
+            s2 = [sech2(v) for v in z]
+            r = [(v + 1) / 2 for v in t]
+            d1a = [[si / 2 * c for c in row] for si, row in zip(s2, a)]
+            f = [x + alg.vdot(row, lam) for x, row in zip(self.difference(z), d1a)]
+            f.extend(sum(row[k] * ri for ri, row in zip(r, a)) - rgb[k] for k in range(3))
+            adjust = [-alg.vdot([si * ti * c for c in row], lam) for si, ti, row in zip(s2, t, a)]
+            delta = self.newton_step(adjust, d1a, f)
+            z = [x + y for x, y in zip(z, delta)]
+            lam = [x + y for x, y in zip(lam, delta[n:])]
+            if all(abs(x) < tolerance for x in f):
+                return z, lam, i + 1
+        return None
+
+    def reconstruct(
+        self,
+        rgb: VectorLike,
+        method: int = 3,
+        max_iterations: int = 50,
+        tolerance: float = 1e-12,
+        guess: VectorLike | None = None,
+        multipliers: VectorLike | None = None
+    ) -> ReconstructResult:
+        """
+        Reconstruct the reflectance curve of a linear RGB color with method 2 or 3.
+
+        Newton's method starts from a flat curve unless an initial guess, such as the curve of a nearby color, is
+        given, optionally with its Lagrange multipliers. If a guess does not quickly converge, the color is solved
+        again from a flat curve. Returns the curve, the multipliers, and the total number of iterations performed.
+        """
+
+        if method not in (2, 3):
+            raise ValueError(f'{method} is not a recognized reconstruction method, use 2 or 3')
+
+        iterate = self.newton_3 if method == 3 else self.newton_2
+        n = self.size
+        iterations = 0
+        result = None
+        if guess is not None:
+            if method == 3:
+                z = [math.atanh(alg.clamp(2 * v - 1, -LIMIT, LIMIT)) for v in guess]
+            else:
+                z = [math.log(max(v, 1 - LIMIT)) for v in guess]
+            lam = [0.0, 0.0, 0.0] if multipliers is None else list(multipliers)
+            limit = min(max_iterations, GUESS_ITERATIONS)
+            result = iterate(rgb, z, lam, limit, tolerance)
+            if result is None:
+                iterations = limit
+        if result is None:
+            result = iterate(rgb, [0.0] * n, [0.0, 0.0, 0.0], max_iterations, tolerance)
+        if result is None:
+            raise ValueError(
+                f'Could not solve for {list(rgb)}, make sure it is within the '
+                + ('object color solid' if method == 3 else 'spectral locus')
+            )
+
+        z, lam, count = result
+        curve = [(math.tanh(v) + 1) / 2 for v in z] if method == 3 else [exp(v) for v in z]
+        return ReconstructResult(curve, lam, iterations + count)
+
+    def method_2(self, rgb: VectorLike, max_iterations: int = 50, tolerance: float = 1e-12) -> Vector:
+        """
+        Reconstruct the smoothest positive reflectance curve of a linear RGB color within the spectral locus.
+
+        The curve may exceed 1 for colors outside of the object color solid.
+        """
+
+        return self.reconstruct(rgb, 2, max_iterations, tolerance).curve  # type: ignore[no-any-return]
+
+    def method_3(self, rgb: VectorLike, max_iterations: int = 50, tolerance: float = 1e-12) -> Vector:
+        """Reconstruct the smoothest reflectance curve, from 0 to 1, of a linear RGB color in the object color solid."""
+
+        return self.reconstruct(rgb, 3, max_iterations, tolerance).curve  # type: ignore[no-any-return]
+
+    def sequence(
+        self,
+        rgbs: Iterable[VectorLike],
+        method: int = 3,
+        max_iterations: int = 50,
+        tolerance: float = 1e-12
+    ) -> list[ReconstructResult]:
+        """
+        Reconstruct the reflectance curves of a sequence of nearby linear RGB colors, such as the steps of a gradient.
+
+        Each color is solved starting from the curve and multipliers of the previous color.
+        """
+
+        results = []  # type: list[ReconstructResult]
+        for rgb in rgbs:
+            prev = results[-1] if results else None
+            results.append(
+                self.reconstruct(
+                    rgb,
+                    method,
+                    max_iterations,
+                    tolerance,
+                    None if prev is None else prev.curve,
+                    None if prev is None else prev.multipliers
+                )
+            )
+        return results
+
+    def solve(
+        self,
+        rgbs: Sequence[VectorLike],
+        method: int = 3,
+        max_iterations: int = 50,
+        tolerance: float = 1e-12,
+        backend: str = 'python'
+    ) -> Matrix:
+        """
+        Reconstruct the reflectance curves of a batch of linear RGB colors.
+
+        With the NumPy backend, the Newton iterations of every color are performed together as array operations.
+        """
+
+        if method not in (2, 3):
+            raise ValueError(f'{method} is not a recognized reconstruction method, use 2 or 3')
+        if backend == 'numpy':
+            from . import spectral_numpy
+            return spectral_numpy.reconstruct(  # type: ignore[no-any-return]
+                self, rgbs, method, max_iterations, tolerance
+            ).tolist()
+        elif backend != 'python':
+            raise ValueError(f"'{backend}' is not a recognized spectral backend")
+        return [self.reconstruct(rgb, method, max_iterations, tolerance).curve for rgb in rgbs]
+
+
+SOLVERS = {}  # type: dict[tuple[str, str, str, int, int, int], ReflectanceSolver]
+
+
+def get_solver(
+    illuminant: str = 'd65',
+    cmfs: str = 'cie-1931-2deg',
+    space: str = 'srgb',
+    step: int = 10,
+    start: int = 380,
+    end: int = 750
+) -> ReflectanceSolver:
+    """Get the solver for the given illuminant, CMFs, RGB space, and wavelengths, creating it only once."""
+
+    key = (illuminant, cmfs, space, step, start, end)
+    solver = SOLVERS.get(key)
+    if solver is None:
+        solver = SOLVERS[key] = ReflectanceSolver(*key)
+    return solver
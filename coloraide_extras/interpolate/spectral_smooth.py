@@ -0,0 +1,256 @@
+"""
+Spectral interpolation with reconstructed smoothest reflectance curves.
+
+Instead of estimating the reflectance of each color stop from the seven basis curves, the smoothest reflectance
+curve, bounded between 0 and 1, is reconstructed with method 3 of `spectral_reconstruct`. Reconstruction is far
+more expensive than estimation, so curves are memoized per color, resolution, and gamut and can be persisted to
+disk, so the cost is only paid once for each color while it stays cached.
+"""
+from __future__ import annotations
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from coloraide import algebra as alg
+from coloraide.types import Vector, VectorLike, AnyColor
+from coloraide.interpolate import Interpolator
+from typing import Any
+from . import spectral
+from . import spectral_io
+from .spectral import SpectralTables, DEFAULT_TABLES, PIGMENTS, Spectral, InterpolatorSpectralLinear
+from .spectral_reconstruct import get_solver
+
+# Illuminant and color matching functions that curves are reconstructed under, part of the persisted file name
+ILLUMINANT = 'd65'
+CMFS = 'cie-1931-2deg'
+# Linear RGB values this far outside of the unit cube are attributed to floating point error and clamped
+TOLERANCE = 1e-9
+# Reflectances near 1 at every wavelength do not converge, so colors whose channels all exceed this use the basis curves
+NEUTRAL_LIMIT = 0.999
+
+
+def smooth_reflectance(xyz: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> Vector:
+    """
+    Reconstruct the smoothest reflectance curve of an XYZ color.
+
+    Colors are solved in the basis gamut of the tables. Colors outside of the gamut, colors near white, and colors
+    that otherwise cannot be solved fall back to the estimation from the basis curves.
+    """
+
+    resolution = tables.resolution
+    solver = get_solver(ILLUMINANT, CMFS, tables.gamut, step=resolution, end=380 + (tables.size - 1) * resolution)
+    rgb = solver.rgb(xyz)
+    if min(rgb) < -TOLERANCE or max(rgb) > 1 + TOLERANCE or min(rgb) > NEUTRAL_LIMIT:
+        return spectral.single_constant_xyz_to_reflectance(xyz, tables)[0]
+    try:
+        r = solver.method_3([alg.clamp(c, 0.0, 1.0) for c in rgb])
+    except ValueError:
+        return spectral.single_constant_xyz_to_reflectance(xyz, tables)[0]
+    return [max(v, spectral.EPSILON) for v in r]
+
+
+class SmoothCache:
+    """
+    Reconstructed reflectance curves keyed by XYZ value, resolution, and gamut, with their K/S curves and residuals.
+
+    If a directory is set, the curves are loaded from, and saved to, a spectral data file in the directory for each
+    resolution, gamut, and solver configuration, so that they are kept across sessions. New curves are only written
+    when the cache is flushed, which happens at exit, and any curves saved by other processes in the meantime are
+    merged first. At most `maxsize` curves are kept, and persisted, for each resolution and gamut, evicting the least
+    recently used curves first.
+    """
+
+    def __init__(self, directory: str | None = None, maxsize: int = 1024) -> None:
+        """Initialize."""
+
+        self._lock = threading.Lock()
+        self._data = {}  # type: dict[SpectralTables, OrderedDict[tuple[float, ...], tuple[Vector, Vector, Vector]]]
+        self._pending = set()  # type: set[SpectralTables]
+        self._maxsize = 0
+        self.directory = directory
+        self.resize(maxsize)
+
+    def path(self, tables: SpectralTables) -> str | None:
+        """Get the path of the file that persists the curves reconstructed for the tables."""
+
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f'smooth-{ILLUMINANT}-{CMFS}-{tables.gamut}-{tables.resolution}nm.bin')
+
+    def read(self, tables: SpectralTables) -> dict[tuple[float, ...], Vector]:
+        """Read the persisted reflectance curves for the tables, treating a file that cannot be read as empty."""
+
+        path = self.path(tables)
+        curves = {}  # type: dict[tuple[float, ...], Vector]
+        if path is None or not os.path.exists(path):
+            return curves
+        try:
+            data = spectral_io.load(path, spectral_io.KIND_SMOOTH)
+        except (OSError, ValueError):
+            return curves
+        if data.resolution == tables.resolution and data.columns == tables.size + 3:
+            columns = data.columns
+            for i in range(data.rows):
+                row = data.data[i * columns:(i + 1) * columns]
+                curves[tuple(row[:3])] = list(row[3:])
+        return curves
+
+    def entries(self, tables: SpectralTables) -> OrderedDict[tuple[float, ...], tuple[Vector, Vector, Vector]]:
+        """Get the cached curves for the tables, loading the most recent persisted curves the first time."""
+
+        entries = self._data.get(tables)
+        if entries is None:
+            entries = self._data[tables] = OrderedDict()
+            for xyz, r in self.newest(self.read(tables), self._maxsize):
+                entries[xyz] = self.value(xyz, r, tables)
+        return entries
+
+    @staticmethod
+    def newest(curves: dict[tuple[float, ...], Vector], count: int) -> list[tuple[tuple[float, ...], Vector]]:
+        """Get up to `count` of the most recently used curves, which are saved last, oldest first."""
+
+        return list(curves.items())[-count:] if count > 0 else []
+
+    def value(self, xyz: VectorLike, r: Vector, tables: SpectralTables) -> tuple[Vector, Vector, Vector]:
+        """Get the reflectance curve, K/S curve, and residual to cache for a color."""
+
+        return r, spectral.reflectance_to_ks(r), [a - b for a, b in zip(xyz, spectral.reflectance_to_xyz(r, tables))]
+
+    def get(self, xyz: VectorLike, tables: SpectralTables = DEFAULT_TABLES) -> tuple[VectorLike, VectorLike]:
+        """Get the K/S curve and residual for the given XYZ value, reconstructing the reflectance on a cache miss."""
+
+        color = tuple(xyz)
+        if not self._maxsize:
+            _, ks, res = self.value(color, smooth_reflectance(color, tables), tables)
+            return ks, res
+
+        with self._lock:
+            entries = self.entries(tables)
+            value = entries.get(color)
+            if value is not None:
+                entries.move_to_end(color)
+        if value is None:
+            value = self.value(color, smooth_reflectance(color, tables), tables)
+            with self._lock:
+                entries = self.entries(tables)
+                entries[color] = value
+                while len(entries) > self._maxsize:
+                    entries.popitem(last=False)
+                self._pending.add(tables)
+        return value[1], value[2]
+
+    def save(self, tables: SpectralTables) -> bool:
+        """
+        Save the curves for the tables, merging in curves persisted by other processes, the lock must be held.
+
+        Persisted curves that are not in memory are treated as the least recently used and are only kept while there
+        is room. The file is replaced whole, so readers never see a partial file. If the file cannot be written,
+        `False` is returned and the curves are only kept in memory.
+        """
+
+        path = self.path(tables)
+        if path is None:
+            return True
+        entries = self._data[tables]
+        older = {xyz: r for xyz, r in self.read(tables).items() if xyz not in entries}
+        merged = OrderedDict()  # type: OrderedDict[tuple[float, ...], tuple[Vector, Vector, Vector]]
+        for xyz, r in self.newest(older, self._maxsize - len(entries)):
+            merged[xyz] = self.value(xyz, r, tables)
+        merged.update(entries)
+        self._data[tables] = entries = merged
+        data = []  # type: list[float]
+        for xyz, value in entries.items():
+            data.extend(xyz)
+            data.extend(value[0])
+        temp = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            spectral_io.save(temp, spectral_io.KIND_SMOOTH, tables.resolution, tables.size, tables.size + 3, data)
+            os.replace(temp, path)
+        except OSError:
+            if os.path.exists(temp):
+                os.remove(temp)
+            return False
+        return True
+
+    def _flush(self) -> None:
+        """Save the tables with new curves, the lock must be held."""
+
+        for tables in list(self._pending):
+            if self.save(tables):
+                self._pending.discard(tables)
+
+    def flush(self) -> None:
+        """Save any curves reconstructed since the last flush to the cache directory."""
+
+        with self._lock:
+            self._flush()
+
+    def clear(self) -> None:
+        """Clear the cached curves from memory, saving any new curves and leaving persisted curves on disk."""
+
+        with self._lock:
+            self._flush()
+            self._data.clear()
+            self._pending.clear()
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Set the maximum number of curves kept for each resolution and gamut, evicting the least recently used if needed.
+
+        Files are trimmed to the new size on the next flush.
+        """
+
+        if maxsize < 0:
+            raise ValueError(f'Cache size must be a positive integer or zero, not {maxsize}')
+
+        with self._lock:
+            self._maxsize = maxsize
+            for tables, entries in self._data.items():
+                if len(entries) > maxsize:
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+                    self._pending.add(tables)
+
+    def persist(self, directory: str | None) -> None:
+        """Set the directory to persist curves in, or stop persisting curves with `None`."""
+
+        with self._lock:
+            if directory != self.directory:
+                self._flush()
+                self.directory = directory
+                self._data.clear()
+                self._pending.clear()
+
+
+# Shared cache of reconstructed reflectance curves used by smooth spectral interpolation.
+SMOOTH_CACHE = SmoothCache()
+atexit.register(SMOOTH_CACHE.flush)
+
+
+class InterpolatorSpectralSmooth(InterpolatorSpectralLinear[AnyColor]):
+    """Interpolate multiple ranges of colors, mixing the reconstructed smoothest reflectance curves of each stop."""
+
+    def ks(self, index: int) -> tuple[VectorLike, VectorLike]:
+        """Get the K/S curve and residual of the color at the given index from its smoothest reflectance curve."""
+
+        value = self._ks.get(index)
+        if value is None:
+            xyz = self._resolved[index][:-1]
+            pigment = PIGMENTS.find(xyz, self.tables)
+            if pigment is not None:
+                value = self._ks[index] = (pigment.ks, pigment.residual)
+            else:
+                value = self._ks[index] = SMOOTH_CACHE.get(xyz, self.tables)
+        return value
+
+
+class SpectralSmooth(Spectral[AnyColor]):
+    """Spectral interpolation plugin using reconstructed smoothest reflectance curves."""
+
+    NAME = "spectral-smooth"
+
+    def interpolator(self, *args: Any, **kwargs: Any) -> Interpolator[AnyColor]:
+        """Return the smooth spectral interpolator."""
+
+        return InterpolatorSpectralSmooth(*args, **kwargs)
@@ -0,0 +1,313 @@
+"""
+Spectral data at alternate resolutions.
+
+The default 10 nm data lives in `spectral`. These tables were generated with `tools/calc_reflect.py`
+using the same D65 illuminant, CIE 1931 2 degree observer, sRGB matrix, and Burns solver.
+
+- 20 nm: 19 bins from 380 nm to 740 nm.
+- 5 nm: 75 bins from 380 nm to 750 nm.
+"""
+
+# 20 nm
+
+X_BAR_20 = [
+    0.0001290858694244184, 0.002235984614415402, 0.023706356518587372, 0.0689595717652805,
+    0.06468735443030069, 0.020933634549886674, 0.0010117336911561144, 0.012518524214576086,
+    0.05724708383837991, 0.11225025024369649, 0.1657235588381072, 0.1805153685876352,
+    0.14148656985724797, 0.07078444453210811, 0.024975232320190967, 0.006913165383461179,
+    0.0015358538517576872, 0.00033724193386181313, 9.783601876279681e-05
+]
+
+Y_BAR_20 = [
+    3.6800796107838566e-06, 6.18763037951432e-05, 0.0007056513325967368, 0.004554008701623555,
+    0.013346771890708532, 0.03042862688336727, 0.06669183311090307, 0.14047972486722016,
+    0.18806376715500836, 0.1878704776997107, 0.1573496629806322, 0.10723517000451688,
+    0.0630889922459017, 0.02765634693708175, 0.009238867019597629, 0.002512803325183666,
+    0.0005546248578160737, 0.00012178422949647223, 3.5330375229269486e-05
+]
+
+Z_BAR_20 = [
+    0.000608628645375269, 0.010601787452685616, 0.11389212508111332, 0.3459185409677586,
+    0.3713071939995114, 0.17793810435689908, 0.05616154367233942, 0.015482446571919337,
+    0.004001776177407411, 0.0007363767467626851, 0.0002984219554801219, 0.00013595584152712123,
+    3.1461702169872244e-05, 3.1607253642379152e-06, 0.0, 0.0,
+    0.0, 0.0, 0.0
+]
+
+REF_R_20 = [
+    0.02740137301492296, 0.02738105050348716, 0.02701249578194087, 0.02335255313466239,
+    0.015097193130154174, 0.009041037511262673, 0.006216727345702833, 0.005470650542508448,
+    0.0072648441397035746, 0.01749241707502408, 0.10778776491955327, 0.8357776299683244,
+    0.9583364333959026, 0.9747432533427821, 0.9783219312376108, 0.9791618352465384,
+    0.9793433947560173, 0.9793832028618512, 0.9793921412250809
+]
+
+REF_G_20 = [
+    0.01101673986453755, 0.011026635242925797, 0.011210306319941854, 0.013498884330238825,
+    0.029301944809127567, 0.18503259680524536, 0.8793234949732279, 0.971574239069099,
+    0.9796595801731314, 0.962770190668592, 0.8075793658707904, 0.16171112139198918,
+    0.05027190980120039, 0.032445950896017206, 0.0283510896007918, 0.027376768203101587,
+    0.027165492453556705, 0.02711913091219087, 0.02710871919839225
+]
+
+REF_B_20 = [
+    0.9738573194547258, 0.9738368409751859, 0.9734568911319028, 0.9687909497582505,
+    0.9395414865206375, 0.7475265497613623, 0.19403634643225232, 0.048303613551430535,
+    0.022100468967179487, 0.015249474399011642, 0.013444724522559737, 0.013431069852187949,
+    0.013837232054954463, 0.014106180674178237, 0.014207485634262051, 0.014235353407230256,
+    0.014241635063939329, 0.014243022199703026, 0.01424333414861051
+]
+
+REF_C_20 = [
+    0.9516523193449219, 0.9517168748534264, 0.9528779874690523, 0.9635907799874053,
+    0.9818292715848373, 0.9911879897369509, 0.9947123100954731, 0.9957157773584939,
+    0.994523302655252, 0.9867734065577181, 0.9107550432841338, 0.13396698702609,
+    0.031042451868426135, 0.018471463986735326, 0.01578005648130737, 0.015151240052380999,
+    0.01501545356455336, 0.014985688526155783, 0.0149790055410704
+]
+
+REF_M_20 = [
+    0.9862635708752635, 0.986251357651632, 0.9860246999041522, 0.9832053976864549,
+    0.9639739001216184, 0.7881554012853667, 0.13140325365553668, 0.03316190939353442,
+    0.02396089604230056, 0.04277184152042768, 0.20138921084745698, 0.8137328903647779,
+    0.9390217771290277, 0.9602346382543036, 0.96516656308513, 0.9663434964584067,
+    0.966598886954944, 0.9666549367148313, 0.9666675245605001
+]
+
+REF_Y_20 = [
+    0.020850689587057658, 0.020867777680164012, 0.02118485162239453, 0.02509612688979529,
+    0.050351657957689144, 0.23615765942748518, 0.8284245398310695, 0.9589613049641063,
+    0.9800695394245009, 0.984478845963569, 0.983759315997019, 0.980336558608973,
+    0.9763993828192603, 0.973997982528033, 0.9730928421600951, 0.9728433814319908,
+    0.9727872250068119, 0.972774808919504, 0.9727720159386862
+]
+
+REF_W_20 = [
+    0.9885179384026769, 0.9885220959570326, 0.9885984239230754, 0.9894417137867748,
+    0.9924858587761801, 0.9974701508924843, 1.0025369139016136, 1.0060092670643386,
+    1.0061451719417196, 1.0028157916209324, 0.9974548103372972, 0.992223655487449,
+    0.9887612291677715, 0.9871991529855542, 0.986681345032584, 0.9865443878212595,
+    0.9865139157483045, 0.9865071892839262, 0.9865056767113783
+]
+
+# 5 nm
+
+X_BAR_5 = [
+    3.234842590362122e-05, 5.534537957970424e-05, 0.00010971317938834467, 0.0002486781121282307,
+    0.0005603292052303547, 0.0009559397405450334, 0.0018834479815056048, 0.003396160571265103,
+    0.005940722409863466, 0.00915168366257435, 0.011644094622102863, 0.014886448295716425,
+    0.017281005330337513, 0.01826991494782615, 0.018613291223454054, 0.01770504596988176,
+    0.0162104039816308, 0.013821995498619403, 0.010617399205753594, 0.007758534324243158,
+    0.0052458888734292245, 0.003081074563290223, 0.0016480424079973993, 0.0007587179065396501,
+    0.00025353659923035545, 0.00012329997445286378, 0.00047437268510310134, 0.0014635912963386188,
+    0.003137094360394026, 0.005509401659231147, 0.008432944642083, 0.011327546689417222,
+    0.014345900585412337, 0.017738718783941416, 0.021339006853289287, 0.024718405493184336,
+    0.02812948403153629, 0.03151096533352596, 0.034737804283671424, 0.0382937036650593,
+    0.04152969095271735, 0.042708994412713176, 0.043066278510893695, 0.044672087013474054,
+    0.04523646198657735, 0.044428780475914635, 0.04250512079843595, 0.0393614652891223,
+    0.035455994074274216, 0.03039587870811289, 0.025316344773737093, 0.021408380035028676,
+    0.01773831147658323, 0.01397539501462632, 0.010734910345315688, 0.00829093337489307,
+    0.0062586978399557965, 0.004659245394203331, 0.003402546041265676, 0.002415904686951634,
+    0.0017324128439736904, 0.001152002364428003, 0.0007488610467061478, 0.0005296276827816221,
+    0.0003848791098816945, 0.0002800771761144572, 0.0002036993083580532, 0.0001321761651269382,
+    8.45115407113581e-05, 6.374608883240536e-05, 4.761582913653878e-05, 3.429602760206355e-05,
+    2.4517332669837166e-05, 1.5617764790532122e-05, 9.998824613452833e-06
+]
+
+Y_BAR_5 = [
+    9.222138963751661e-07, 1.5841253546963645e-06, 3.1028945384401038e-06, 7.054006579323668e-06,
+    1.5505965427758243e-05, 2.6382123068081997e-05, 5.2378121296754344e-05, 9.537073354834373e-05,
+    0.00017683352909252765, 0.00031106435133767646, 0.0004757713899837732, 0.0007631287345505771,
+    0.0011412171890368748, 0.0015642230231719225, 0.002103822327457627, 0.0026665899170201586,
+    0.0033446500649857223, 0.004067883183385001, 0.004944568897110269, 0.006147860414565655,
+    0.007625297691176608, 0.009001308603139753, 0.010709958816357985, 0.013347241539534255,
+    0.016712718683960168, 0.020925033164438098, 0.025656931248049464, 0.03058956104581264,
+    0.03520368256487685, 0.039872786460786, 0.04392264822643835, 0.045904814228347454,
+    0.04712806184050747, 0.0483438032357458, 0.04898200923008832, 0.04827341210007446,
+    0.047079624241175115, 0.04545493908518353, 0.04339376679970502, 0.04160718852818431,
+    0.03943122463043119, 0.03562574304015713, 0.03176573402781499, 0.029376959653319882,
+    0.02687272407600293, 0.024084002270226102, 0.021324631719143512, 0.01850626437080217,
+    0.015809860522306193, 0.012985197052574176, 0.010443386309215956, 0.008572833488837833,
+    0.0069305749238715445, 0.005353103079327488, 0.004051624010401336, 0.0030934621096994717,
+    0.0023152247922213678, 0.0017137719445015223, 0.0012457834476029934, 0.000881273407818835,
+    0.0006296989169885128, 0.00041738201167117916, 0.000270843576804294, 0.00019135474927772875,
+    0.00013898687127698796, 0.00010114098689213961, 7.355955132503122e-05, 4.773122800612741e-05,
+    3.0518662822369434e-05, 2.30198789453296e-05, 1.7194951253185076e-05, 1.2384923482725723e-05,
+    8.853657107064938e-06, 5.639860585004226e-06, 3.6107582960584247e-06
+]
+
+Z_BAR_5 = [
+    0.0001525200142008646, 0.00026113291641864216, 0.0005184422210389123, 0.0011770763974069585,
+    0.0026567674478107347, 0.004542671815785369, 0.008977869716485001, 0.016243648333256894,
+    0.028540931595533958, 0.04427554046080108, 0.05683007223806174, 0.0735467583744777,
+    0.08668586531646795, 0.09356993158074728, 0.09811064696607726, 0.09689165571405955,
+    0.0930481648079028, 0.0841154572737567, 0.06998048686167362, 0.05688681852518611,
+    0.044590609412831196, 0.032761998589809306, 0.023949902135339905, 0.01823503648846656,
+    0.014073868365440141, 0.01090691024014291, 0.008069436428312973, 0.005617977587664045,
+    0.0038798419840349115, 0.002877858577417881, 0.0021482353239288174, 0.0014972940994091688,
+    0.0010028298274237964, 0.0006608252201968722, 0.00043076786642994816, 0.00027757207130201607,
+    0.00018453320054329943, 0.0001277345565392557, 9.572154441111401e-05, 8.181444106481512e-05,
+    7.478340238096102e-05, 6.110013506825918e-05, 4.615892659259775e-05, 4.227508944210661e-05,
+    3.4070014676390404e-05, 2.5494709530938e-05, 1.4414263985106945e-05, 1.0066870917934092e-05,
+    7.884182412698629e-06, 4.0452327266586225e-06, 1.9704498529318292e-06, 1.185184353295553e-06,
+    7.920657055853196e-07, 3.8734465118143907e-07, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0
+]
+
+REF_R_5 = [
+    0.03169320690411498, 0.0316910560311478, 0.03168523030905257, 0.03167212956141041,
+    0.03164259637145428, 0.03157614496167915, 0.03144729655333123, 0.031197576509107483,
+    0.03073639617642715, 0.029926124001952603, 0.028634374110065475, 0.026839376114089375,
+    0.024568970765221354, 0.02196675786104979, 0.019246537837710465, 0.01660510169469631,
+    0.014189149353472819, 0.01207612303068778, 0.010287574360487828, 0.00881050716800541,
+    0.007611375919162222, 0.006649757220134389, 0.005883556480619279, 0.005277591534250947,
+    0.0048076583058775935, 0.0044567114912138495, 0.004214567133866309, 0.004076497844896609,
+    0.0040435235696091865, 0.004123350736427389, 0.004335396676794556, 0.004714816867219196,
+    0.005317584010617271, 0.006240820751159837, 0.007659753563397598, 0.009896885986109993,
+    0.01356728175075217, 0.019939703913219364, 0.031841777104913815, 0.056089638331172254,
+    0.11011723377992733, 0.23379061124656259, 0.46246424103839134, 0.7023937956644387,
+    0.8440297411012687, 0.9109413936226665, 0.9429975177928867, 0.9596408392851541,
+    0.9690147323616867, 0.9746537090708447, 0.9782405558886601, 0.980623578262448,
+    0.9822415311901458, 0.9833522281728972, 0.9841239707639998, 0.9846654277826148,
+    0.9850447846801795, 0.9853097452428914, 0.9854936254336156, 0.9856202862001633,
+    0.9857072494755268, 0.985766183426565, 0.985806648420907, 0.9858351845979152,
+    0.9858553270608725, 0.9858693938024365, 0.9858790530103699, 0.9858855136122855,
+    0.985889901503189, 0.9858929653049942, 0.9858950310662075, 0.9858963516917475,
+    0.9858971357897288, 0.9858975364120346, 0.9858976927813142
+]
+
+REF_G_5 = [
+    0.009325010524397936, 0.0093255138980054, 0.009326879023346502, 0.009329955242219246,
+    0.009336918089858703, 0.009352672613625324, 0.009383534770752655, 0.009444533675697309,
+    0.009561141887311941, 0.009779136083620688, 0.010165605925139765, 0.010796671895792975,
+    0.011806400941949624, 0.013397378790406755, 0.01589194841957997, 0.01988502239290718,
+    0.026499450564628768, 0.03807143316038919, 0.05966766398731832, 0.10230967617853975,
+    0.188850091232519, 0.34955933901414893, 0.5670274134252449, 0.7512159449002664,
+    0.8603115423660677, 0.9168458530303717, 0.946108598728066, 0.9619063282208444,
+    0.9707980869835464, 0.97589996482418, 0.9787021647258821, 0.9799218534120839,
+    0.9798801856056568, 0.9786034093719764, 0.9758273995646944, 0.9709081756145066,
+    0.9625748263725591, 0.9483032140477482, 0.9230159250394202, 0.8766119034977904,
+    0.7910373185846615, 0.6472903963620287, 0.4616562579450216, 0.29622327667028764,
+    0.18699346102448972, 0.12381086347064307, 0.08784964963933167, 0.06671648976638139,
+    0.05374412929774597, 0.045458271349634316, 0.039961417459014714, 0.03619879386952407,
+    0.03358850025468163, 0.031768410288900595, 0.03048950312501386, 0.029584988430566395,
+    0.028947610965557813, 0.028500616624773822, 0.028189522979823356, 0.027974814848359064,
+    0.027827203999175654, 0.02772707847941913, 0.027658286121294673, 0.027609751075682698,
+    0.027575480851896594, 0.027551541994367545, 0.02753510112048052, 0.027524103286850177,
+    0.027516633230585175, 0.027511417066808153, 0.027507899955937942, 0.02750565144125483,
+    0.027504316406492202, 0.02750363428642605, 0.027503368043109544
+]
+
+REF_B_5 = [
+    0.9794861565634478, 0.9794851570565133, 0.9794824463416376, 0.9794763374452947,
+    0.9794625092495621, 0.9794312209691558, 0.9793699401447115, 0.9792488765485182,
+    0.9790177056133222, 0.9785865329813435, 0.9778253516680393, 0.9765911623579082,
+    0.9746383481293459, 0.9716129619870811, 0.9669845313069395, 0.9598328386319016,
+    0.9485684212115382, 0.9302415385643765, 0.8994528098425163, 0.8470644288890324,
+    0.7597590970366488, 0.6279096915727129, 0.46607972756738764, 0.31460707535863,
+    0.20300756069294562, 0.1316570305276381, 0.08840301755478719, 0.0621889730085875,
+    0.04591395894173189, 0.03546550904978096, 0.028544619647134784, 0.023835020726354905,
+    0.020546601331378367, 0.018208485249054496, 0.016535156393774397, 0.015343262606933528,
+    0.014506987526220094, 0.013940932072876, 0.013584965162184492, 0.013394641986123113,
+    0.01333739243859211, 0.01338592522255283, 0.013513142792741129, 0.013695335433714706,
+    0.013913260570887875, 0.0141493889103389, 0.014387817550205961, 0.014615786417341403,
+    0.014824022727261632, 0.015006858244967669, 0.015162507269785519, 0.01529174351785012,
+    0.015395871709468045, 0.015477281470001436, 0.015539585612588946, 0.015586517211134465,
+    0.015621155636666162, 0.01564627709544103, 0.01566419336749214, 0.01567677920815619,
+    0.015685542543978415, 0.015691540436531093, 0.015695685566385065, 0.015698621250238187,
+    0.01570069935318763, 0.015702153386719486, 0.015703153152011318, 0.015703822462398986,
+    0.015704277320644833, 0.015704595049994607, 0.015704809337797943, 0.015704946355372895,
+    0.01570502771624427, 0.01570506928887655, 0.015705085515802353
+]
+
+REF_C_5 = [
+    0.9688550175479071, 0.9688571076662125, 0.9688627688760933, 0.9688754998341667,
+    0.9689042001104451, 0.9689687795628159, 0.9690940058319337, 0.9693367337125214,
+    0.9697850901652805, 0.9705731083425502, 0.9718301168132463, 0.9735783285847217,
+    0.9757921448966139, 0.9783331938020632, 0.980993886754941, 0.9835821324686667,
+    0.9859536929307826, 0.9880314915573221, 0.9897930324777547, 0.991249853150239,
+    0.9924339951764372, 0.993384567966557, 0.9941425888252104, 0.9947424498362498,
+    0.9952078117882006, 0.9955553260597559, 0.9957948901585996, 0.9959310153144794,
+    0.9959625170367508, 0.9958815622976982, 0.9956686413821876, 0.9952885264760418,
+    0.9946851783692982, 0.9937614136951693, 0.9923419408813292, 0.9901041616424188,
+    0.986432838483575, 0.9800588520756943, 0.9681537661661829, 0.9438994829706205,
+    0.8898575911101743, 0.7661573003423616, 0.5374661963113796, 0.2975616781505065,
+    0.15595187687081186, 0.08905178414182141, 0.057000037468691145, 0.04035843280315793,
+    0.030985264146935088, 0.025346615217067603, 0.02175992675252636, 0.019376985290803006,
+    0.017759075162356863, 0.016648401453988493, 0.01587667195024972, 0.015335222552427086,
+    0.014955870207196686, 0.014690912433309278, 0.014507033990858176, 0.014380374341233404,
+    0.014293411793030453, 0.014234478316422106, 0.014194013638511471, 0.014165477679842164,
+    0.014145335368442868, 0.01413126873137438, 0.014121609594550888, 0.0141151490398998,
+    0.014110761180962439, 0.014107697401414654, 0.014105631655179474, 0.014104311039202788,
+    0.01410352694689515, 0.014103126327486892, 0.014102969959338074
+]
+
+REF_M_5 = [
+    0.9907279198363677, 0.9907274194610702, 0.9907260624664569, 0.9907230045679167,
+    0.9907160831809851, 0.9907004224610059, 0.9906697440474757, 0.9906091082873325,
+    0.9904931943458074, 0.990276498446701, 0.9898923315603528, 0.9892650300229082,
+    0.9882613334215877, 0.9866798797654478, 0.9842002754842987, 0.9802311829420489,
+    0.9736563884363691, 0.9621529668233954, 0.9406804696715556, 0.898261660545272,
+    0.8120747935213556, 0.6516604403950227, 0.43395171567031043, 0.24921833472222776,
+    0.13979769928687802, 0.08314320350709536, 0.05384530363099049, 0.03804033110754684,
+    0.029149172564097103, 0.02404919856779708, 0.02124808209170015, 0.020027884466289003,
+    0.02006703861181397, 0.021338781355946967, 0.02410634190243094, 0.029012175363068493,
+    0.03732473214000742, 0.05156436321286095, 0.07680396425873415, 0.12314522981858095,
+    0.20867140621299451, 0.35247761290275686, 0.5383236369836716, 0.7039408403175785,
+    0.8132231547454221, 0.8763898983006048, 0.9123210589817288, 0.9334277517117061,
+    0.9463801159892821, 0.9546515352766108, 0.9601380371429001, 0.9638932001596587,
+    0.9664981308493086, 0.9683143870991547, 0.9695905529389263, 0.9704931048189487,
+    0.9711290870556166, 0.9715750968950707, 0.9718855024253792, 0.9720997342387483,
+    0.9722470169642742, 0.9723469196073178, 0.972415558687312, 0.972463985517618,
+    0.9724981792943357, 0.97252206473246, 0.9725384689097228, 0.972549442191667,
+    0.9725568955698255, 0.9725621000868083, 0.9725656093441766, 0.9725678528378909,
+    0.9725691848914386, 0.9725698654882713, 0.97257013113704
+]
+
+REF_Y_5 = [
+    0.020615367729914902, 0.020616371938000033, 0.020619095402536092, 0.02062523303229169,
+    0.02063912626839487, 0.020670561707892443, 0.02073213070705121, 0.020853763371031064,
+    0.021086020006925388, 0.021519214139356868, 0.02228395263793881, 0.023523878643511575,
+    0.025485691223438578, 0.028524830310336147, 0.03317387088472867, 0.040356410205987514,
+    0.05166704216367446, 0.07006318802435785, 0.10095281811009604, 0.15347256803452092,
+    0.24089856168500318, 0.3727430062182996, 0.5343590630709679, 0.6855439008207197,
+    0.7969583572085566, 0.8682394759796884, 0.9114840791331875, 0.937709679968323,
+    0.9540004941182405, 0.9644634752709617, 0.9713963845348317, 0.9761156185900084,
+    0.9794117659260945, 0.9817561764786568, 0.9834347537415502, 0.9846311552589063,
+    0.9854714356026466, 0.9860411763664434, 0.9864006478164622, 0.9865943980105716,
+    0.9866550691860244, 0.9866099936157711, 0.9864862767622794, 0.9863076067464025,
+    0.9860931746978209, 0.9858604391467372, 0.9856252215995782, 0.985400205057174,
+    0.9851946023058589, 0.9850140452319047, 0.9848603181075224, 0.9847326683224626,
+    0.984629813272881, 0.9845493960994229, 0.9844878502437062, 0.9844414891278284,
+    0.9844072713682479, 0.9843824547807396, 0.9843647557626773, 0.9843523224076818,
+    0.9843436651541455, 0.9843377398185078, 0.9843336448198744, 0.9843307446388622,
+    0.9843286916695497, 0.984327255224214, 0.9843262675533623, 0.9843256063403357,
+    0.9843251569852338, 0.9843248431000724, 0.9843246314049756, 0.9843244960452222,
+    0.984324415668771, 0.9843243745991461, 0.9843243585685582
+]
+
+REF_W_5 = [
+    1.0002928132590962, 1.0002928095510233, 1.0002927994962274, 1.0002927768455774,
+    1.0002927256153007, 1.0002926098950484, 1.0002923839897369, 1.00029194058108,
+    1.0002911041682967, 1.0002895788815398, 1.0002869897713083, 1.0002830439243766,
+    1.0002773584608429, 1.0002696477055841, 1.0002597861604088, 1.0002477190985193,
+    1.0002335364257804, 1.0002174006321485, 1.0001995944126376, 1.0001805253382006,
+    1.0001605886984943, 1.0001401682944149, 1.0001196200230968, 1.0000992405455693,
+    1.000079308129296, 1.000060102115708, 1.0000419188766208, 1.000025058989769,
+    1.0000098014600356, 0.9999963669076289, 0.9999849379992369, 0.9999756343536681,
+    0.9999684571735473, 0.9999633565297256, 0.9999602638538824, 0.9999590669907057,
+    0.9999595848093006, 0.9999616061217422, 0.9999648957543116, 0.9999691996911987,
+    0.9999742654384134, 0.999979831621096, 0.9999856306338379, 0.9999914265310145,
+    0.9999970146338152, 1.0000022277656186, 1.0000069404975789, 1.0000110763268342,
+    1.0000146068741826, 1.0000175429397844, 1.0000199368501677, 1.000021857928389,
+    1.000023364364915, 1.0000245173573967, 1.000025385743216, 1.0000260320674002,
+    1.0000265048382548, 1.0000268454516708, 1.0000270871210122, 1.0000272562044072,
+    1.0000273735624834, 1.0000274537001161, 1.0000275090100141, 1.000027548153319,
+    1.0000275758515613, 1.0000275952286874, 1.000027608550523, 1.000027617468364,
+    1.0000276235285457, 1.0000276277615812, 1.0000276306164213, 1.0000276324418036,
+    1.000027633525703, 1.0000276340795355, 1.000027634295711
+]
@@ -0,0 +1,236 @@
+"""
+Solve for the amounts of a palette of colors that mix to a target color.
+
+Inverts the Kubelka-Munk mixing of `spectral.spectral_mix_many` with a damped, projected Gauss-Newton
+method. The solver works with amounts, the squares of the mixing weights, which are constrained to be
+non-negative and to sum to one. Unlike the K/S concentrations, amounts are well scaled as they do not
+include the luminance biasing that counteracts the large K/S values of dark colors.
+"""
+from __future__ import annotations
+import math
+from collections import namedtuple
+from coloraide import algebra as alg
+from coloraide.types import Vector, VectorLike, Matrix, ColorInput
+from typing import Iterable, Sequence, TYPE_CHECKING
+from .spectral import SPACE, get_tables, mixing_concentrations, mixing_luminance, xyz_to_ks
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coloraide.color import Color
+
+UnmixResult = namedtuple('UnmixResult', ['weights', 'xyz', 'error', 'iterations'])
+
+
+def project_simplex(v: VectorLike) -> Vector:
+    """Project a vector onto the simplex of non-negative values that sum to one."""
+
+    total = 0.0
+    theta = 0.0
+    for i, u in enumerate(sorted(v, reverse=True), 1):
+        total += u
+        t = (total - 1) / i
+        if u > t:
+            theta = t
+    return [max(vi - theta, 0.0) for vi in v]
+
+
+class Palette:
+    """
+    A palette of colors to unmix a target color into.
+
+    The K/S curves, residuals, and luminance of the palette are calculated once
+    and shared by every color that is unmixed.
+    """
+
+    def __init__(self, xyzs: Sequence[VectorLike], resolution: int = 10) -> None:
+        """Initialize."""
+
+        if not xyzs:
+            raise ValueError('At least one color is required in a palette')
+
+        self.tables = tables = get_tables(resolution)
+        self.xyz = [list(xyz) for xyz in xyzs]
+        self.ks = []  # type: list[VectorLike]
+        self.residual = []  # type: list[VectorLike]
+        for xyz in self.xyz:
+            ks, res = xyz_to_ks(xyz, tables)
+            self.ks.append(ks)
+            self.residual.append(res)
+        self.luminance = [mixing_luminance(xyz[1]) for xyz in self.xyz]
+        self.cmfs = [tables.x_bar, tables.y_bar, tables.z_bar]
+
+    @classmethod
+    def from_colors(cls, color_cls: type[Color], colors: Iterable[ColorInput], resolution: int = 10) -> Palette:
+        """Create a palette from colors."""
+
+        return cls([color_cls(c).convert(SPACE).coords(nans=False) for c in colors], resolution)
+
+    def weights(self, amounts: VectorLike) -> Vector:
+        """Convert amounts to mixing weights that sum to one."""
+
+        weights = [math.sqrt(a) for a in amounts]
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def mix(self, amounts: VectorLike) -> tuple[Vector, Matrix]:
+        """
+        Mix the palette with the given amounts, which must sum to one.
+
+        Amounts are the square of the mixing weights. Returns the XYZ value and the Jacobian
+        of the XYZ value with respect to the amounts.
+        """
+
+        # Calculate the concentrations biased towards the more luminous colors
+        weights = self.weights(amounts)
+        concentrations = mixing_concentrations(weights, self.luminance)
+
+        # Apply the Kubelka-Munk mixing and convert back to reflectance
+        size = self.tables.size
+        ks = [0.0] * size
+        for c, ks1 in zip(concentrations, self.ks):
+            if c:
+                for j in range(size):
+                    ks[j] += c * ks1[j]
+        r = []
+        dr = []
+        for k in ks:
+            s = math.sqrt(k ** 2 + 2 * k)
+            r.append(1 + k - s)
+            dr.append(1 - (k + 1) / s if s else 0.0)
+
+        # Convert to XYZ, adding back in the residuals which are mixed linearly with the weights
+        xyz = [alg.vdot(r, cmf) for cmf in self.cmfs]
+        for w, res in zip(weights, self.residual):
+            for i in range(3):
+                xyz[i] += w * res[i]
+
+        # The Jacobian of the mix, ignoring the small contribution of the residuals.
+        # Scaling by luminance keeps the large K/S values of dark colors from dominating.
+        total = sum(a * l for a, l in zip(amounts, self.luminance))
+        weighted = [[d * c for d, c in zip(dr, cmf)] for cmf in self.cmfs]
+        jac = [[0.0] * len(amounts) for _ in range(3)]
+        for i, (l, ks1) in enumerate(zip(self.luminance, self.ks)):
+            f = l / total
+            diff = [f * (x - y) for x, y in zip(ks1, ks)]
+            for k in range(3):
+                jac[k][i] = alg.vdot(weighted[k], diff)
+        return xyz, jac
+
+    def estimate(self, xyz: VectorLike) -> Vector:
+        """
+        Estimate the amounts of the palette colors that mix to the given XYZ color.
+
+        The K/S curve of the mix is linear with respect to the luminance scaled amounts, so the amounts
+        that best match the K/S curve estimated for the color can be found with non-negative least squares.
+        """
+
+        ks, _ = xyz_to_ks(xyz, self.tables)
+        a = [[l * (k1 - k) for k1, k in zip(ks1, ks)] + [1.0] for l, ks1 in zip(self.luminance, self.ks)]
+        amounts = alg.fnnls(alg.transpose(a), [0.0] * self.tables.size + [1.0])[0]
+        total = sum(amounts)
+        n = len(amounts)
+        return project_simplex(amounts) if total else [1 / n] * n
+
+    def refine(
+        self,
+        xyz: VectorLike,
+        a: Vector,
+        max_iterations: int,
+        tolerance: float
+    ) -> tuple[Vector, Vector, float, int]:
+        """
+        Refine the amounts of the palette colors, starting from an initial guess, to best match the given XYZ color.
+
+        The tolerance is applied to the squared error. Returns the amounts, the mixed XYZ color, the squared
+        error, and the number of iterations performed.
+        """
+
+        n = len(a)
+        mixed, jac = self.mix(a)
+        f = [x - y for x, y in zip(mixed, xyz)]
+        err = alg.vdot(f, f)
+        damping = 0.0
+
+        iterations = 0
+        while iterations < max_iterations and err > tolerance:
+            iterations += 1
+            jt = alg.transpose(jac)
+            g = [alg.vdot(col, f) for col in jt]
+            h = [[alg.vdot(x, y) for y in jt] for x in jt]
+            if not damping:
+                damping = 1e-3 * max(h[i][i] for i in range(n)) or 1e-12
+
+            # Solve the damped Gauss-Newton step, constrained to keep the amounts summing to one, then
+            # project back onto the feasible set. Amounts at zero are held at zero if the step would
+            # push them negative. Increase damping until the step is an improvement.
+            accepted = False
+            while damping < 1e12:
+                free = list(range(n))
+                while True:
+                    m = len(free)
+                    kkt = [[h[i][j] for j in free] + [1.0] for i in free] + [[1.0] * m + [0.0]]
+                    for i in range(m):
+                        kkt[i][i] += damping
+                    step = alg.solve(kkt, [-g[i] for i in free] + [0.0])
+                    held = [i for i, si in zip(free, step) if not a[i] and si < 0.0]
+                    if not held:
+                        break
+                    free = [i for i in free if i not in held]
+                a2 = a[:]
+                for i, si in zip(free, step):
+                    a2[i] += si
+                a2 = project_simplex(a2)
+                mixed2, jac2 = self.mix(a2)
+                f2 = [x - y for x, y in zip(mixed2, xyz)]
+                err2 = alg.vdot(f2, f2)
+                if err2 < err:
+                    accepted = True
+                    damping /= 4
+                    break
+                damping *= 4
+
+            if not accepted:
+                break
+
+            moved = max(abs(x - y) for x, y in zip(a, a2))
+            a, mixed, jac, f, err = a2, mixed2, jac2, f2, err2
+            if moved < 1e-12:
+                break
+
+        return a, mixed, err, iterations
+
+    def unmix(
+        self,
+        xyz: VectorLike,
+        max_iterations: int = 50,
+        tolerance: float = 1e-9
+    ) -> UnmixResult:
+        """
+        Find the weights of the palette colors that best mix to the given XYZ color.
+
+        Mixing is not linear, so a solution can settle in a local minimum. If the initial estimate does
+        not reach the tolerance, the solver restarts from an equal mix and from mixes biased towards each
+        palette color, keeping the best result.
+
+        Weights are non-negative and sum to one. Returns the weights, the mixed XYZ color, the Euclidean
+        distance between the mixed and target XYZ colors, and the total number of iterations performed.
+        """
+
+        n = len(self.ks)
+        starts = [self.estimate(xyz), [1 / n] * n]
+        for i in range(n):
+            start = [0.5 / n] * n
+            start[i] += 0.5
+            starts.append(start)
+
+        target = tolerance ** 2
+        best = self.refine(xyz, starts[0], max_iterations, target)
+        total = best[3]
+        for start in starts[1:]:
+            if best[2] <= target:
+                break
+            result = self.refine(xyz, start, max_iterations, target)
+            total += result[3]
+            if result[2] < best[2]:
+                best = result
+
+        return UnmixResult(self.weights(best[0]), best[1], math.sqrt(best[2]), total)
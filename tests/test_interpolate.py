@@ -1,9 +1,29 @@
 """Test interpolation plugins."""
+import os
+import tempfile
+import threading
 import unittest
+from array import array
+from unittest import mock
 from coloraide_extras.everything import ColorAll as Color
+from coloraide_extras.interpolate import spectral
+from coloraide_extras.interpolate import spectral_unmix
+from coloraide_extras.interpolate import spectral_lut
+from coloraide_extras.interpolate import spectral_io
+from coloraide_extras.interpolate import spectral_reconstruct
+from coloraide_extras.interpolate import spectral_smooth
+from coloraide_extras.interpolate import spectral_basis
 from coloraide import NaN
+from coloraide import algebra as alg
+from coloraide.interpolate import Interpolator
 from . import util
 
+try:
+    import numpy as np
+    from coloraide_extras.interpolate import spectral_numpy
+except ImportError:  # pragma: no cover
+    np = None
+
 
 class TestSpectral(util.ColorAsserts, unittest.TestCase):
     """Test spectral color mixing."""
@@ -27,6 +47,57 @@ class TestSpectral(util.ColorAsserts, unittest.TestCase):
         for a, b in zip(Color.steps([c1, c2], method='spectral', steps=9), expected):
             self.assertColorEqual(a, b)
 
+    def test_stop_cache(self):
+        """Test that the reflectance of each stop is only calculated once."""
+
+        c1 = Color('#002185')
+        c2 = Color('#FCD200')
+        with mock.patch.object(spectral, 'xyz_to_ks', wraps=spectral.xyz_to_ks) as m:
+            colors = Color.steps([c1, c2], method='spectral', steps=256)
+        self.assertEqual(m.call_count, 2)
+        self.assertColorEqual(
+            colors[128],
+            Color('xyz-d65', spectral.spectral_mix(c1.convert('xyz-d65')[:-1], c2.convert('xyz-d65')[:-1], 128 / 255))
+        )
+
+    def test_unclamped_residual(self):
+        """Test that the residual of unclamped reflectances matches projecting the full reflectance."""
+
+        xyz = Color('#6a8f3c').convert('xyz-d65')[:-1]
+        with mock.patch.object(spectral, 'reflectance_to_xyz', wraps=spectral.reflectance_to_xyz) as m:
+            r, res = spectral.single_constant_xyz_to_reflectance(xyz)
+        self.assertEqual(m.call_count, 0)
+        for a, b, c in zip(res, xyz, spectral.reflectance_to_xyz(r)):
+            self.assertAlmostEqual(a, b - c, places=15)
+
+    def test_clamped_residual(self):
+        """Test that the residual of clamped reflectances projects the full reflectance."""
+
+        xyz = Color('white').convert('xyz-d65')[:-1]
+        with mock.patch.object(spectral, 'reflectance_to_xyz', wraps=spectral.reflectance_to_xyz) as m:
+            r, res = spectral.single_constant_xyz_to_reflectance(xyz)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(res, [a - b for a, b in zip(xyz, spectral.reflectance_to_xyz(r))])
+
+    def test_mix_batch(self):
+        """Test that batch mixing matches mixing individual points."""
+
+        xyz1 = Color('#002185').convert('xyz-d65')[:-1]
+        xyz2 = Color('#FCD200').convert('xyz-d65')[:-1]
+        ts = [0.0, 0.1, 0.5, 0.75, 1.0]
+        for a, t in zip(spectral.spectral_mix_batch(xyz1, xyz2, ts), ts):
+            self.assertEqual(a, spectral.spectral_mix(xyz1, xyz2, t))
+
+    def test_steps_batch(self):
+        """Test that batched steps match steps generated one point at a time."""
+
+        for method in ('spectral', 'spectral-continuous'):
+            i = Color.interpolate(['red', 'yellow', Color('blue').set('alpha', 0.5)], method=method, padding=0.1)
+            self.assertEqual(
+                [c.to_string() for c in i.steps(steps=7, max_delta_e=5)],
+                [c.to_string() for c in Interpolator.steps(i, steps=7, max_delta_e=5)]
+            )
+
     def test_mix_nan(self):
         """Test mixing with NaN."""
 
@@ -69,6 +140,353 @@ class TestSpectral(util.ColorAsserts, unittest.TestCase):
         with self.assertRaises(ValueError):
             Color('red').mix('blue', method='spectral', space='lab')
 
+    def test_bad_backend(self):
+        """Test bad backend."""
+
+        with self.assertRaises(ValueError):
+            Color('red').mix('blue', method='spectral', backend='bad')
+
+    def test_resolution(self):
+        """Test alternate spectral resolutions."""
+
+        self.assertEqual(spectral.get_tables(5).size, 75)
+        self.assertEqual(spectral.get_tables(10).size, 38)
+        self.assertEqual(spectral.get_tables(20).size, 19)
+        self.assertIs(spectral.get_tables(5), spectral.get_tables(5))
+
+        ref = Color.interpolate(['#002185', '#FCD200'], method='spectral')
+        for res in (5, 20):
+            i = Color.interpolate(['#002185', '#FCD200'], method='spectral', resolution=res)
+            self.assertColorEqual(i(0), ref(0))
+            self.assertColorEqual(i(1), ref(1))
+            for t in (0.25, 0.5, 0.75):
+                self.assertLess(i(t).delta_e(ref(t), method='2000'), 2 if res == 20 else 0.5)
+
+    def test_undefined_resolved_once(self):
+        """Test that undefined values are resolved at setup and the stop coordinates are left untouched."""
+
+        for method in ('spectral', 'spectral-continuous'):
+            colors = [
+                'color(xyz-d65 none 0.5 0.2 / none)',
+                'color(xyz-d65 0.3 none 0.4)',
+                'color(xyz-d65 0.1 0.2 none)'
+            ]
+            i = Color.interpolate(colors, method=method)
+            coords = repr(i.coordinates)
+            forward = [i(t) for t in (0.1, 0.5, 0.9)]
+            backward = [i(t) for t in (0.9, 0.5, 0.1)][::-1]
+            self.assertEqual(repr(i.coordinates), coords)
+            for a, b in zip(forward, backward):
+                self.assertColorEqual(a, b)
+
+    def test_coords(self):
+        """Test raw coordinate output."""
+
+        colors = ['#002185', '#FCD200', Color('red').set('alpha', 0.5)]
+        points = [i / 10 for i in range(11)]
+        for method in ('spectral', 'spectral-continuous'):
+            i = Color.interpolate(colors, method=method)
+            expected = i.batch(points)
+            for space in (None, 'srgb-linear', 'srgb', 'display-p3', 'prophoto-rgb'):
+                for coords, color in zip(i.coords(points, space), expected):
+                    self.assertIsInstance(coords, tuple)
+                    self.assertColorEqual(
+                        Color(space or 'xyz-d65', coords[:-1], coords[-1]),
+                        color.convert(space or 'xyz-d65')
+                    )
+
+            flat = i.coords_array(points, 'srgb')
+            self.assertEqual(flat.typecode, 'd')
+            self.assertEqual(list(flat), [c for coords in i.coords(points, 'srgb') for c in coords])
+
+    def test_coords_bad_space(self):
+        """Test raw coordinate output with unsupported spaces."""
+
+        i = Color.interpolate(['red', 'blue'], method='spectral')
+        with self.assertRaises(ValueError):
+            i.coords([0.5], 'lab')
+        with self.assertRaises(ValueError):
+            i.coords([0.5], 'bad')
+
+    def test_render(self):
+        """Test rendering to 8-bit sRGB buffers."""
+
+        colors = ['red', 'blue', Color('color(display-p3 0 1 0)').set('alpha', 0.3)]
+        for method in ('spectral', 'spectral-continuous'):
+            i = Color.interpolate(colors, method=method)
+            expected = bytearray()
+            for c in Color.steps(colors, steps=50, method=method):
+                expected.extend(bytes.fromhex(c.convert('srgb').to_string(hex=True, fit='clip', alpha=True)[1:]))
+
+            self.assertEqual(i.render(50, alpha=True), expected)
+            self.assertEqual(i.render(50), bytearray(b for j, b in enumerate(expected) if j % 4 != 3))
+
+            buffer = bytearray(50 * 2 * 4 + 2)
+            self.assertIs(i.render(50, 2, True, memoryview(buffer)[1:]).obj, buffer)
+            self.assertEqual(buffer, b'\x00' + expected * 2 + b'\x00')
+
+    def test_render_bad_buffer(self):
+        """Test rendering to a buffer that is too small."""
+
+        with self.assertRaises(ValueError):
+            Color.interpolate(['red', 'blue'], method='spectral').render(10, buffer=bytearray(29))
+
+    def test_compile(self):
+        """Test that compiled interpolators stay within the requested delta E."""
+
+        colors = ['#002185', '#FCD200', 'white', Color('red').set('alpha', 0.5)]
+        points = [i / 200 for i in range(201)]
+        for method in ('spectral', 'spectral-continuous'):
+            exact = Color.interpolate(colors, method=method)
+            compiled = Color.interpolate(colors, method=method)
+            result = compiled.compile(0.2, delta_e='2000')
+            self.assertLessEqual(result.error, 0.2)
+            self.assertEqual(len(result.degrees), 3)
+            self.assertTrue(all(degree is not None for degree in result.degrees))
+            for c1, c2 in zip(exact.batch(points), compiled.batch(points)):
+                self.assertLess(c1.delta_e(c2, method='2000'), 0.2)
+                self.assertAlmostEqual(c1.alpha(), c2.alpha())
+
+    def test_compile_fallback(self):
+        """Test that segments that cannot meet the tolerance are mixed exactly."""
+
+        exact = Color.interpolate(['red', 'blue'], method='spectral')
+        compiled = Color.interpolate(['red', 'blue'], method='spectral')
+        result = compiled.compile(1e-6, max_degree=8)
+        self.assertEqual(result, (0.0, [None]))
+        points = [i / 10 for i in range(11)]
+        self.assertEqual(compiled.coords(points), exact.coords(points))
+
+    def test_compile_extrapolate(self):
+        """Test that extrapolated points are mixed exactly."""
+
+        exact = Color.interpolate(['#002185', '#FCD200'], method='spectral', extrapolate=True)
+        compiled = Color.interpolate(['#002185', '#FCD200'], method='spectral', extrapolate=True)
+        compiled.compile()
+        self.assertEqual(compiled.coords([-0.1, 1.1]), exact.coords([-0.1, 1.1]))
+        self.assertNotEqual(compiled.coords([0.5]), exact.coords([0.5]))
+
+    def test_uniform(self):
+        """Test that uniform interpolation evenly spaces colors within a segment."""
+
+        for colors in (['#002185', '#FCD200'], ['black', 'white'], ['#010101', 'yellow']):
+            results = Color.steps(colors, steps=10, method='spectral', uniform=True, uniform_delta_e='2000')
+            self.assertColorEqual(results[0], Color(colors[0]).convert('xyz-d65'))
+            self.assertColorEqual(results[-1], Color(colors[1]).convert('xyz-d65'))
+            distances = [results[i].delta_e(results[i - 1], method='2000') for i in range(1, len(results))]
+            self.assertLess(max(distances) / min(distances), 1.15)
+
+    def test_uniform_alpha(self):
+        """Test that uniform interpolation evenly spaces translucent colors and their alpha together."""
+
+        for colors in (
+            ['rgb(255 0 0 / 0.1)', 'blue'],
+            ['rgb(0 33 133 / 0.2)', 'rgb(252 210 0)'],
+            ['red', 'rgb(0 0 255 / 0.1)']
+        ):
+            i = Color.interpolate(colors, method='spectral', uniform=True, uniform_delta_e='2000')
+            results = i.steps(steps=10)
+            distances = [results[k].delta_e(results[k - 1], method='2000') for k in range(1, len(results))]
+            self.assertLess(max(distances) / min(distances), 1.15)
+            lengths = i.arc_length(1)
+            a1, a2 = Color(colors[0])['alpha'], Color(colors[1])['alpha']
+            for k, color in enumerate(results):
+                t = spectral.invert_arc_length(lengths, k / (len(results) - 1))
+                self.assertAlmostEqual(color['alpha'], a1 + (a2 - a1) * t)
+
+    def test_arc_length(self):
+        """Test the arc length table of a segment."""
+
+        i = Color.interpolate(['red', 'blue', 'blue'], method='spectral', uniform=True)
+        lengths = i.arc_length(1)
+        self.assertIs(i.arc_length(1), lengths)
+        self.assertEqual(len(lengths), spectral.ARC_SAMPLES + 1)
+        self.assertEqual(lengths[0], 0)
+        self.assertTrue(all(b > a for a, b in zip(lengths, lengths[1:])))
+        self.assertLess(i.arc_length(2)[-1], 1e-6)
+
+    def test_invert_arc_length(self):
+        """Test inverting arc length tables."""
+
+        lengths = [0.0, 1.0, 1.0, 3.0, 4.0]
+        self.assertEqual(spectral.invert_arc_length(lengths, 0), 0)
+        self.assertEqual(spectral.invert_arc_length(lengths, 0.125), 0.125)
+        self.assertEqual(spectral.invert_arc_length(lengths, 0.25), 0.5)
+        self.assertEqual(spectral.invert_arc_length(lengths, 0.5), 0.625)
+        self.assertEqual(spectral.invert_arc_length(lengths, 1), 1)
+        self.assertEqual(spectral.invert_arc_length(lengths, 1.5), 1.5)
+        self.assertEqual(spectral.invert_arc_length(lengths, -0.5), -0.5)
+        self.assertEqual(spectral.invert_arc_length([0.0, 0.0, 0.0], 0.3), 0.3)
+
+    def test_steps_reuse_samples(self):
+        """Test that steps reuses the samples of earlier calls."""
+
+        i = Color.interpolate(['#002185', '#FCD200', 'white'], method='spectral')
+        expected = Color.interpolate(['#002185', '#FCD200', 'white'], method='spectral').steps(
+            steps=5, max_delta_e=2, delta_e='2000'
+        )
+        with mock.patch.object(spectral, 'ks_mix_batch', wraps=spectral.ks_mix_batch) as m:
+            first = i.steps(steps=5, max_delta_e=4, delta_e='2000')
+            count = sum(len(call.args[6]) for call in m.call_args_list)
+            self.assertEqual(count, len(first))
+
+            m.reset_mock()
+            results = i.steps(steps=5, max_delta_e=2, delta_e='2000')
+            count = sum(len(call.args[6]) for call in m.call_args_list)
+            self.assertEqual(count, len(results) - len(first))
+            for c1, c2 in zip(results, expected):
+                self.assertColorEqual(c1, c2)
+
+            m.reset_mock()
+            i.steps(steps=9)
+            self.assertEqual(m.call_count, 0)
+
+    def test_samples_bounded(self):
+        """Test that only the most recently used samples are kept."""
+
+        i = Color.interpolate(['red', 'blue'], method='spectral')
+        with mock.patch.object(spectral, 'MAX_SAMPLES', 8):
+            i.steps(steps=5)
+            i.steps(steps=20)
+            self.assertEqual(len(i._samples), 8)
+            i.steps(steps=5)
+            self.assertEqual(len(i._samples), 8)
+            self.assertIn((1, 1.0), i._samples)
+            self.assertIn((1, 0.5), i._samples)
+
+    def test_samples_threads(self):
+        """Test that an interpolator can generate steps from several threads while evicting samples."""
+
+        i = Color.interpolate(['red', 'blue', 'yellow'], method='spectral')
+        expected = [c.to_string() for c in Color.steps(['red', 'blue', 'yellow'], method='spectral', steps=33)]
+        errors = []
+
+        def run():
+            try:
+                for steps in (33, 17, 9, 33, 5):
+                    results = i.steps(steps=steps)
+                    self.assertEqual(results[0].to_string(), expected[0])
+                    self.assertEqual(results[-1].to_string(), expected[-1])
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        with mock.patch.object(spectral, 'MAX_SAMPLES', 4):
+            threads = [threading.Thread(target=run) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(i._samples), 4)
+
+    def test_samples_not_shared(self):
+        """Test that samples are copied and discarded when compiling."""
+
+        i = Color.interpolate(['red', 'blue'], method='spectral')
+        i.steps(steps=3)[1].set('x', 0)
+        self.assertColorEqual(i.steps(steps=3)[1], i(0.5))
+        i.compile()
+        self.assertEqual(i._samples, {})
+
+    def test_mixing_concentrations(self):
+        """Test the concentrations shared by every way of mixing colors."""
+
+        for weights, luminances, expected in (
+            ([1, 1], [0.2, 0.6], [0.25, 0.75]),
+            ([1, 3], [0.5, 0.5], [0.1, 0.9]),
+            ([1, 0], [0.5, 0.5], [1.0, 0.0]),
+            # Colors without luminance still contribute
+            ([1, 1], [0, -1], [0.5, 0.5])
+        ):
+            for a, b in zip(spectral.mixing_concentrations(weights, luminances), expected):
+                self.assertAlmostEqual(a, b)
+        self.assertEqual(spectral.mixing_luminance(0), spectral.EPSILON)
+        for a, b in zip(spectral.calculate_mixing_concentration(0.25, 0.2, 0.6), (0.75, 0.25)):
+            self.assertAlmostEqual(a, b)
+
+    def test_mix_many(self):
+        """Test mixing many colors in one pass."""
+
+        xyzs = [Color(c).convert('xyz-d65')[:-1] for c in ('red', 'blue', 'yellow', 'white')]
+        for t in (0, 0.25, 0.5, 1):
+            self.assertEqual(
+                spectral.spectral_mix_many(xyzs[:2], [1 - t, t]),
+                spectral.spectral_mix(xyzs[0], xyzs[1], t)
+            )
+        self.assertEqual(spectral.spectral_mix_many(xyzs[:2]), spectral.spectral_mix(xyzs[0], xyzs[1], 0.5))
+        self.assertColorEqual(
+            Color('xyz-d65', spectral.spectral_mix_many(xyzs, [1, -1, 0, 0])),
+            Color('xyz-d65', xyzs[0])
+        )
+
+        with self.assertRaises(ValueError):
+            spectral.spectral_mix_many(xyzs, [1, 1])
+        with self.assertRaises(ValueError):
+            spectral.spectral_mix_many(xyzs, [0, 0, 0, -1])
+
+    def test_spectral_average(self):
+        """Test the spectral average of colors."""
+
+        self.assertColorEqual(
+            spectral.spectral_average(Color, ['blue', 'yellow'], out_space='srgb'),
+            Color.interpolate(['blue', 'yellow'], method='spectral', out_space='srgb')(0.5)
+        )
+        self.assertColorEqual(
+            spectral.spectral_average(
+                Color,
+                ['blue', Color('yellow').set('alpha', 0.5), 'rgb(255 0 0 / none)'],
+                [1, 2, 1]
+            ),
+            Color('color(xyz-d65 0.18837 0.1458 0.03643 / 0.75)')
+        )
+        self.assertColorEqual(
+            spectral.spectral_average(Color, ['blue', 'yellow', 'red'], premultiplied=False),
+            spectral.spectral_average(Color, ['blue', 'yellow', 'red'])
+        )
+
+    def test_ladder(self):
+        """Test tint and shade ladders match mixing with white and black."""
+
+        color = Color('#6a8f3c')
+        ladder = spectral.spectral_ladder(Color, color, 3, 2, out_space='srgb')
+        expected = [color.mix('white', t, method='spectral', out_space='srgb') for t in (0.75, 0.5, 0.25)]
+        expected.append(color)
+        expected.extend(color.mix('black', t, method='spectral', out_space='srgb') for t in (1 / 3, 2 / 3))
+        self.assertEqual(len(ladder), 6)
+        for c1, c2 in zip(ladder, expected):
+            self.assertColorEqual(c1, c2)
+
+        ladder = spectral.spectral_ladder(Color, color, [0.1, 0.9], [], out_space='srgb')
+        self.assertColorEqual(ladder[0], color.mix('white', 0.9, method='spectral', out_space='srgb'))
+        self.assertColorEqual(ladder[1], color.mix('white', 0.1, method='spectral', out_space='srgb'))
+        self.assertColorEqual(ladder[2], color)
+
+    def test_ladder_alpha(self):
+        """Test that ladders mix alpha towards opaque."""
+
+        color = Color('#6a8f3c80')
+        ladder = spectral.spectral_ladder(Color, color, 1, 1, out_space='srgb')
+        self.assertColorEqual(ladder[0], color.mix('white', 0.5, method='spectral', out_space='srgb'))
+        self.assertColorEqual(ladder[2], color.mix('black', 0.5, method='spectral', out_space='srgb'))
+        self.assertColorEqual(
+            spectral.spectral_ladder(Color, Color('red').set('alpha', NaN), 0, 0)[0],
+            Color('red').convert('xyz-d65')
+        )
+
+    def test_ladder_ks(self):
+        """Test that white and black are only converted once."""
+
+        spectral.LADDER_KS.clear()
+        value = spectral.ladder_ks()
+        self.assertIs(spectral.ladder_ks(), value)
+        self.assertEqual(value[0], spectral.xyz_to_ks(spectral.WHITE))
+
+    def test_bad_resolution(self):
+        """Test bad resolution."""
+
+        with self.assertRaises(ValueError):
+            Color('red').mix('blue', method='spectral', resolution=15)
+
     def test_easing(self):
         """Test easing functions."""
 
@@ -95,6 +513,28 @@ class TestSpectral(util.ColorAsserts, unittest.TestCase):
             Color('color(xyz-d65 0.41239 0.21264 0.01933 / 1)')
         )
 
+    def test_easing_resolved(self):
+        """Test that segment easing functions are resolved once and only alpha can be eased independently."""
+
+        def ease_all(t):
+            return t
+
+        def ease_alpha(t):
+            return t
+
+        for method in ('spectral', 'spectral-continuous'):
+            i = Color.interpolate(
+                ['red', 'green', 'blue'],
+                progress={'all': ease_all, 'alpha': ease_alpha, 'x': lambda t: 0},
+                method=method
+            )
+            i.steps(10)
+            self.assertEqual(i.easing(1), (ease_all, ease_alpha))
+            self.assertIs(i.easing(1), i.easing(1))
+
+            i = Color.interpolate(['red', 'green'], progress={'all': ease_all}, method=method)
+            self.assertEqual(i.easing(1), (ease_all, ease_all))
+
     def test_easing_channel(self):
         """Test easing specific channels does not work."""
 
@@ -142,6 +582,13 @@ class TestSpectral(util.ColorAsserts, unittest.TestCase):
         for a, b in zip(Color.steps([c1, c2], method='spectral-continuous', steps=9), expected):
             self.assertColorEqual(a, b)
 
+    def test_stop_cache_continuous(self):
+        """Test that the reflectance of each stop is only calculated once in continuous mode."""
+
+        with mock.patch.object(spectral, 'xyz_to_ks', wraps=spectral.xyz_to_ks) as m:
+            Color.steps(['red', 'yellow', 'blue'], method='spectral-continuous', steps=256)
+        self.assertEqual(m.call_count, 3)
+
     def test_mix_nan_continuous(self):
         """Test mixing with NaN in continuous mode."""
 
@@ -219,3 +666,1045 @@ class TestSpectral(util.ColorAsserts, unittest.TestCase):
             )(1),
             Color('color(xyz-d65 0.09024 0.0361 0.47527 / 1)')
         )
+
+
+class TestReflectanceCache(unittest.TestCase):
+    """Test the reflectance cache."""
+
+    def test_stats(self):
+        """Test hit, miss, and eviction counters."""
+
+        cache = spectral.ReflectanceCache(maxsize=2)
+        red, green, blue = [Color(c).convert('xyz-d65')[:-1] for c in ('red', 'green', 'blue')]
+        cache.get(red)
+        cache.get(green)
+        cache.get(red)
+        cache.get(blue)
+        self.assertEqual(cache.stats(), (1, 3, 1, 2, 2))
+
+        # Green was the least recently used color, so it was evicted
+        cache.get(green)
+        self.assertEqual(cache.stats(), (1, 4, 2, 2, 2))
+
+    def test_values(self):
+        """Test that cached values match calculated values."""
+
+        cache = spectral.ReflectanceCache()
+        xyz = Color('#FCD200').convert('xyz-d65')[:-1]
+        r, res = spectral.single_constant_xyz_to_reflectance(xyz)
+        for _ in range(2):
+            ks2, res2 = cache.get(xyz)
+            self.assertEqual(list(ks2), spectral.reflectance_to_ks(r))
+            self.assertEqual(list(res2), res)
+
+    def test_quantize(self):
+        """Test quantized keys."""
+
+        cache = spectral.ReflectanceCache(quantize=6)
+        xyz = Color('#FCD200').convert('xyz-d65')[:-1]
+        cache.get(xyz)
+        cache.get([c + 1e-9 for c in xyz])
+        self.assertEqual(cache.stats(), (1, 1, 0, 256, 1))
+
+        # Changing quantization invalidates the entries
+        cache.quantize(None)
+        self.assertEqual(cache.stats().currsize, 0)
+
+    def test_resize_clear(self):
+        """Test resizing and clearing."""
+
+        cache = spectral.ReflectanceCache()
+        for c in ('red', 'green', 'blue', 'white'):
+            cache.get(Color(c).convert('xyz-d65')[:-1])
+        cache.resize(1)
+        self.assertEqual(cache.stats(), (0, 4, 3, 1, 1))
+        cache.clear(stats=False)
+        self.assertEqual(cache.stats(), (0, 4, 3, 1, 0))
+        cache.clear()
+        self.assertEqual(cache.stats(), (0, 0, 0, 1, 0))
+
+        with self.assertRaises(ValueError):
+            cache.resize(-1)
+
+    def test_disabled(self):
+        """Test that a size of zero disables caching."""
+
+        cache = spectral.ReflectanceCache(maxsize=0)
+        xyz = Color('red').convert('xyz-d65')[:-1]
+        cache.get(xyz)
+        cache.get(xyz)
+        self.assertEqual(cache.stats(), (0, 0, 0, 0, 0))
+
+
+class TestPigments(util.ColorAsserts, unittest.TestCase):
+    """Test the pigment library."""
+
+    def setUp(self):
+        """Setup."""
+
+        self.library = spectral.PIGMENTS
+        self.blue = self.library.register('test-blue', [0.05 + 0.5 * (i < 10) for i in range(spectral.SIZE)])
+        self.yellow = self.library.register('test-yellow', [0.05 + 0.85 * (i > 17) for i in range(spectral.SIZE)])
+
+    def tearDown(self):
+        """Teardown."""
+
+        self.library.clear()
+
+    def test_register(self):
+        """Test registering pigments."""
+
+        self.assertEqual(self.library.names(), ['test-blue', 'test-yellow'])
+        self.assertIs(self.library.get('test-blue'), self.blue)
+        self.assertIs(self.library.find(self.blue.xyz), self.blue)
+        self.assertIsNone(self.library.find(self.blue.xyz, spectral.get_tables(20)))
+
+        with self.assertRaises(ValueError):
+            self.library.register('test-blue', self.yellow.reflectance)
+        pigment = self.library.register('test-blue', self.yellow.reflectance, overwrite=True)
+        self.assertIs(self.library.get('test-blue'), pigment)
+
+        self.library.unregister('test-blue')
+        self.assertEqual(self.library.names(), ['test-yellow'])
+
+        with self.assertRaises(ValueError):
+            self.library.register('test-bad', [0.5] * spectral.SIZE, resolution=20)
+
+    def test_reflectance_clamped(self):
+        """Test that reflectance is constrained to avoid infinite K/S values."""
+
+        pigment = self.library.register('test-black', [0.0] * spectral.SIZE)
+        self.assertEqual(pigment.reflectance, (spectral.EPSILON,) * spectral.SIZE)
+
+    def test_mix(self):
+        """Test that mixing pigments uses the known K/S curves and skips estimation."""
+
+        with mock.patch.object(
+            spectral,
+            'single_constant_xyz_to_reflectance',
+            wraps=spectral.single_constant_xyz_to_reflectance
+        ) as m:
+            colors = [Color('xyz-d65', self.blue.xyz), Color('xyz-d65', self.yellow.xyz)]
+            for backend in ('python', 'numpy') if np is not None else ('python',):
+                results = Color.steps(colors, steps=5, method='spectral', backend=backend)
+                for color, t in zip(results, (0, 0.25, 0.5, 0.75, 1)):
+                    expected = spectral.ks_mix(
+                        self.blue.ks, self.blue.residual, self.blue.xyz[1],
+                        self.yellow.ks, self.yellow.residual, self.yellow.xyz[1],
+                        t
+                    )
+                    self.assertColorEqual(color, Color('xyz-d65', expected))
+            self.assertEqual(m.call_count, 0)
+
+    def test_save_load(self):
+        """Test saving and loading a pigment library."""
+
+        self.library.register('test-coarse', [0.5] * spectral.get_tables(20).size, resolution=20)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pigments.bin')
+            self.library.save(path)
+            self.library.clear()
+            pigments = self.library.load(path)
+            self.assertEqual(self.library.names(), ['test-blue', 'test-yellow'])
+            self.assertEqual([p.reflectance for p in pigments], [self.blue.reflectance, self.yellow.reflectance])
+            self.assertColorEqual(Color('xyz-d65', pigments[0].xyz), Color('xyz-d65', self.blue.xyz))
+
+            with self.assertRaises(ValueError):
+                self.library.load(path)
+            with self.assertRaises(ValueError):
+                spectral_lut.ReflectanceLUT.load(path)
+
+
+class TestSpectralIO(unittest.TestCase):
+    """Test the spectral data file format."""
+
+    def setUp(self):
+        """Setup."""
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'data.bin')
+
+    def tearDown(self):
+        """Teardown."""
+
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test saving and loading data with names that leave the body unaligned."""
+
+        values = [i / 7 for i in range(12)]
+        spectral_io.save(self.path, spectral_io.KIND_PIGMENTS, 10, 38, 4, values, ['a', 'bé', 'c'])
+        data = spectral_io.load(self.path, spectral_io.KIND_PIGMENTS)
+        self.assertEqual(
+            data[:-1],
+            (spectral_io.KIND_PIGMENTS, 10, 38, 3, 4, ['a', 'bé', 'c'])
+        )
+        self.assertIsInstance(data.data, memoryview)
+        self.assertEqual(list(data.data), values)
+
+    def test_round_trip_names(self):
+        """Test that names load back exactly as they were saved, or are rejected."""
+
+        for names in (['only'], ['a b', ' ', 'tab\there', '\u2028']):
+            with self.subTest(names=names):
+                spectral_io.save(self.path, spectral_io.KIND_PIGMENTS, 10, 38, 1, [0.5] * len(names), names)
+                self.assertEqual(spectral_io.load(self.path).names, names)
+
+        for names in ([''], ['a', 'b\nc'], ['a\n']):
+            with self.subTest(names=names):
+                with self.assertRaises(ValueError):
+                    spectral_io.save(self.path, spectral_io.KIND_PIGMENTS, 10, 38, 1, [0.5] * len(names), names)
+
+    def test_no_names(self):
+        """Test saving and loading data without names."""
+
+        spectral_io.save(self.path, spectral_io.KIND_LUT, 5, 76, 2, [1.0, 2.0])
+        data = spectral_io.load(self.path)
+        self.assertEqual(data.names, [])
+        self.assertEqual(list(data.data), [1.0, 2.0])
+
+    def test_bad_save(self):
+        """Test saving data that does not fit the layout."""
+
+        with self.assertRaises(ValueError):
+            spectral_io.save(self.path, spectral_io.KIND_LUT, 10, 38, 3, [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            spectral_io.save(self.path, spectral_io.KIND_LUT, 10, 38, 1, [1.0, 2.0], ['a'])
+
+    def test_bad_files(self):
+        """Test loading files that are not valid spectral data."""
+
+        spectral_io.save(self.path, spectral_io.KIND_LUT, 10, 38, 2, [1.0, 2.0, 3.0, 4.0])
+        with open(self.path, 'rb') as f:
+            content = f.read()
+
+        with self.assertRaises(ValueError):
+            spectral_io.load(self.path, spectral_io.KIND_PIGMENTS)
+
+        bad = {
+            'empty': b'',
+            'short': content[:10],
+            'magic': b'X' + content[1:],
+            'version': content[:8] + b'\x02' + content[9:],
+            'truncated': content[:-8]
+        }
+        for name, value in bad.items():
+            with self.subTest(name):
+                with open(self.path, 'wb') as f:
+                    f.write(value)
+                with self.assertRaises(ValueError):
+                    spectral_io.load(self.path)
+
+
+class TestUnmix(util.ColorAsserts, unittest.TestCase):
+    """Test unmixing colors into a palette."""
+
+    PALETTE = ['#002185', '#FCD200', 'white', 'black', 'red', '#6a8f3c']
+
+    def test_project_simplex(self):
+        """Test projecting onto the simplex."""
+
+        self.assertEqual(spectral_unmix.project_simplex([0.5, 0.25, 0.25]), [0.5, 0.25, 0.25])
+        self.assertEqual(spectral_unmix.project_simplex([2, 0, -1]), [1, 0, 0])
+        self.assertEqual(spectral_unmix.project_simplex([0.5, 0.5, 0.5, 0.5]), [0.25, 0.25, 0.25, 0.25])
+
+    def test_unmix(self):
+        """Test unmixing mixes of the palette."""
+
+        palette = spectral_unmix.Palette.from_colors(Color, self.PALETTE)
+        for weights in ([1, 1, 0, 0, 0, 0], [0.2, 0.5, 0.1, 0.05, 0.1, 0.05], [0, 0, 1, 0, 3, 0], [0, 0, 0, 0, 1, 0]):
+            xyz = spectral.spectral_mix_many(palette.xyz, weights)
+            result = palette.unmix(xyz)
+            self.assertLess(result.error, 1e-6)
+            self.assertAlmostEqual(sum(result.weights), 1)
+            self.assertTrue(all(w >= 0 for w in result.weights))
+            self.assertColorEqual(
+                Color('xyz-d65', spectral.spectral_mix_many(palette.xyz, result.weights)),
+                Color('xyz-d65', xyz)
+            )
+
+    def test_unmix_unreachable(self):
+        """Test unmixing a color that cannot be mixed from the palette."""
+
+        palette = spectral_unmix.Palette.from_colors(Color, ['white', 'black'])
+        result = palette.unmix(Color('red').convert('xyz-d65')[:-1])
+        self.assertGreater(result.error, 0.1)
+        self.assertAlmostEqual(sum(result.weights), 1)
+
+    def test_empty_palette(self):
+        """Test that a palette requires colors."""
+
+        with self.assertRaises(ValueError):
+            spectral_unmix.Palette([])
+
+
+class TestReflectanceLUT(util.ColorAsserts, unittest.TestCase):
+    """Test reflectance lookup tables."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Setup."""
+
+        cls.lut = spectral_lut.ReflectanceLUT(17)
+
+    def test_error_bound(self):
+        """Test that mixes using the lookup table are within a small error of the exact mixes."""
+
+        colors = [
+            'white', 'black', 'red', 'lime', 'blue', 'cyan', 'magenta', 'yellow', 'gray', '#010101',
+            '#002185', '#FCD200', '#6a8f3c', 'orange', 'purple', 'pink', 'brown', 'navy', 'teal', 'olive'
+        ]
+        xyzs = [Color(c).convert('xyz-d65')[:-1] for c in colors]
+        for xyz1 in xyzs:
+            ks1, res1 = self.lut.lookup(xyz1)
+            for xyz2 in xyzs:
+                ks2, res2 = self.lut.lookup(xyz2)
+                for t in (0, 0.25, 0.5, 0.75, 1):
+                    self.assertLess(
+                        Color('xyz-d65', spectral.ks_mix(ks1, res1, xyz1[1], ks2, res2, xyz2[1], t)).delta_e(
+                            Color('xyz-d65', spectral.spectral_mix(xyz1, xyz2, t)),
+                            method='2000'
+                        ),
+                        0.002
+                    )
+
+    def test_out_of_gamut(self):
+        """Test that colors outside of the lattice are not looked up."""
+
+        self.assertIsNone(self.lut.lookup(Color('color(display-p3 0 1 0)').convert('xyz-d65')[:-1]))
+
+    def test_install(self):
+        """Test installing the lookup table for estimation."""
+
+        self.lut.install()
+        try:
+            with mock.patch.object(
+                spectral,
+                'single_constant_xyz_to_reflectance',
+                wraps=spectral.single_constant_xyz_to_reflectance
+            ) as m:
+                spectral.estimate_ks(Color('#123456').convert('xyz-d65')[:-1])
+                self.assertEqual(m.call_count, 0)
+                spectral.estimate_ks(Color('color(display-p3 0 1 0)').convert('xyz-d65')[:-1])
+                self.assertEqual(m.call_count, 1)
+        finally:
+            self.lut.uninstall()
+        self.assertNotIn(self.lut.tables, spectral.LUTS)
+
+    def test_save_load(self):
+        """Test saving and loading a lookup table."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lut.bin')
+            self.lut.save(path)
+            lut = spectral_lut.ReflectanceLUT.load(path)
+        self.assertEqual(lut.size, 17)
+        self.assertIsInstance(lut.data, memoryview)
+        self.assertEqual(list(lut.data), list(self.lut.data))
+
+    def test_bad_data(self):
+        """Test bad lookup table data."""
+
+        with self.assertRaises(ValueError):
+            spectral_lut.ReflectanceLUT(2, data=array('d', [0.0] * 10))
+        with self.assertRaises(ValueError):
+            spectral_lut.ReflectanceLUT(1)
+
+
+
+class TestMixTable(util.ColorAsserts, unittest.TestCase):
+    """Test tables of precomputed pair mixes."""
+
+    PALETTE = ['#002185', '#FCD200', 'white', 'black']
+
+    @classmethod
+    def setUpClass(cls):
+        """Setup."""
+
+        cls.table = spectral_lut.MixTable(Color, cls.PALETTE, 65, delta_e='2000')
+
+    def test_report(self):
+        """Test the memory and error reported when building."""
+
+        self.assertEqual(self.table.memory, 6 * 65 * 3 * 8)
+        self.assertGreater(self.table.error, 0)
+        self.assertLess(self.table.error, 0.5)
+
+    def test_lookup(self):
+        """Test looking up mixes."""
+
+        xyzs = self.table.xyz
+        for i in range(4):
+            for j in range(4):
+                for t in (0, 0.25, 0.3, 0.5, 0.77, 1):
+                    self.assertLess(
+                        Color('xyz-d65', self.table.lookup(i, j, t)).delta_e(
+                            Color('xyz-d65', spectral.spectral_mix(xyzs[i], xyzs[j], t)),
+                            method='2000'
+                        ),
+                        0.5
+                    )
+        self.assertEqual(self.table.lookup(0, 1, 0.25), spectral.spectral_mix(xyzs[0], xyzs[1], 0.25))
+        self.assertEqual(self.table.lookup(1, 0, 0.75), self.table.lookup(0, 1, 0.25))
+        self.assertEqual(self.table.lookup(2, 3, 1.5), self.table.lookup(2, 3, 1))
+
+    def test_bad_table(self):
+        """Test bad tables and lookups."""
+
+        with self.assertRaises(ValueError):
+            spectral_lut.MixTable(Color, self.PALETTE, 1)
+        with self.assertRaises(ValueError):
+            spectral_lut.MixTable(Color, ['red'])
+        with self.assertRaises(IndexError):
+            self.table.lookup(0, 4, 0.5)
+
+
+
+class TestReconstruct(unittest.TestCase):
+    """Test reflectance reconstruction."""
+
+    PRIMARIES = [[1, 1, 1], [0, 1, 1], [1, 0, 1], [1, 1, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+    def assertCurvesEqual(self, curves1, curves2, tolerance=1e-12):
+        """Assert that reflectance curves are equal within the given tolerance."""
+
+        self.assertEqual(len(curves1), len(curves2))
+        for c1, c2 in zip(curves1, curves2):
+            self.assertEqual(len(c1), len(c2))
+            self.assertLess(max(abs(a - b) for a, b in zip(c1, c2)), tolerance)
+
+    def test_shipped_tables(self):
+        """Test that the shipped basis curves and CMFs are reproduced."""
+
+        solver = spectral_reconstruct.get_solver()
+        tables = spectral.DEFAULT_TABLES
+        self.assertCurvesEqual(solver.cmfs, [tables.x_bar, tables.y_bar, tables.z_bar])
+        curves = [solver.method_2(self.PRIMARIES[0])] + [solver.method_3(rgb) for rgb in self.PRIMARIES[1:]]
+        self.assertCurvesEqual(curves, tables.reflectance)
+
+        tables = spectral.get_tables(20)
+        solver = spectral_reconstruct.get_solver(step=20, end=740)
+        self.assertCurvesEqual(solver.cmfs, [tables.x_bar, tables.y_bar, tables.z_bar])
+        self.assertCurvesEqual(solver.solve(self.PRIMARIES[1:]), tables.reflectance[1:])
+
+    def test_get_solver(self):
+        """Test that solvers are only created once."""
+
+        solver = spectral_reconstruct.get_solver(space='display-p3')
+        self.assertIs(spectral_reconstruct.get_solver(space='display-p3'), solver)
+        self.assertIsNot(spectral_reconstruct.get_solver(), solver)
+        self.assertEqual(solver.xyz_to_rgb, spectral_reconstruct.SPACES['display-p3'])
+
+    def test_solve(self):
+        """Test solving a batch of colors."""
+
+        solver = spectral_reconstruct.get_solver()
+        rgbs = [solver.rgb(Color(c).convert('xyz-d65')[:-1]) for c in ('#6a8f3c', 'orange', 'gray')]
+        curves = solver.solve(rgbs)
+        self.assertCurvesEqual(curves, [solver.method_3(rgb) for rgb in rgbs])
+        for rgb, curve in zip(rgbs, curves):
+            self.assertTrue(all(0 < v < 1 for v in curve))
+            xyz = [sum(a * b for a, b in zip(cmf, curve)) for cmf in solver.cmfs]
+            self.assertCurvesEqual([solver.rgb(xyz)], [rgb])
+        self.assertCurvesEqual(solver.solve(rgbs, method=2), [solver.method_2(rgb) for rgb in rgbs])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_solve_numpy(self):
+        """Test solving a batch of colors with NumPy."""
+
+        solver = spectral_reconstruct.get_solver()
+        rgbs = [[0.2, 0.3, 0.1], [0.9, 0.5, 0.1], [0.5, 0.5, 0.5], [0, 0, 1]]
+        for method in (2, 3):
+            self.assertCurvesEqual(
+                solver.solve(rgbs, method, backend='numpy'),
+                solver.solve(rgbs, method),
+                1e-9
+            )
+        with self.assertRaises(ValueError):
+            solver.solve([[0.5, 0.5, 0.5], [2, 2, 2]], backend='numpy')
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_solve_numpy_dense(self):
+        """Test that the NumPy backend falls back to dense Newton steps."""
+
+        solver = spectral_reconstruct.get_solver()
+        rgbs = [[0.2, 0.3, 0.1], [0.9, 0.5, 0.1]]
+        with mock.patch.object(spectral_numpy, 'bordered_step', return_value=None):
+            self.assertCurvesEqual(solver.solve(rgbs, backend='numpy'), solver.solve(rgbs), 1e-9)
+
+    def test_bordered_step(self):
+        """Test that structured Newton steps match dense Newton steps."""
+
+        solver = spectral_reconstruct.get_solver()
+        n = solver.size
+        diagonal = [0.01 * (i % 7) for i in range(n)]
+        border = [[0.1 * ((i + k) % 5) + 0.05 for k in range(3)] for i in range(n)]
+        f = [((i * 37) % 11 - 5) / 10 for i in range(n + 3)]
+        self.assertCurvesEqual(
+            [solver.bordered_step(diagonal, border, f)],
+            [solver.dense_step(diagonal, border, f)],
+            1e-9
+        )
+
+    def test_bordered_step_fallback(self):
+        """Test that Newton steps fall back to a dense solve when the structured solve is not stable."""
+
+        solver = spectral_reconstruct.get_solver()
+        n = solver.size
+        diagonal = [-2.0] + [0.0] * (n - 1)
+        border = [[1.0, 0.0, 0.0]] * n
+        f = [1.0] * (n + 3)
+        self.assertIsNone(solver.bordered_step(diagonal, border, f))
+        with mock.patch.object(solver, 'dense_step', wraps=solver.dense_step) as dense:
+            solver.newton_step(diagonal, border, f)
+            dense.assert_called_once()
+
+    def test_fine_resolution(self):
+        """Test solving with 1nm bins."""
+
+        solver = spectral_reconstruct.ReflectanceSolver(step=1)
+        self.assertEqual(solver.size, 371)
+        rgb = [0.2, 0.3, 0.1]
+        curve = solver.method_3(rgb)
+        for k in range(3):
+            self.assertAlmostEqual(sum(r * row[k] for r, row in zip(curve, solver.weights)), rgb[k], places=9)
+
+    def test_reconstruct(self):
+        """Test reconstructing a curve and its multipliers and iterations."""
+
+        solver = spectral_reconstruct.get_solver()
+        for method in (2, 3):
+            result = solver.reconstruct([0.2, 0.3, 0.1], method)
+            self.assertCurvesEqual([result.curve], solver.solve([[0.2, 0.3, 0.1]], method))
+            self.assertEqual(len(result.multipliers), 3)
+            self.assertGreater(result.iterations, 0)
+
+    def test_reconstruct_guess(self):
+        """Test that starting from the curve of a nearby color requires fewer iterations."""
+
+        solver = spectral_reconstruct.get_solver()
+        for method in (2, 3):
+            cold = solver.reconstruct([0.21, 0.3, 0.1], method)
+            near = solver.reconstruct([0.2, 0.3, 0.1], method)
+            warm = solver.reconstruct([0.21, 0.3, 0.1], method, guess=near.curve, multipliers=near.multipliers)
+            self.assertCurvesEqual([warm.curve], [cold.curve], 1e-12)
+            self.assertLess(warm.iterations, cold.iterations)
+
+        # Guesses at the bounds of the reflectance are usable
+        for method, value in ((3, 0.0), (3, 1.0), (2, 0.0)):
+            result = solver.reconstruct([0.5, 0.5, 0.5], method, guess=[value] * solver.size)
+            self.assertCurvesEqual([result.curve], solver.solve([[0.5, 0.5, 0.5]], method), 1e-12)
+
+    def test_reconstruct_guess_fallback(self):
+        """Test that a guess that does not converge is solved again from a flat curve."""
+
+        solver = spectral_reconstruct.get_solver()
+        guess = solver.method_3([0.2, 0.3, 0.1])
+        solved = solver.newton_3([0.9, 0.5, 0.1], [0.0] * solver.size, [0.0] * 3, 50, 1e-12)
+        with mock.patch.object(solver, 'newton_3', side_effect=[None, solved]) as m:
+            result = solver.reconstruct([0.9, 0.5, 0.1], guess=guess)
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(m.call_args_list[0][0][3], spectral_reconstruct.GUESS_ITERATIONS)
+        self.assertCurvesEqual([result.curve], [solver.method_3([0.9, 0.5, 0.1])])
+        self.assertEqual(result.iterations, spectral_reconstruct.GUESS_ITERATIONS + solved[2])
+
+    def test_sequence(self):
+        """Test that reconstructing a sequence of nearby colors matches solving each color."""
+
+        solver = spectral_reconstruct.get_solver()
+        rgbs = [[0.2 + 0.01 * i, 0.3, 0.1 + 0.005 * i] for i in range(10)]
+        for method in (2, 3):
+            results = solver.sequence(rgbs, method)
+            cold = [solver.reconstruct(rgb, method) for rgb in rgbs]
+            self.assertCurvesEqual([r.curve for r in results], [r.curve for r in cold], 1e-12)
+            self.assertEqual(results[0].iterations, cold[0].iterations)
+            self.assertLess(sum(r.iterations for r in results), sum(r.iterations for r in cold))
+        self.assertEqual(solver.sequence([]), [])
+        with self.assertRaises(ValueError):
+            solver.sequence([[0.5, 0.5, 0.5], [2, 2, 2]])
+
+    def test_unreachable(self):
+        """Test colors that cannot be solved."""
+
+        solver = spectral_reconstruct.get_solver()
+        with self.assertRaises(ValueError):
+            solver.method_3([2, 2, 2])
+        with self.assertRaises(ValueError):
+            solver.method_2([1, 0, 0], max_iterations=2)
+
+    def test_bad_options(self):
+        """Test bad solver options."""
+
+        for kwargs in (
+            {'illuminant': 'a'},
+            {'cmfs': 'cie-1931'},
+            {'space': 'prophoto-rgb'},
+            {'step': 0},
+            {'start': 700, 'end': 700},
+            {'end': 900}
+        ):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    spectral_reconstruct.ReflectanceSolver(**kwargs)
+
+        solver = spectral_reconstruct.get_solver()
+        with self.assertRaises(ValueError):
+            solver.solve([[0.5, 0.5, 0.5]], method=1)
+        with self.assertRaises(ValueError):
+            solver.solve([[0.5, 0.5, 0.5]], backend='fortran')
+
+
+
+class TestSpectralSmooth(util.ColorAsserts, unittest.TestCase):
+    """Test spectral interpolation with reconstructed smoothest reflectance curves."""
+
+    def setUp(self):
+        """Setup."""
+
+        patcher = mock.patch.object(spectral_smooth, 'SMOOTH_CACHE', spectral_smooth.SmoothCache())
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_smooth_reflectance(self):
+        """Test that reconstructed curves are bounded and match the color."""
+
+        xyz = Color('#6a8f3c').convert('xyz-d65')[:-1]
+        r = spectral_smooth.smooth_reflectance(xyz)
+        self.assertEqual(len(r), spectral.SIZE)
+        self.assertTrue(all(0 < v < 1 for v in r))
+        for a, b in zip(spectral.reflectance_to_xyz(r), xyz):
+            self.assertAlmostEqual(a, b, places=12)
+
+        # Colors that cannot be solved use the basis curves
+        for color in ('white', 'color(display-p3 0 1 0)'):
+            xyz = Color(color).convert('xyz-d65')[:-1]
+            self.assertEqual(
+                spectral_smooth.smooth_reflectance(xyz),
+                spectral.single_constant_xyz_to_reflectance(xyz)[0]
+            )
+
+        with mock.patch.object(spectral_reconstruct.ReflectanceSolver, 'method_3', side_effect=ValueError):
+            xyz = Color('#6a8f3c').convert('xyz-d65')[:-1]
+            self.assertEqual(
+                spectral_smooth.smooth_reflectance(xyz),
+                spectral.single_constant_xyz_to_reflectance(xyz)[0]
+            )
+
+    def test_resolution(self):
+        """Test reconstructing curves at other resolutions."""
+
+        for res in (5, 20):
+            tables = spectral.get_tables(res)
+            r = spectral_smooth.smooth_reflectance(Color('#6a8f3c').convert('xyz-d65')[:-1], tables)
+            self.assertEqual(len(r), tables.size)
+
+    def test_steps(self):
+        """Test smooth spectral steps."""
+
+        colors = ['#002185', '#FCD200', Color('red').set('alpha', 0.5)]
+        smooth = Color.steps(colors, method='spectral-smooth', steps=9)
+        basis = Color.steps(colors, method='spectral', steps=9)
+        for i in (0, 4, 8):
+            self.assertColorEqual(smooth[i], basis[i])
+        self.assertNotEqual(smooth[2].to_string(), basis[2].to_string())
+        self.assertLess(smooth[2].delta_e(basis[2], method='2000'), 10)
+
+    def test_bad_color_space(self):
+        """Smooth spectral interpolation will only mix in XYZ."""
+
+        with self.assertRaises(ValueError):
+            Color('red').mix('blue', method='spectral-smooth', space='lab')
+
+    def test_memoized(self):
+        """Test that each unique color is only reconstructed once."""
+
+        with mock.patch.object(
+            spectral_smooth, 'smooth_reflectance', wraps=spectral_smooth.smooth_reflectance
+        ) as m:
+            Color.steps(['#002185', '#FCD200', '#002185'], method='spectral-smooth', steps=10)
+            Color.steps(['#FCD200', 'red'], method='spectral-smooth', steps=10)
+        self.assertEqual(m.call_count, 3)
+
+    def test_pigments(self):
+        """Test that registered pigments use their known curves."""
+
+        pigment = spectral.PIGMENTS.register('green', spectral.single_constant_xyz_to_reflectance(
+            Color('#6a8f3c').convert('xyz-d65')[:-1]
+        )[0])
+        self.addCleanup(spectral.PIGMENTS.unregister, 'green')
+        with mock.patch.object(spectral_smooth, 'smooth_reflectance') as m:
+            color = Color('xyz-d65', pigment.xyz)
+            Color.interpolate([color, color], method='spectral-smooth')(0.5)
+        m.assert_not_called()
+
+    def test_persist(self):
+        """Test persisting curves to disk."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, 'cache')
+            self.cache.persist(directory)
+            expected = Color.steps(['#002185', '#FCD200'], method='spectral-smooth', steps=5)
+            path = self.cache.path(spectral.DEFAULT_TABLES)
+            self.assertEqual(os.path.basename(path), 'smooth-d65-cie-1931-2deg-srgb-10nm.bin')
+            self.assertFalse(os.path.exists(path))
+            self.cache.flush()
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(spectral_io.load(path).rows, 2)
+
+            # A new cache loads the persisted curves instead of reconstructing them
+            cache = spectral_smooth.SmoothCache(directory)
+            with mock.patch.object(spectral_smooth, 'SMOOTH_CACHE', cache):
+                with mock.patch.object(spectral_smooth, 'smooth_reflectance') as m:
+                    colors = Color.steps(['#002185', '#FCD200'], method='spectral-smooth', steps=5)
+            m.assert_not_called()
+            self.assertEqual([c.to_string() for c in colors], [c.to_string() for c in expected])
+
+            # Unreadable caches are rebuilt
+            with open(path, 'wb') as f:
+                f.write(b'bad')
+            cache = spectral_smooth.SmoothCache(directory)
+            with mock.patch.object(spectral_smooth, 'SMOOTH_CACHE', cache):
+                Color.steps(['#002185', '#FCD200'], method='spectral-smooth', steps=5)
+            cache.flush()
+            self.assertEqual(spectral_io.load(path).rows, 2)
+
+    def test_flush(self):
+        """Test that new curves are written in a single batch when the cache is flushed."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.cache.persist(tmp)
+            with mock.patch.object(spectral_io, 'save', wraps=spectral_io.save) as m:
+                Color.steps(['#002185', '#FCD200', 'red', '#6a8f3c'], method='spectral-smooth', steps=10)
+                m.assert_not_called()
+                self.cache.flush()
+                self.cache.flush()
+            m.assert_called_once()
+            self.assertEqual(spectral_io.load(self.cache.path(spectral.DEFAULT_TABLES)).rows, 4)
+
+            # Changing the directory saves any new curves first
+            self.cache.get(Color('purple').convert('xyz-d65')[:-1])
+            self.cache.persist(None)
+            self.cache.persist(tmp)
+            self.assertEqual(spectral_io.load(self.cache.path(spectral.DEFAULT_TABLES)).rows, 5)
+
+    def test_merge(self):
+        """Test that curves saved by other caches sharing the directory are kept."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            caches = [spectral_smooth.SmoothCache(tmp) for _ in range(2)]
+            for cache in caches:
+                cache.entries(spectral.DEFAULT_TABLES)
+            caches[0].get(Color('#002185').convert('xyz-d65')[:-1])
+            caches[1].get(Color('#FCD200').convert('xyz-d65')[:-1])
+            for cache in caches:
+                cache.flush()
+            self.assertEqual(spectral_io.load(caches[0].path(spectral.DEFAULT_TABLES)).rows, 2)
+            self.assertEqual(len(caches[1].entries(spectral.DEFAULT_TABLES)), 2)
+
+    def test_maxsize(self):
+        """Test that only the most recently used curves are kept and persisted."""
+
+        red, green, blue, navy = [Color(c).convert('xyz-d65')[:-1] for c in ('red', 'green', 'blue', 'navy')]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = spectral_smooth.SmoothCache(tmp, maxsize=2)
+            path = cache.path(spectral.DEFAULT_TABLES)
+            cache.get(red)
+            cache.get(green)
+            cache.get(red)
+            cache.get(blue)
+            self.assertEqual(list(cache.entries(spectral.DEFAULT_TABLES)), [tuple(red), tuple(blue)])
+            cache.flush()
+            self.assertEqual(spectral_io.load(path).rows, 2)
+
+            # Curves persisted by others fill any remaining room as the least recently used
+            other = spectral_smooth.SmoothCache(tmp, maxsize=3)
+            other.get(navy)
+            other.flush()
+            self.assertEqual(
+                list(other.entries(spectral.DEFAULT_TABLES)),
+                [tuple(red), tuple(blue), tuple(navy)]
+            )
+            self.assertEqual(spectral_io.load(path).rows, 3)
+
+            # A new cache only loads the most recent curves
+            self.assertEqual(
+                list(spectral_smooth.SmoothCache(tmp, maxsize=1).entries(spectral.DEFAULT_TABLES)),
+                [tuple(navy)]
+            )
+
+            # Shrinking the cache trims the file on the next flush
+            other.resize(1)
+            self.assertEqual(list(other.entries(spectral.DEFAULT_TABLES)), [tuple(navy)])
+            other.flush()
+            self.assertEqual(spectral_io.load(path).rows, 1)
+
+        with self.assertRaises(ValueError):
+            self.cache.resize(-1)
+
+    def test_disabled(self):
+        """Test that a size of zero disables the cache."""
+
+        xyz = Color('#6a8f3c').convert('xyz-d65')[:-1]
+        expected = self.cache.get(xyz)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = spectral_smooth.SmoothCache(tmp, maxsize=0)
+            wrapped = spectral_smooth.smooth_reflectance
+            with mock.patch.object(spectral_smooth, 'smooth_reflectance', wraps=wrapped) as m:
+                self.assertEqual(cache.get(xyz), expected)
+                cache.get(xyz)
+            self.assertEqual(m.call_count, 2)
+            cache.flush()
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_unwritable(self):
+        """Test that curves are kept in memory if the cache directory cannot be written to."""
+
+        xyz = Color('#6a8f3c').convert('xyz-d65')[:-1]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'file')
+            with open(path, 'wb'):
+                pass
+            self.cache.persist(os.path.join(path, 'cache'))
+            Color.steps(['#002185', '#FCD200'], method='spectral-smooth', steps=5)
+            self.cache.get(xyz)
+            with mock.patch.object(spectral_smooth, 'smooth_reflectance') as m:
+                self.cache.flush()
+                self.cache.get(xyz)
+            m.assert_not_called()
+            self.assertEqual(os.listdir(tmp), ['file'])
+
+            # Writing is attempted again on the next flush
+            with mock.patch.object(self.cache, 'save', wraps=self.cache.save) as m:
+                self.cache.flush()
+            m.assert_called_once()
+
+            # Partially written files are removed
+            directory = os.path.join(tmp, 'cache')
+            self.cache.persist(directory)
+            self.cache.get(xyz)
+            with mock.patch.object(spectral_io, 'save', side_effect=OSError):
+                self.cache.flush()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_gamut(self):
+        """Test that curves are reconstructed, and persisted, separately for each basis gamut."""
+
+        colors = ['color(display-p3 0.3 0.7 0.4)', 'color(display-p3 0.9 0.2 0.6)']
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.dict(os.environ, {spectral_basis.CACHE_ENV: tmp}):
+                self.addCleanup(spectral.TABLES.pop, (20, 'display-p3'), None)
+                self.cache.persist(tmp)
+                results = {}
+                for gamut in ('srgb', 'display-p3'):
+                    i = Color.interpolate(colors, method='spectral-smooth', resolution=20, gamut=gamut)
+                    results[gamut] = i(0.5)
+                    # Colors outside of sRGB can only be reconstructed in the wider gamut
+                    residual = self.cache.get(Color(colors[0]).convert('xyz-d65')[:-1], i.tables)[1]
+                    if gamut == 'srgb':
+                        self.assertGreater(max(abs(v) for v in residual), 1e-3)
+                    else:
+                        self.assertLess(max(abs(v) for v in residual), 1e-12)
+                self.assertNotEqual(results['srgb'].to_string(), results['display-p3'].to_string())
+                self.cache.flush()
+
+                paths = {gamut: self.cache.path(spectral.get_tables(20, gamut)) for gamut in ('srgb', 'display-p3')}
+                self.assertNotEqual(paths['srgb'], paths['display-p3'])
+                for path in paths.values():
+                    self.assertEqual(spectral_io.load(path).rows, 2)
+
+                # Each gamut loads its own curves
+                cache = spectral_smooth.SmoothCache(tmp)
+                with mock.patch.object(spectral_smooth, 'SMOOTH_CACHE', cache):
+                    with mock.patch.object(spectral_smooth, 'smooth_reflectance') as m:
+                        for gamut in ('srgb', 'display-p3'):
+                            i = Color.interpolate(colors, method='spectral-smooth', resolution=20, gamut=gamut)
+                            self.assertEqual(i(0.5).to_string(), results[gamut].to_string())
+                m.assert_not_called()
+
+    def test_clear(self):
+        """Test clearing and changing the directory of the cache."""
+
+        xyz = Color('#6a8f3c').convert('xyz-d65')[:-1]
+        self.cache.get(xyz)
+        with mock.patch.object(spectral_smooth, 'smooth_reflectance', wraps=spectral_smooth.smooth_reflectance) as m:
+            self.cache.get(xyz)
+            self.cache.persist(None)
+            self.cache.get(xyz)
+            self.cache.clear()
+            self.cache.get(xyz)
+        self.assertEqual(m.call_count, 1)
+        self.assertIsNone(self.cache.path(spectral.DEFAULT_TABLES))
+
+
+class TestSpectralBasis(util.ColorAsserts, unittest.TestCase):
+    """Test basis curves for other RGB gamuts."""
+
+    def setUp(self):
+        """Setup."""
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = tmp.name
+        patcher = mock.patch.dict(os.environ, {spectral_basis.CACHE_ENV: self.cache})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(spectral.TABLES.pop, (20, 'display-p3'), None)
+
+    def test_cache_dir(self):
+        """Test the user cache directory."""
+
+        self.assertEqual(spectral_basis.cache_dir(), self.cache)
+        with mock.patch.dict(os.environ, {spectral_basis.CACHE_ENV: '', 'XDG_CACHE_HOME': '/xdg'}):
+            with mock.patch.object(spectral_basis.sys, 'platform', 'linux'):
+                self.assertEqual(spectral_basis.cache_dir(), os.path.join('/xdg', 'coloraide-extras'))
+
+    def test_reconstruct_srgb(self):
+        """Test that reconstructing the sRGB basis reproduces the shipped curves."""
+
+        tables = spectral.get_tables(20)
+        curves = spectral_basis.reconstruct_basis('srgb', 20, tables.size)
+        for curve, expected in zip(curves, tables.reflectance):
+            for a, b in zip(curve, expected):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_gamut(self):
+        """Test that the basis curves of a gamut match its primaries and secondaries and are cached."""
+
+        tables = spectral.get_tables(20, 'display-p3')
+        self.assertIs(spectral.get_tables(20, 'display-p3'), tables)
+        self.assertEqual(tables.gamut, 'display-p3')
+        self.assertEqual(tables.x_bar, spectral.get_tables(20).x_bar)
+        expected = [[1, 1, 1], [0, 1, 1], [1, 0, 1], [1, 1, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+        for xyz, rgb in zip(tables.reflectance_xyz, expected):
+            for a, b in zip(alg.matmul(tables.xyz_to_rgb, xyz), rgb):
+                self.assertAlmostEqual(a, b, places=9)
+
+        # Curves are loaded from the cache directory instead of reconstructed
+        path = spectral_basis.basis_path('display-p3', 20)
+        self.assertTrue(os.path.exists(path))
+        with mock.patch.object(spectral_basis, 'reconstruct_basis') as m:
+            self.assertEqual(spectral_basis.get_basis('display-p3', 20, tables.size), tables.reflectance)
+        m.assert_not_called()
+
+        # Unreadable files are rebuilt
+        with open(path, 'wb') as f:
+            f.write(b'bad')
+        with mock.patch.object(spectral_basis, 'reconstruct_basis', return_value=tables.reflectance) as m:
+            spectral_basis.get_basis('display-p3', 20, tables.size)
+        m.assert_called_once()
+        self.assertEqual(spectral_io.load(path).rows, 7)
+
+    def test_unwritable_cache(self):
+        """Test that curves are still provided if the cache cannot be written to."""
+
+        tables = spectral.get_tables(20)
+        with mock.patch.object(spectral_basis, 'reconstruct_basis', return_value=tables.reflectance):
+            with mock.patch.object(spectral_io, 'save', side_effect=OSError):
+                self.assertEqual(spectral_basis.get_basis('display-p3', 20, tables.size), tables.reflectance)
+        self.assertFalse(os.path.exists(spectral_basis.basis_path('display-p3', 20)))
+
+    def test_residual(self):
+        """Test that colors within the gamut, but outside of sRGB, need no residual with the gamut's basis."""
+
+        xyz = Color('color(display-p3 0.3 0.7 0.4)').convert('xyz-d65')[:-1]
+        res = spectral.single_constant_xyz_to_reflectance(xyz, spectral.get_tables(20))[1]
+        self.assertGreater(max(abs(v) for v in res), 1e-3)
+        res = spectral.single_constant_xyz_to_reflectance(xyz, spectral.get_tables(20, 'display-p3'))[1]
+        self.assertLess(max(abs(v) for v in res), 1e-12)
+
+    def test_interpolate(self):
+        """Test interpolating with the basis of a gamut."""
+
+        colors = ['color(display-p3 0.3 0.7 0.4)', 'color(display-p3 0.9 0.2 0.6)']
+        i = Color.interpolate(colors, method='spectral', resolution=20, gamut='display-p3')
+        self.assertIs(i.tables, spectral.get_tables(20, 'display-p3'))
+        self.assertColorEqual(i(0), Color(colors[0]).convert('xyz-d65'))
+        self.assertColorEqual(i(1), Color(colors[1]).convert('xyz-d65'))
+
+    def test_bad_gamut(self):
+        """Test unsupported gamuts."""
+
+        with self.assertRaises(ValueError):
+            spectral.get_tables(10, 'prophoto-rgb')
+        with self.assertRaises(ValueError):
+            Color('red').mix('blue', method='spectral', gamut='prophoto-rgb')
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestSpectralNumPy(util.ColorAsserts, unittest.TestCase):
+    """Test that the NumPy backend agrees with the pure Python backend."""
+
+    COLORS = ['#002185', '#FCD200', 'white', 'black', 'red', 'color(display-p3 0 1 0)', 'color(rec2020 0 0 1)']
+
+    def test_reflectance(self):
+        """Test reflectance and residual parity for a batch of colors."""
+
+        xyzs = [Color(c).convert('xyz-d65')[:-1] for c in self.COLORS]
+        r, res = spectral_numpy.single_constant_xyz_to_reflectance(xyzs)
+        self.assertEqual(r.shape, (len(xyzs), spectral.SIZE))
+        for xyz, r1, res1 in zip(xyzs, r, res):
+            r2, res2 = spectral.single_constant_xyz_to_reflectance(xyz)
+            self.assertTrue(np.allclose(r1, r2, rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(res1, res2, rtol=0, atol=1e-12))
+
+    def test_mix(self):
+        """Test mixing parity."""
+
+        ts = [i / 20 for i in range(21)]
+        for c1 in self.COLORS:
+            for c2 in self.COLORS:
+                xyz1 = Color(c1).convert('xyz-d65')[:-1]
+                xyz2 = Color(c2).convert('xyz-d65')[:-1]
+                self.assertTrue(
+                    np.allclose(
+                        spectral_numpy.spectral_mix_batch(xyz1, xyz2, ts),
+                        spectral.spectral_mix_batch(xyz1, xyz2, ts),
+                        rtol=0,
+                        atol=1e-12
+                    )
+                )
+
+    def test_interpolate(self):
+        """Test interpolation with the NumPy backend."""
+
+        for method in ('spectral', 'spectral-continuous'):
+            colors = ['red', 'yellow', Color('blue').set('alpha', 0.5)]
+            for a, b in zip(
+                Color.steps(colors, method=method, steps=9, backend='numpy'),
+                Color.steps(colors, method=method, steps=9)
+            ):
+                self.assertColorEqual(a, b)
+
+    def test_caches(self):
+        """Test that the NumPy backend uses the reflectance cache and lookup tables."""
+
+        cache = spectral.ReflectanceCache()
+        with mock.patch.object(spectral, 'REFLECTANCE_CACHE', cache):
+            for _ in range(2):
+                i = Color.interpolate(['#002185', '#FCD200'], method='spectral', backend='numpy')
+                i(0.5)
+            self.assertEqual(cache.stats()[:2], (2, 2))
+            self.assertEqual(i.ks(0), spectral.xyz_to_ks(Color('#002185').convert('xyz-d65')[:-1]))
+
+            cache.clear()
+            value = ((0.5,) * spectral.SIZE, (0.0, 0.0, 0.0))
+            with mock.patch.dict(spectral.LUTS, {spectral.DEFAULT_TABLES: lambda xyz: value}):
+                with mock.patch.object(spectral_numpy, 'xyz_to_ks') as m:
+                    i = Color.interpolate(['#002185', '#FCD200'], method='spectral', backend='numpy')
+                    self.assertEqual(i.ks(0), value)
+                m.assert_not_called()
+
+    def test_resolution(self):
+        """Test mixing parity at alternate resolutions."""
+
+        tables = spectral.get_tables(20)
+        xyz1 = Color('#002185').convert('xyz-d65')[:-1]
+        xyz2 = Color('#FCD200').convert('xyz-d65')[:-1]
+        ts = [i / 10 for i in range(11)]
+        self.assertTrue(
+            np.allclose(
+                spectral_numpy.spectral_mix_batch(xyz1, xyz2, ts, tables),
+                spectral.spectral_mix_batch(xyz1, xyz2, ts, tables),
+                rtol=0,
+                atol=1e-12
+            )
+        )